@@ -0,0 +1,91 @@
+import hashlib
+import os
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+
+class ArrowResultCache:
+    """
+    Persistent, size-bounded cache of DataFrames stored as uncompressed Arrow IPC files.
+
+    Entries are keyed by a hash of what produced them (query text, folder, read arguments) plus
+    a cheap freshness token of the underlying data, so a changed source simply produces a new key.
+    Hits are memory-mapped. The least recently used entries are evicted once the cache grows
+    beyond max_bytes. Files are written under a temporary name and renamed, so concurrent
+    pytest sessions or workers never read a partially written entry.
+    """
+
+    EXTENSION = ".arrow"
+
+    def __init__(self, cache_dir: str, max_bytes: int = 2 * 1024 ** 3):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(*parts) -> str:
+        """Builds a cache key from the given parts (query text, paths, arguments, freshness token)."""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(repr(part).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + self.EXTENSION)
+
+    def get(self, key: str):
+        """Returns the cached DataFrame, or None on a miss."""
+        path = self._path(key)
+        try:
+            table = feather.read_table(path, memory_map=True)
+            os.utime(path)  # mark as recently used
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+        return table.to_pandas()
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """Stores a DataFrame. DataFrames that cannot be converted to Arrow are not cached."""
+        path = self._path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            feather.write_feather(df, tmp_path, compression="uncompressed")
+        except (pa.ArrowException, ValueError, TypeError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used entries until the cache fits into max_bytes."""
+        entries = []
+        for file in os.listdir(self.cache_dir):
+            if not file.endswith(self.EXTENSION):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, file))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, file))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, file in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, file))
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def get_or_load(self, key: str, loader) -> pd.DataFrame:
+        """Returns the cached DataFrame for key, or calls loader() and caches its result."""
+        df = self.get(key)
+        if df is None:
+            df = loader()
+            self.put(key, df)
+        return df
@@ -0,0 +1,48 @@
+import os
+
+import pyarrow as pa
+
+# Arrow schemas the DQ checks expect for the parquet datasets written by the data pipeline.
+# They are declared here independently of the pipeline's data_dev/schemas.py on purpose:
+# a wrong type written by the pipeline must fail the checks instead of being read back as expected.
+
+FACILITY_TYPE_AVG_TIME_SPENT_PER_VISIT_DATE_SCHEMA = pa.schema([
+    pa.field("facility_type", pa.dictionary(pa.int32(), pa.string())),
+    pa.field("visit_date", pa.date32()),
+    pa.field("avg_time_spent", pa.float64()),
+    pa.field("partition_date", pa.string()),
+])
+
+PATIENT_SUM_TREATMENT_COST_PER_FACILITY_TYPE_SCHEMA = pa.schema([
+    pa.field("facility_type", pa.dictionary(pa.int32(), pa.string())),
+    pa.field("full_name", pa.string()),
+    pa.field("sum_treatment_cost", pa.decimal128(18, 2)),
+    pa.field("facility_type_partition", pa.string()),
+])
+
+FACILITY_NAME_MIN_TIME_SPENT_PER_VISIT_DATE_SCHEMA = pa.schema([
+    pa.field("facility_name", pa.dictionary(pa.int32(), pa.string())),
+    pa.field("visit_date", pa.date32()),
+    pa.field("min_time_spent", pa.int32()),
+    pa.field("partition_date", pa.string()),
+])
+
+DATASET_SCHEMAS = {
+    "facility_type_avg_time_spent_per_visit_date": FACILITY_TYPE_AVG_TIME_SPENT_PER_VISIT_DATE_SCHEMA,
+    "patient_sum_treatment_cost_per_facility_type": PATIENT_SUM_TREATMENT_COST_PER_FACILITY_TYPE_SCHEMA,
+    "facility_name_min_time_spent_per_visit_date": FACILITY_NAME_MIN_TIME_SPENT_PER_VISIT_DATE_SCHEMA,
+}
+
+# Hive partition columns. They are encoded in directory names, not stored inside the parquet files.
+PARTITION_COLUMNS = ("partition_date", "facility_type_partition")
+
+
+def get_dataset_schema(root_path: str, include_partition_columns: bool = True):
+    """
+    Returns the registered Arrow schema of the dataset stored in the given folder
+    (the folder name is the dataset name), or None if the dataset is not registered.
+    """
+    schema = DATASET_SCHEMAS.get(os.path.basename(os.path.normpath(root_path)))
+    if schema is None or include_partition_columns:
+        return schema
+    return pa.schema([field for field in schema if field.name not in PARTITION_COLUMNS])
@@ -0,0 +1,93 @@
+import os
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+
+class ParquetFooterStatistics:
+    """
+    Dataset-level statistics collected from parquet footers only.
+
+    Row counts, null counts and min/max values are stored per row group in every parquet footer,
+    so checks built on them read O(files) bytes instead of O(data). Only when a row group
+    has no statistics for a column is that column of the file scanned as a fallback.
+    """
+
+    def __init__(self, root_path: str, include_subfolders: bool = True):
+        """
+        Reads the footers of all parquet files in the folder (recursively, if include_subfolders=True).
+        """
+        self.root_path = root_path
+        self.files = self._list_files(root_path, include_subfolders)
+        if not self.files:
+            raise ValueError(f"No parquet files found in {root_path}")
+        self.metadata = {file_path: pq.read_metadata(file_path) for file_path in self.files}
+
+    @staticmethod
+    def _list_files(root_path: str, include_subfolders: bool) -> list:
+        if not include_subfolders:
+            return sorted(os.path.join(root_path, file) for file in os.listdir(root_path) if file.endswith(".parquet"))
+        return sorted(
+            os.path.join(dirpath, file)
+            for dirpath, _, filenames in os.walk(root_path)
+            for file in filenames if file.endswith(".parquet")
+        )
+
+    @property
+    def num_rows(self) -> int:
+        return sum(metadata.num_rows for metadata in self.metadata.values())
+
+    def _column_chunks(self, file_path: str, column_name: str):
+        """Yields the column chunk metadata of a column for every row group of a file."""
+        metadata = self.metadata[file_path]
+        if column_name not in metadata.schema.names:
+            raise KeyError(f"Column {column_name} is not stored in {file_path}")
+        index = metadata.schema.names.index(column_name)
+        for row_group in range(metadata.num_row_groups):
+            yield metadata.row_group(row_group).column(index)
+
+    @staticmethod
+    def _scan_column(file_path: str, column_name: str):
+        return pq.read_table(file_path, columns=[column_name]).column(0)
+
+    def null_count(self, column_name: str) -> int:
+        """Number of null values of a column across the dataset."""
+        total = 0
+        for file_path in self.files:
+            chunks = list(self._column_chunks(file_path, column_name))
+            if all(chunk.is_stats_set and chunk.statistics.has_null_count for chunk in chunks):
+                total += sum(chunk.statistics.null_count for chunk in chunks)
+            else:
+                total += self._scan_column(file_path, column_name).null_count
+        return total
+
+    @staticmethod
+    def _has_min_max(chunk) -> bool:
+        """True if the chunk statistics hold its min/max, or the chunk contains only nulls."""
+        if not chunk.is_stats_set:
+            return False
+        statistics = chunk.statistics
+        return statistics.has_min_max or (statistics.has_null_count and statistics.null_count == chunk.num_values)
+
+    def min_max(self, column_name: str) -> tuple:
+        """Minimum and maximum value of a column across the dataset, (None, None) if all values are null."""
+        minimums, maximums = [], []
+        for file_path in self.files:
+            chunks = list(self._column_chunks(file_path, column_name))
+            if all(self._has_min_max(chunk) for chunk in chunks):
+                for chunk in chunks:
+                    if chunk.statistics.has_min_max:
+                        minimums.append(chunk.statistics.min)
+                        maximums.append(chunk.statistics.max)
+            else:
+                column = self._scan_column(file_path, column_name)
+                if pa.types.is_dictionary(column.type):
+                    column = column.dictionary_decode()
+                result = pc.min_max(column).as_py()
+                if result["min"] is not None:
+                    minimums.append(result["min"])
+                    maximums.append(result["max"])
+        if not minimums:
+            return None, None
+        return min(minimums), max(maximums)
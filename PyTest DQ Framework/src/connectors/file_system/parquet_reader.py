@@ -1,47 +1,259 @@
+import json
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
 import os
 
+from src.connectors.file_system.dataset_schemas import get_dataset_schema, PARTITION_COLUMNS
+from src.connectors.file_system.parquet_metadata import ParquetFooterStatistics
+from src.connectors.scan_metrics import scan_meter
+
 class ParquetReader:
     """
     Class for working with Parquet files.
     Implements basic file reading methods.
     """
 
-    def read_file(self, file_path: str) -> pd.DataFrame:
+    # Arrow IPC snapshot written by the data pipeline next to a dataset folder (<folder>.arrow),
+    # with the manifest of the parquet files it was written from in its schema metadata.
+    SNAPSHOT_EXTENSION = ".arrow"
+    MANIFEST_KEY = b"source_manifest"
+
+    def __init__(self, cache=None):
         """
-        Reads a single Parquet file and returns a pandas DataFrame
+        Args:
+            cache (ArrowResultCache): Optional persistent cache for process() results,
+                invalidated by the modification times and sizes of the parquet files.
         """
-        return pd.read_parquet(file_path)
-    
-    def process(self, root_path: str, include_subfolders: bool = True) -> pd.DataFrame:
+        self.cache = cache
+
+    def read_file(self, file_path: str, schema=None) -> pd.DataFrame:
+        """
+        Reads a single Parquet file and returns a pandas DataFrame.
+        If an Arrow schema is given, columns are read with its types and
+        dates are returned as datetime64 instead of Python date objects.
+        """
+        if schema is None:
+            return pd.read_parquet(file_path)
+        return pq.read_table(file_path, schema=schema).to_pandas(date_as_object=False)
+
+    @classmethod
+    def snapshot_path(cls, root_path: str) -> str:
+        """
+        Returns the path of the Arrow IPC snapshot of the folder.
+        """
+        return os.path.normpath(root_path) + cls.SNAPSHOT_EXTENSION
+
+    def is_snapshot_fresh(self, root_path: str) -> bool:
+        """
+        Checks that the Arrow IPC snapshot of the folder exists, that its manifest lists exactly
+        the current parquet files (relative paths, modification times and sizes) and, for registered
+        datasets, that its columns have the expected schema from dataset_schemas.
+        Only the schema of the snapshot is read.
+        """
+        path = self.snapshot_path(root_path)
+        if not os.path.isfile(path) or not os.path.isdir(root_path):
+            return False
+        with pa.memory_map(path) as source:
+            schema = pa.ipc.open_file(source).schema
+        manifest = (schema.metadata or {}).get(self.MANIFEST_KEY)
+        if manifest is None:
+            return False
+        expected = get_dataset_schema(root_path, include_partition_columns=False)
+        if expected is not None and not schema.remove_metadata().equals(expected):
+            return False
+        files = []
+        for file_path, mtime_ns, size in self.freshness_token(self.dataset(root_path).files):
+            files.append([os.path.relpath(file_path, root_path), mtime_ns, size])
+        return json.loads(manifest) == sorted(files)
+
+    def read_snapshot(self, root_path: str) -> pd.DataFrame:
+        """
+        Memory-maps the Arrow IPC snapshot written by the data pipeline next to the folder
+        and returns it as a pandas DataFrame.
+        """
+        table = feather.read_table(self.snapshot_path(root_path), memory_map=True)
+        scan_meter.record_table("arrow_snapshot", table)
+        return table.to_pandas(date_as_object=False)
+
+    def read_footer_statistics(self, root_path: str, include_subfolders: bool = True) -> ParquetFooterStatistics:
+        """
+        Reads only the footers of all parquet files in the folder and returns their
+        row counts, null counts and min/max statistics without reading data pages.
+        """
+        statistics = ParquetFooterStatistics(root_path, include_subfolders)
+        scan_meter.record("parquet_footer", 0,
+                          sum(metadata.serialized_size for metadata in statistics.metadata.values()))
+        return statistics
+
+    def dataset(self, root_path: str, include_subfolders: bool = True) -> ds.Dataset:
+        """
+        Returns a pyarrow dataset over the parquet files in the specified folder.
+        Hive partition directories (e.g. partition_date=2025-01) are discovered as partition columns.
+        Registered datasets use their Arrow schema from dataset_schemas.
+        """
+        if not os.path.isdir(root_path):
+            raise ValueError(f"No parquet files found in {root_path}")
+        schema = get_dataset_schema(root_path)
+        if not include_subfolders:
+            files = [os.path.join(root_path, file) for file in sorted(os.listdir(root_path)) if file.endswith(".parquet")]
+            if schema is not None:
+                schema = get_dataset_schema(root_path, include_partition_columns=False)
+            return ds.dataset(files, format="parquet", schema=schema)
+        partitioning = "hive"
+        if schema is not None:
+            partition_fields = [field for field in schema if field.name in PARTITION_COLUMNS]
+            partitioning = ds.partitioning(pa.schema(partition_fields), flavor="hive")
+        return ds.dataset(root_path, format="parquet", partitioning=partitioning, schema=schema)
+
+    def _scan_arguments(self, dataset: ds.Dataset, columns=None, filters=None, include_partition_columns=False):
+        if columns is None and not include_partition_columns:
+            partitioning = getattr(dataset, "partitioning", None)
+            partition_columns = set(partitioning.schema.names) if partitioning is not None else set()
+            columns = [name for name in dataset.schema.names if name not in partition_columns]
+        if filters is not None and not isinstance(filters, ds.Expression):
+            filters = pq.filters_to_expression(filters)
+        return columns, filters
+
+    def process(self, root_path: str, include_subfolders: bool = True, prefer_snapshot: bool = True,
+                columns=None, filters=None, include_partition_columns: bool = False,
+                use_threads: bool = True) -> pd.DataFrame:
         """
         Reads all parquet files in the specified folder (recursively, if include_subfolders=True)
-        and returns a merged DataFrame.
+        and returns a merged DataFrame. Datasets registered in dataset_schemas are read with their
+        Arrow schema (categories, dates, floats) instead of the types inferred by pandas.
+        Files are read by pyarrow.dataset with multiple threads and converted to pandas once,
+        without concatenating per-file DataFrames.
         Args:
             root_path (str): Path to the folder containing parquet files.
             include_subfolders (bool): If True, recursively traverses all subfolders.
+            prefer_snapshot (bool): If True, a fresh Arrow IPC snapshot of the folder (its manifest matches
+                the paths, modification times and sizes of the parquet files) is memory-mapped
+                instead of reading the parquet files (only used together with include_subfolders=True,
+                without filters and without partition columns).
+            columns (list): Columns to read (projection). All data columns are read if None.
+            filters (list or pyarrow.dataset.Expression): Row filter in pandas/pyarrow DNF format,
+                e.g. [("partition_date", ">=", "2025-01"), ("facility_type", "=", "Clinic")].
+                Partition directories and row groups are pruned by it before any data is read.
+            include_partition_columns (bool): If True, the hive partition columns
+                (partition_date, facility_type_partition) are returned as well.
+            use_threads (bool): If True, files are read in parallel.
         Returns:
             pd.DataFrame: A combined data frame from all parquet files.
         """
-        all_dfs = []
-
-        if include_subfolders:
-            for dirpath, _, filenames in os.walk(root_path):
-                for file in filenames:
-                    if file.endswith(".parquet"):
-                        file_path = os.path.join(dirpath, file)
-                        df = pd.read_parquet(file_path)
-                        all_dfs.append(df)
-        else:
-            for file in os.listdir(root_path):
-                if file.endswith(".parquet"):
-                    file_path = os.path.join(root_path, file)
-                    df = pd.read_parquet(file_path)
-                    all_dfs.append(df)
-
-        if not all_dfs:
+        if (include_subfolders and prefer_snapshot and filters is None and not include_partition_columns
+                and self.is_snapshot_fresh(root_path)):
+            data = self.read_snapshot(root_path)
+            return data[columns] if columns else data
+
+        dataset = self.dataset(root_path, include_subfolders)
+        if not dataset.files:
+            raise ValueError(f"No parquet files found in {root_path}")
+
+        columns, filters = self._scan_arguments(dataset, columns, filters, include_partition_columns)
+
+        loaded = []
+
+        def load():
+            table = dataset.to_table(columns=columns, filter=filters, use_threads=use_threads)
+            scan_meter.record_table("parquet", table)
+            loaded.append(True)
+            return table.to_pandas(date_as_object=False, split_blocks=True, self_destruct=True)
+
+        if self.cache is None:
+            return load()
+        key = self.cache.key("parquet", os.path.abspath(root_path), columns, str(filters),
+                             self.freshness_token(dataset.files))
+        data = self.cache.get_or_load(key, load)
+        if not loaded:
+            scan_meter.record_frame("cache", data)
+        return data
+
+    def distinct_values(self, root_path: str, columns, batch_size: int = 131_072) -> pa.Table:
+        """
+        Returns the distinct non-null values (key sets) of the given columns of the dataset.
+        Only the projected columns are read, batch by batch. For a single dictionary-encoded column
+        only the dictionary values referenced by each batch are kept, so memory follows
+        the number of distinct values, not the number of rows.
+        """
+        dataset = self.dataset(root_path)
+        if not dataset.files:
+            raise ValueError(f"No parquet files found in {root_path}")
+        columns = list(columns)
+        parts = []
+        for batch in dataset.to_batches(columns=columns, batch_size=batch_size):
+            scan_meter.record_table("parquet", batch)
+            if len(columns) == 1:
+                values = batch.column(0)
+                if pa.types.is_dictionary(values.type):
+                    values = values.dictionary.take(pc.unique(values.indices.drop_null()))
+                parts.append(pa.table({columns[0]: pc.unique(values.drop_null())}))
+            else:
+                table = pa.Table.from_batches([batch])
+                table = table.cast(pa.schema([
+                    pa.field(field.name, field.type.value_type) if pa.types.is_dictionary(field.type) else field
+                    for field in table.schema]))
+                parts.append(table.drop_null().group_by(columns).aggregate([]))
+        if not parts:
+            fields = [dataset.schema.field(column) for column in columns]
+            return pa.schema([pa.field(field.name, field.type.value_type) if pa.types.is_dictionary(field.type)
+                              else field for field in fields]).empty_table()
+        distinct = pa.concat_tables(parts)
+        return distinct.group_by(columns).aggregate([]).select(columns) if len(parts) > 1 else distinct
+
+    @staticmethod
+    def freshness_token(files) -> tuple:
+        """
+        Returns the paths, modification times and sizes of the given files.
+        """
+        token = []
+        for file_path in sorted(files):
+            stat = os.stat(file_path)
+            token.append((file_path, stat.st_mtime_ns, stat.st_size))
+        return tuple(token)
+
+    def partition_files(self, root_path: str) -> dict:
+        """
+        Groups the parquet files of the folder by hive partition directory.
+        Returns {partition directory relative to root_path ("." for files in the root): [file paths]}.
+        """
+        partitions = {}
+        for file_path in sorted(self.dataset(root_path).files):
+            partition = os.path.relpath(os.path.dirname(file_path), root_path)
+            partitions.setdefault(partition, []).append(file_path)
+        return partitions
+
+    def read_files_table(self, root_path: str, files, columns=None) -> pa.Table:
+        """
+        Reads the given parquet files of the folder (e.g. one partition from partition_files())
+        as an Arrow table with the registered schema of the dataset, without partition columns.
+        """
+        schema = get_dataset_schema(root_path, include_partition_columns=False)
+        table = ds.dataset(list(files), format="parquet", schema=schema).to_table(columns=columns)
+        scan_meter.record_table("parquet", table)
+        return table
+
+    def read_files(self, root_path: str, files, columns=None) -> pd.DataFrame:
+        """
+        Same as read_files_table(), returned as a pandas DataFrame.
+        """
+        return self.read_files_table(root_path, files, columns).to_pandas(date_as_object=False)
+
+    def iter_batches(self, root_path: str, include_subfolders: bool = True, columns=None, filters=None,
+                     include_partition_columns: bool = False, batch_size: int = 131_072):
+        """
+        Streams the parquet files of the folder as pandas DataFrames of at most batch_size rows,
+        with the same projection and filter pruning as process().
+        """
+        dataset = self.dataset(root_path, include_subfolders)
+        if not dataset.files:
             raise ValueError(f"No parquet files found in {root_path}")
 
-        # Combine all dataframes into one
-        combined_df = pd.concat(all_dfs, ignore_index=True)
-        return combined_df
+        columns, filters = self._scan_arguments(dataset, columns, filters, include_partition_columns)
+        for batch in dataset.to_batches(columns=columns, filter=filters, batch_size=batch_size):
+            if batch.num_rows:
+                scan_meter.record_table("parquet", batch)
+                yield batch.to_pandas(date_as_object=False)
@@ -1,19 +1,39 @@
+import uuid
+
 import psycopg2
 import pandas as pd
 
+from src.connectors.scan_metrics import scan_meter
+
 class PostgresConnectorContextManager:
     """
     Context manager for connecting to PostgreSQL.
     Used with 'with' to automatically close the connection.
     """
 
-    def __init__(self, db_user, db_password, db_host, db_name, db_port):
+    # Current WAL position (the replayed position on a standby). Every committed insert, update or
+    # delete advances it synchronously, unlike the asynchronously flushed pg_stat_* counters, so
+    # a run started right after a data load never sees an unchanged token.
+    FRESHNESS_TOKEN_QUERY = "SELECT COALESCE(pg_last_wal_replay_lsn(), pg_current_wal_lsn())::text"
+
+    def __init__(self, db_user, db_password, db_host, db_name, db_port, cache=None, application_name=None):
         self.db_user = db_user
         self.db_password = db_password
         self.db_host = db_host
         self.db_name = db_name
         self.db_port = db_port
+        self.cache = cache
+        self.application_name = application_name
         self.conn = None
+        self._freshness_token = None
+
+    def connection_parameters(self) -> dict:
+        """
+        Keyword arguments to open an equivalent connection, e.g. in a worker process
+        (without the cache, which is not shared across processes).
+        """
+        return {"db_user": self.db_user, "db_password": self.db_password, "db_host": self.db_host,
+                "db_name": self.db_name, "db_port": self.db_port, "application_name": self.application_name}
 
     def __enter__(self):
         self.conn = psycopg2.connect(
@@ -21,7 +41,8 @@ class PostgresConnectorContextManager:
             password=self.db_password,
             host=self.db_host,
             port=self.db_port,
-            database=self.db_name
+            database=self.db_name,
+            application_name=self.application_name
         )
         return self
 
@@ -29,9 +50,53 @@ class PostgresConnectorContextManager:
         if self.conn:
             self.conn.close()
 
-    def get_data_sql(self, sql_query: str) -> pd.DataFrame:
+    def freshness_token(self) -> str:
         """
-        Executes an SQL query and returns the result as a pandas DataFrame
+        Returns the WAL position of the database, read once per connection: a DQ session checks
+        the data as of its start, so cached queries do not pay an extra round trip each.
         """
-        return pd.read_sql_query(sql_query, self.conn)
+        if self._freshness_token is None:
+            with self.conn.cursor() as cursor:
+                cursor.execute(self.FRESHNESS_TOKEN_QUERY)
+                self._freshness_token = cursor.fetchone()[0] or ""
+        return self._freshness_token
 
+    def get_data_sql(self, sql_query: str, params=None) -> pd.DataFrame:
+        """
+        Executes an SQL query and returns the result as a pandas DataFrame.
+        params are bound to %s placeholders of the query (lists are sent as Postgres arrays).
+        With a cache, the result is reused across sessions until data in the database changes.
+        """
+        loaded = []
+
+        def load():
+            data = pd.read_sql_query(sql_query, self.conn, params=params)
+            scan_meter.record_frame("postgres", data)
+            loaded.append(True)
+            return data
+
+        if self.cache is None:
+            return load()
+        key = self.cache.key("postgres", self.db_host, self.db_port, self.db_name, sql_query, params,
+                             self.freshness_token())
+        data = self.cache.get_or_load(key, load)
+        if not loaded:
+            scan_meter.record_frame("cache", data)
+        return data
+
+    def iter_batches_sql(self, sql_query: str, batch_size: int = 100_000):
+        """
+        Executes an SQL query on a server-side (named) cursor and yields the result
+        as pandas DataFrames of at most batch_size rows, so the full result set is never
+        held on the client.
+        """
+        with self.conn.cursor(name=f"dq_stream_{uuid.uuid4().hex}") as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(sql_query)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                batch = pd.DataFrame(rows, columns=[column.name for column in cursor.description])
+                scan_meter.record_frame("postgres", batch)
+                yield batch
@@ -0,0 +1,45 @@
+import threading
+
+
+class ScanMeter:
+    """
+    Process-wide counters of rows and bytes read by the connectors, per data source
+    ("postgres", "parquet", "parquet_footer", "arrow_snapshot", "cache").
+
+    Connectors call record() whenever they return data; the DQ history plugin takes a
+    snapshot() before a test and attributes the delta() to it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def record(self, source: str, rows: int, nbytes: int) -> None:
+        with self._lock:
+            counter = self._counters.setdefault(source, [0, 0])
+            counter[0] += int(rows)
+            counter[1] += int(nbytes)
+
+    def record_frame(self, source: str, df) -> None:
+        """Records a pandas DataFrame (its in-memory size, including object values)."""
+        self.record(source, len(df), df.memory_usage(index=False, deep=True).sum())
+
+    def record_table(self, source: str, table) -> None:
+        """Records a pyarrow Table or RecordBatch."""
+        self.record(source, table.num_rows, table.nbytes)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {source: tuple(counter) for source, counter in self._counters.items()}
+
+    def delta(self, before: dict) -> dict:
+        """Returns {source: (rows, bytes)} read since the given snapshot."""
+        delta = {}
+        for source, (rows, nbytes) in self.snapshot().items():
+            rows_before, bytes_before = before.get(source, (0, 0))
+            if rows != rows_before or nbytes != bytes_before:
+                delta[source] = (rows - rows_before, nbytes - bytes_before)
+        return delta
+
+
+scan_meter = ScanMeter()
@@ -1,4 +1,14 @@
 import pandas as pd
+import pytest
+
+from src.data_quality.row_diff import RowDiffEngine
+from src.data_quality.uniqueness import UniquenessEngine
+from src.data_quality.referential_integrity import ReferentialIntegrity
+from src.data_quality.sql_checks import SqlCheckCompiler
+from src.data_quality.sketches import find_duplicates
+from src.data_quality.partition_reconciliation import PartitionReconciler
+from src.data_quality.parallel_comparison import ParallelPartitionComparator
+from src.data_quality.drift import DriftMonitor
 
 class DataQualityLibrary:
     """
@@ -7,14 +17,35 @@ class DataQualityLibrary:
     This class is intended to be used in a PyTest-based testing framework to validate
     the quality of data in DataFrames. Each method performs a specific data quality
     check and uses assertions to ensure that the data meets the expected conditions.
+
+    Methods with the `_sql` suffix are push-down variants for database-side data: they accept
+    a table name or a query, compile the check into a single aggregate SQL statement and fetch
+    only the verdict and a few example rows instead of the whole result set.
+
+    Methods with the `_metadata` suffix work on ParquetFooterStatistics: they are answered from
+    parquet footers (row counts, null counts, min/max) without reading data pages.
+
+    check_rule reports one verdict of a RuleSet evaluation, so declarative rules computed
+    in a single pass still give one test result per rule.
+
+    Methods with the `_approximate` suffix are meant for very large datasets. They work on mergeable
+    sketches (HyperLogLog, quantile sketches) or stream the data through a Bloom filter, so memory
+    does not grow with the data; duplicate candidates are always verified exactly.
+
+    check_distribution_drift compares new or changed time partitions with the stored histograms of
+    the other partitions (DriftStore), so only the changed partitions are scanned on every run.
     """
     @staticmethod
-    def check_duplicates(df, column_names=None):
-        if column_names:
-            duplicates = df[df.duplicated(column_names)]
-        else:
-            duplicates = df[df.duplicated()]
-        assert duplicates.shape[0] == 0, f"DataFrame contains {duplicates.shape[0]} duplicates!"
+    def check_duplicates(df, column_names=None, top_n=10):
+        """Checking for duplicated rows (or duplicated values of the columns) with 64-bit hashes, without copying the rows"""
+        result = UniquenessEngine(key_columns=column_names, top_n=top_n).check(df)
+        assert result.is_unique, f"DataFrame contains {result.duplicate_count} duplicates!\n{result.summary()}"
+
+    @staticmethod
+    def check_key_uniqueness(df, key_columns, top_n=10):
+        """Checking that the key columns identify every row, reporting the most frequent duplicated keys"""
+        result = UniquenessEngine(key_columns=key_columns, top_n=top_n).check(df)
+        assert result.is_unique, f"Key {key_columns} is not unique.\n{result.summary()}"
 
     @staticmethod
     def check_count(df1, df2):
@@ -22,8 +53,23 @@ class DataQualityLibrary:
         assert df1.shape[0] == df2.shape[0], f"Row count mismatch: source={df1.shape[0]}, target={df2.shape[0]}"
 
     @staticmethod
-    def check_data_full_data_set(df1, df2):
-        assert df1.equals(df2), "Source and target DataFrames do not match."
+    def check_data_full_data_set(df1, df2, key_columns=None, chunk_size=1_000_000, sample_size=10):
+        """
+        Checking that source and target contain the same data.
+        Without key_columns both DataFrames must be sorted and aligned and are compared as a whole,
+        after normalizing the column types (categories, dates, Decimals, numbers) as RowDiffEngine does,
+        so the same data read from Postgres and from typed parquet compares equal.
+        With key_columns rows are reconciled by key with RowDiffEngine: no sorting is needed and
+        missing, extra and changed rows are reported with a bounded sample.
+        """
+        engine = RowDiffEngine(key_columns=key_columns, chunk_size=chunk_size, sample_size=sample_size)
+        if key_columns is None:
+            source = engine.normalize(df1).reset_index(drop=True)
+            target = engine.normalize(df2).reset_index(drop=True)
+            assert source.equals(target), "Source and target DataFrames do not match."
+            return
+        result = engine.compare(df1, df2)
+        assert result.is_equal, f"Source and target DataFrames do not match.\n{result.summary()}"
 
     @staticmethod
     def check_dataset_is_not_empty(df):
@@ -38,3 +84,175 @@ class DataQualityLibrary:
             assert not null_cols.any(), f"Null values found in columns: {list(null_cols[null_cols].index)}"
         else:
             assert not df.isnull().any().any(), "Null values found in DataFrame."
+
+    @staticmethod
+    def check_count_sql(db_connection, table_or_query, expected):
+        """Checking that the number of rows of a table or query matches a DataFrame or a number, using COUNT(*)"""
+        expected_count = expected if isinstance(expected, int) else expected.shape[0]
+        row_count = int(db_connection.get_data_sql(SqlCheckCompiler.count(table_or_query)).iloc[0, 0])
+        assert row_count == expected_count, f"Row count mismatch: source={row_count}, target={expected_count}"
+
+    @staticmethod
+    def check_dataset_is_not_empty_sql(db_connection, table_or_query):
+        """Checking that a table or query returns at least one row, using EXISTS"""
+        not_empty = bool(db_connection.get_data_sql(SqlCheckCompiler.exists(table_or_query)).iloc[0, 0])
+        assert not_empty, "Dataset is empty."
+
+    @staticmethod
+    def check_duplicates_sql(db_connection, table_or_query, column_names=None, sample_size=5):
+        """Checking for duplicates with GROUP BY ... HAVING COUNT(*) > 1, fetching only a few example groups"""
+        duplicate_count = int(db_connection.get_data_sql(
+            SqlCheckCompiler.duplicate_count(table_or_query, column_names)).iloc[0, 0])
+        if duplicate_count:
+            examples = db_connection.get_data_sql(
+                SqlCheckCompiler.duplicate_examples(table_or_query, column_names, sample_size))
+            raise AssertionError(f"Dataset contains {duplicate_count} duplicates!\n"
+                                 f"Examples:\n{examples.to_string(index=False)}")
+
+    @staticmethod
+    def check_not_null_values_sql(db_connection, table_or_query, column_names=None):
+        """Checking for null values with COUNT(*) FILTER (WHERE col IS NULL) per column (or per row)"""
+        null_counts = db_connection.get_data_sql(SqlCheckCompiler.null_counts(table_or_query, column_names)).iloc[0]
+        if column_names:
+            null_cols = null_counts[null_counts > 0]
+            assert null_cols.empty, f"Null values found in columns: {null_cols.to_dict()}"
+        else:
+            assert null_counts.iloc[0] == 0, f"Null values found in {null_counts.iloc[0]} rows of the dataset."
+
+    @staticmethod
+    def check_count_metadata(statistics, expected):
+        """Checking that the row count from parquet footers matches a DataFrame or a number"""
+        expected_count = expected if isinstance(expected, int) else expected.shape[0]
+        assert expected_count == statistics.num_rows, \
+            f"Row count mismatch: source={expected_count}, target={statistics.num_rows}"
+
+    @staticmethod
+    def check_dataset_is_not_empty_metadata(statistics):
+        """Checking that the parquet dataset is not empty, using the row counts from parquet footers"""
+        assert statistics.num_rows > 0, f"Dataset {statistics.root_path} is empty."
+
+    @staticmethod
+    def check_not_null_values_metadata(statistics, column_names):
+        """Checking for null values in columns, using the null counts from parquet footers"""
+        null_counts = {column: statistics.null_count(column) for column in column_names}
+        null_cols = [column for column, count in null_counts.items() if count]
+        assert not null_cols, f"Null values found in columns: {null_cols}"
+
+    @staticmethod
+    def check_value_range_metadata(statistics, column_name, min_value=None, max_value=None):
+        """Checking that all values of a column are within [min_value, max_value], using parquet min/max statistics"""
+        actual_min, actual_max = statistics.min_max(column_name)
+        if actual_min is None:
+            return
+        if min_value is not None:
+            assert actual_min >= min_value, f"Column {column_name} has values below {min_value}: min={actual_min}"
+        if max_value is not None:
+            assert actual_max <= max_value, f"Column {column_name} has values above {max_value}: max={actual_max}"
+
+    @staticmethod
+    def check_rule(rule_results, rule_id):
+        """Checking the verdict of a single rule from RuleSet.evaluate()"""
+        result = rule_results[rule_id]
+        assert result.passed, f"Rule {rule_id} failed: {result.message}"
+
+    @staticmethod
+    def check_duplicates_approximate(batches, column_names, capacity, error_rate=0.001, sample_size=5):
+        """
+        Checking for duplicated keys in a stream of DataFrames (callable returning an iterable, read twice):
+        a Bloom filter finds the candidates, which are then verified exactly
+        """
+        duplicates = find_duplicates(batches, column_names, capacity, error_rate)
+        assert duplicates.empty, (f"DataFrame contains {int((duplicates['occurrences'] - 1).sum())} duplicates!\n"
+                                  f"Examples:\n{duplicates.head(sample_size).to_string(index=False)}")
+
+    @staticmethod
+    def check_key_uniqueness_approximate(sketch):
+        """Checking that the HyperLogLog distinct key estimate matches the row count within 3 standard errors"""
+        estimate = sketch.key_distinct.estimate()
+        lower_bound = sketch.row_count * (1 - 3 * sketch.key_distinct.relative_error)
+        assert estimate >= lower_bound, \
+            f"About {sketch.row_count - round(estimate)} duplicated keys: rows={sketch.row_count}, distinct keys~{estimate:.0f}"
+
+    @staticmethod
+    def check_distribution_approximate(source_sketch, target_sketch, column_name,
+                                       quantiles=(0.01, 0.25, 0.5, 0.75, 0.99)):
+        """Checking that source and target quantiles of a column match within the accuracy of the quantile sketches"""
+        source_quantiles = source_sketch.quantiles[column_name]
+        target_quantiles = target_sketch.quantiles[column_name]
+        tolerance = source_quantiles.relative_accuracy + target_quantiles.relative_accuracy
+        mismatches = []
+        for q in quantiles:
+            source_value, target_value = source_quantiles.quantile(q), target_quantiles.quantile(q)
+            if source_value is None or target_value is None:
+                if source_value != target_value:
+                    mismatches.append(f"q{q}: source={source_value}, target={target_value}")
+            elif abs(source_value - target_value) > tolerance * max(abs(source_value), abs(target_value)):
+                mismatches.append(f"q{q}: source={source_value:.4f}, target={target_value:.4f}")
+        assert not mismatches, f"Distribution of column {column_name} differs: {'; '.join(mismatches)}"
+
+    @staticmethod
+    def check_distribution_drift(drift_store, parquet_reader, target_path, column_name, bins=20, threshold=0.1,
+                                 max_mean_shift=3.0, min_rows=50):
+        """
+        Checking that the histogram of a column in every new or changed partition of a dataset partitioned
+        by time stays within a Jensen-Shannon distance of threshold (or of the sampling noise expected for
+        its size, if larger) of the histogram of all other partitions, and its mean within max_mean_shift
+        standard deviations; bins are quantiles of the dataset on the first run, which only stores the
+        baseline. Skipped when no partition with at least min_rows values is new or changed
+        """
+        monitor = DriftMonitor(drift_store, threshold=threshold, max_mean_shift=max_mean_shift, min_rows=min_rows)
+        results = monitor.check(parquet_reader, target_path, column_name, bins)
+        if not results:
+            pytest.skip(f"Nothing to check: no new or changed partitions of {target_path} with a baseline")
+        drifted = [result for result in results if result.drifted]
+        assert not drifted, f"Distribution of column {column_name} drifted: " + "; ".join(
+            f"{result.partition}: distance={result.distance:.3f} (limit {result.limit:.3f}), "
+            f"mean shift={result.mean_shift:.2f} std"
+            for result in drifted)
+
+    @staticmethod
+    def check_partition_reconciliation(db_connection, source_query, parquet_reader, target_path, key_columns,
+                                       measure_column, sample_size=10):
+        """
+        Checking that source and target contain the same data, partition by partition:
+        per-partition fingerprints (row count, measure sum, row hash) are compared first and
+        only the rows of mismatched partitions are fetched and diffed
+        """
+        reconciler = PartitionReconciler(key_columns, measure_column, sample_size=sample_size)
+        result = reconciler.reconcile(db_connection, source_query, parquet_reader, target_path)
+        assert result.is_equal, f"Source and target partitions do not match.\n{result.summary()}"
+
+    @staticmethod
+    def check_data_full_data_set_parallel(db_connection, source_query, parquet_reader, target_path, key_columns,
+                                          max_workers=None, sample_size=10):
+        """
+        Checking that source and target contain the same data, comparing every partition
+        in a separate worker process; the source query runs once and is split by partition
+        """
+        comparator = ParallelPartitionComparator(key_columns, max_workers=max_workers, sample_size=sample_size)
+        result = comparator.compare(db_connection, source_query, parquet_reader, target_path)
+        assert result.is_equal, f"Source and target DataFrames do not match.\n{result.summary()}"
+
+    @staticmethod
+    def check_referential_integrity_sql(db_connection, child_table_or_query, child_columns, parent_table_or_query,
+                                        parent_columns, sample_size=5):
+        """Checking that every key of a table or query exists in the parent table, with a NOT EXISTS anti-join in the database"""
+        orphans = ReferentialIntegrity.sql(db_connection, child_table_or_query, child_columns,
+                                           parent_table_or_query, parent_columns, sample_size)
+        assert orphans.count == 0, orphans.summary(child_table_or_query, parent_table_or_query)
+
+    @staticmethod
+    def check_referential_integrity_parquet(parquet_reader, child_path, child_columns, parent_path, parent_columns,
+                                            sample_size=5):
+        """Checking that every key of a parquet dataset exists in another parquet dataset, using distinct key sets"""
+        orphans = ReferentialIntegrity.parquet(parquet_reader, child_path, child_columns, parent_path,
+                                               parent_columns, sample_size)
+        assert orphans.count == 0, orphans.summary(child_path, parent_path)
+
+    @staticmethod
+    def check_referential_integrity_parquet_to_sql(parquet_reader, db_connection, child_path, child_columns,
+                                                   parent_table_or_query, parent_columns, sample_size=5):
+        """Checking that every key of a parquet dataset exists in a table, shipping only the distinct keys to the database"""
+        orphans = ReferentialIntegrity.parquet_to_sql(parquet_reader, db_connection, child_path, child_columns,
+                                                      parent_table_or_query, parent_columns, sample_size)
+        assert orphans.count == 0, orphans.summary(child_path, parent_table_or_query)
@@ -0,0 +1,302 @@
+import math
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pyarrow as pa
+
+
+@dataclass
+class Histogram:
+    """
+    Fixed-bin histogram of a numeric column with summary moments.
+    counts has one underflow bin, len(edges) - 1 regular bins and one overflow bin.
+    Histograms with the same edges are merged by adding counts; moments are merged with
+    the parallel variance formula, so partition histograms combine into dataset histograms.
+    """
+    edges: np.ndarray
+    counts: np.ndarray
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+    null_count: int = 0
+
+    @staticmethod
+    def quantile_edges(values: np.ndarray, bins: int) -> np.ndarray:
+        """
+        Edges of about bins equally populated bins of the values (fewer for discrete values);
+        values outside the range of the baseline fall into the underflow and overflow bins.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return np.array([0.0, 1.0])
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)))
+        if len(edges) < 2:
+            edges = np.array([edges[0] - 0.5, edges[0] + 0.5])
+        return edges
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, edges: np.ndarray) -> "Histogram":
+        values = np.asarray(values, dtype=np.float64)
+        nulls = np.isnan(values)
+        values = values[~nulls]
+        bins = np.searchsorted(edges, values, side="right")
+        bins[values == edges[-1]] = len(edges) - 1  # the last regular bin is closed on the right
+        counts = np.bincount(bins, minlength=len(edges) + 1).astype(np.int64)
+        if not len(values):
+            return cls(edges, counts, null_count=int(nulls.sum()))
+        mean = float(values.mean())
+        return cls(edges, counts, len(values), mean, float(((values - mean) ** 2).sum()),
+                   float(values.min()), float(values.max()), int(nulls.sum()))
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histograms with different bin edges")
+        count = self.count + other.count
+        if not count:
+            return Histogram(self.edges, self.counts + other.counts, null_count=self.null_count + other.null_count)
+        delta = other.mean - self.mean
+        return Histogram(
+            self.edges, self.counts + other.counts, count,
+            self.mean + delta * other.count / count,
+            self.m2 + other.m2 + delta ** 2 * self.count * other.count / count,
+            min(self.min, other.min), max(self.max, other.max),
+            self.null_count + other.null_count,
+        )
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+
+
+def jensen_shannon_distance(counts: np.ndarray, other_counts: np.ndarray) -> float:
+    """Jensen-Shannon distance (base 2, between 0 and 1) of two histograms with the same bins."""
+    p = counts / counts.sum()
+    q = other_counts / other_counts.sum()
+    m = (p + q) / 2
+
+    def kl(a, b):
+        mask = a > 0
+        return float(np.sum(a[mask] * np.log2(a[mask] / b[mask])))
+
+    return math.sqrt(max((kl(p, m) + kl(q, m)) / 2, 0.0))
+
+
+def sampling_distance(bins: int, count: int, baseline_count: int, z: float = 3.72) -> float:
+    """
+    Jensen-Shannon distance (base 2) that two samples of count and baseline_count values drawn from
+    the same distribution exceed with probability of about 0.01% (for the default z) over the given
+    number of non-empty bins. For small differences the divergence (in nats) is about
+    chi2(bins - 1) * (1 / count + 1 / baseline_count) / 8; the chi2 quantile uses the
+    Wilson-Hilferty approximation.
+    """
+    degrees = max(bins - 1, 1)
+    chi2 = degrees * max(1 - 2 / (9 * degrees) + z * math.sqrt(2 / (9 * degrees)), 0.0) ** 3
+    return math.sqrt(chi2 * (1 / count + 1 / baseline_count) / (8 * math.log(2)))
+
+
+@dataclass
+class DriftResult:
+    """
+    Distance between a new or changed partition and the baseline of all other partitions,
+    with the distance limit used for the partition (threshold or the sampling noise, if larger).
+    """
+    column: str
+    partition: str
+    distance: float
+    limit: float
+    mean_shift: float
+    drifted: bool
+
+
+class DriftStore:
+    """
+    Local SQLite store of per-partition histograms, one row per dataset, column and partition.
+    Counts and edges are stored as binary arrays; a partition is recomputed only if the
+    modification times and sizes of its files or the bin edges change. The bin edges of every
+    dataset column are stored on the first run. Histograms of drifted partitions are only
+    stored with accept_drift, which accepts them as the new baseline.
+    """
+
+    CREATE_TABLE_QUERY = """
+    CREATE TABLE IF NOT EXISTS partition_histograms (
+        dataset TEXT NOT NULL,
+        column_name TEXT NOT NULL,
+        partition TEXT NOT NULL,
+        token TEXT NOT NULL,
+        edges BLOB NOT NULL,
+        counts BLOB NOT NULL,
+        count INTEGER NOT NULL,
+        mean REAL NOT NULL,
+        m2 REAL NOT NULL,
+        min REAL NOT NULL,
+        max REAL NOT NULL,
+        null_count INTEGER NOT NULL,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (dataset, column_name, partition)
+    )
+    """
+
+    CREATE_EDGES_TABLE_QUERY = """
+    CREATE TABLE IF NOT EXISTS column_edges (
+        dataset TEXT NOT NULL,
+        column_name TEXT NOT NULL,
+        bins INTEGER NOT NULL,
+        edges BLOB NOT NULL,
+        PRIMARY KEY (dataset, column_name, bins)
+    )
+    """
+
+    def __init__(self, db_path: str, accept_drift: bool = False):
+        self.db_path = db_path
+        self.accept_drift = accept_drift
+        with self._connect() as conn:
+            conn.execute(self.CREATE_TABLE_QUERY)
+            conn.execute(self.CREATE_EDGES_TABLE_QUERY)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def load_edges(self, dataset: str, column: str, bins: int):
+        """Returns the stored bin edges of the column, None before the first run."""
+        query = "SELECT edges FROM column_edges WHERE dataset = ? AND column_name = ? AND bins = ?"
+        with self._connect() as conn:
+            row = conn.execute(query, (dataset, column, bins)).fetchone()
+        return None if row is None else np.frombuffer(row[0], dtype=np.float64)
+
+    def save_edges(self, dataset: str, column: str, bins: int, edges: np.ndarray) -> None:
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO column_edges VALUES (?, ?, ?, ?)",
+                         (dataset, column, bins, edges.astype(np.float64).tobytes()))
+
+    def load(self, dataset: str, column: str) -> dict:
+        """Returns {partition: (token, Histogram)}."""
+        query = ("SELECT partition, token, edges, counts, count, mean, m2, min, max, null_count "
+                 "FROM partition_histograms WHERE dataset = ? AND column_name = ?")
+        with self._connect() as conn:
+            rows = conn.execute(query, (dataset, column)).fetchall()
+        return {
+            partition: (token, Histogram(np.frombuffer(edges, dtype=np.float64), np.frombuffer(counts, dtype=np.int64),
+                                         count, mean, m2, minimum, maximum, null_count))
+            for partition, token, edges, counts, count, mean, m2, minimum, maximum, null_count in rows
+        }
+
+    def save(self, dataset: str, column: str, partition: str, token: str, histogram: Histogram) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO partition_histograms VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (dataset, column, partition, token, histogram.edges.astype(np.float64).tobytes(),
+                 histogram.counts.astype(np.int64).tobytes(), histogram.count, histogram.mean, histogram.m2,
+                 histogram.min, histogram.max, histogram.null_count, time.time()))
+
+    def delete_except(self, dataset: str, column: str, partitions) -> None:
+        """Removes the histograms of partitions that no longer exist."""
+        partitions = list(partitions)
+        placeholders = ", ".join("?" for _ in partitions)
+        with self._connect() as conn:
+            conn.execute(f"DELETE FROM partition_histograms WHERE dataset = ? AND column_name = ? "
+                         f"AND partition NOT IN ({placeholders})", (dataset, column, *partitions))
+
+
+class DriftMonitor:
+    """
+    Incremental drift detection for a numeric column of a parquet dataset partitioned by time
+    (e.g. by month); partitions that are categories differ by design and are not compared.
+
+    The first run establishes the baseline: bin edges are quantiles of the whole dataset and are
+    stored with the histograms of all partitions, so every later partition is binned against
+    that baseline. Histograms are computed only for partitions that
+    are new or whose files changed since the last stored run; the others are loaded from the
+    DriftStore. Every new or changed partition with at least min_rows values is then compared
+    with the merged histogram of all other partitions: it drifted if the Jensen-Shannon distance
+    of the two exceeds threshold and the sampling noise expected for its size
+    (sampling_distance), or its mean moves by more than max_mean_shift standard deviations of
+    the baseline. Only partitions that did not drift are stored after the check, so a drifted
+    partition is checked (and fails) again on every run until its data is fixed or the store
+    accepts drift.
+    """
+
+    def __init__(self, store: DriftStore, threshold: float = 0.1, max_mean_shift: float = 3.0, min_rows: int = 50):
+        self.store = store
+        self.threshold = threshold
+        self.max_mean_shift = max_mean_shift
+        self.min_rows = min_rows
+
+    @staticmethod
+    def _read_values(parquet_reader, root_path: str, files, column: str) -> np.ndarray:
+        values = parquet_reader.read_files_table(root_path, files, columns=[column]).column(0)
+        return values.cast(pa.float64()).to_numpy(zero_copy_only=False)
+
+    def update(self, parquet_reader, root_path: str, column: str, bins: int) -> tuple:
+        """
+        Computes the histograms of new or changed partitions and loads the others from the store.
+        Returns ({partition: Histogram}, {new or changed partition: token}). The first run only
+        establishes the baseline: it stores the bin edges and all histograms and reports no
+        partition as changed. Later runs store nothing; check() stores the partitions that passed.
+        """
+        dataset = os.path.basename(os.path.normpath(root_path))
+        partition_files = {partition_dir.split("=", 1)[-1]: files
+                           for partition_dir, files in parquet_reader.partition_files(root_path).items()}
+        values = {}
+        edges = self.store.load_edges(dataset, column, bins)
+        if edges is None:
+            values = {partition: self._read_values(parquet_reader, root_path, files, column)
+                      for partition, files in partition_files.items()}
+            edges = Histogram.quantile_edges(np.concatenate(list(values.values()) or [np.empty(0)]), bins)
+            self.store.save_edges(dataset, column, bins, edges)
+
+        stored = self.store.load(dataset, column)
+        histograms, changed = {}, {}
+        for partition, files in partition_files.items():
+            token = repr((parquet_reader.freshness_token(files), edges.tolist()))
+            if partition in stored and stored[partition][0] == token:
+                histograms[partition] = stored[partition][1]
+                continue
+            partition_values = values.get(partition)
+            if partition_values is None:
+                partition_values = self._read_values(parquet_reader, root_path, files, column)
+            histograms[partition] = Histogram.from_values(partition_values, edges)
+            changed[partition] = token
+        self.store.delete_except(dataset, column, histograms)
+        if values:
+            for partition, token in changed.items():
+                self.store.save(dataset, column, partition, token, histograms[partition])
+            changed = {}
+        return histograms, changed
+
+    def check(self, parquet_reader, root_path: str, column: str, bins: int = 20) -> list:
+        """
+        Returns a DriftResult for every new or changed partition with at least min_rows values
+        and a baseline, and stores the histograms of the partitions that did not drift (of all
+        of them with accept_drift).
+        """
+        histograms, changed = self.update(parquet_reader, root_path, column, bins)
+        results = []
+        for partition in changed:
+            current = histograms[partition]
+            others = [histogram for other, histogram in histograms.items() if other != partition]
+            if not others or current.count < self.min_rows:
+                continue
+            baseline = others[0]
+            for histogram in others[1:]:
+                baseline = baseline.merge(histogram)
+            if not baseline.count:
+                continue
+            distance = jensen_shannon_distance(current.counts, baseline.counts)
+            non_empty_bins = int(np.count_nonzero(current.counts + baseline.counts))
+            limit = max(self.threshold, sampling_distance(non_empty_bins, current.count, baseline.count))
+            mean_shift = abs(current.mean - baseline.mean) / baseline.std if baseline.std else 0.0
+            results.append(DriftResult(column, partition, distance, limit, mean_shift,
+                                       distance > limit or mean_shift > self.max_mean_shift))
+
+        drifted = {result.partition for result in results if result.drifted}
+        dataset = os.path.basename(os.path.normpath(root_path))
+        for partition, token in changed.items():
+            if partition not in drifted or self.store.accept_drift:
+                self.store.save(dataset, column, partition, token, histograms[partition])
+        return results
@@ -0,0 +1,100 @@
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from src.connectors.file_system.parquet_reader import ParquetReader
+from src.data_quality.partition_reconciliation import PARTITION_EXPRESSIONS, partition_column_of, data_schema_of
+from src.data_quality.row_diff import RowDiffEngine, RowDiffResult
+from src.data_quality.sql_checks import SqlCheckCompiler
+
+
+def default_max_workers() -> int:
+    """CPU cores per pytest-xdist worker (all cores without xdist), so -n auto does not start cores² processes."""
+    xdist_workers = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+    return max((os.cpu_count() or 1) // max(xdist_workers, 1), 1)
+
+
+def _compare_partition(source_files: list, root_path: str, files: list, columns: list, key_columns: list,
+                       sample_size: int) -> RowDiffResult:
+    """
+    Compares one partition in a worker process: reads the source rows of the partition spilled
+    by the parent process and only the parquet files of the partition.
+    """
+    source = [feather.read_feather(path) for path in source_files]
+    source = pd.concat(source, ignore_index=True)[columns] if source else pd.DataFrame(columns=columns)
+    if files:
+        target = ParquetReader().read_files(root_path, files, columns=columns)
+    else:
+        target = pd.DataFrame(columns=columns)
+    engine = RowDiffEngine(key_columns=key_columns, sample_size=sample_size)
+    return engine.compare(source, target)
+
+
+class ParallelPartitionComparator:
+    """
+    Compares a Postgres query with a hive-partitioned parquet dataset partition by partition
+    in a process pool.
+
+    The source query runs once: its rows are streamed with their partition value (month of
+    visit_date or facility_type, see PARTITION_EXPRESSIONS) and spilled to one set of Arrow
+    files per partition, so the database is scanned a single time and no side is ever loaded
+    as a whole. Every partition is then compared by a worker process that reads its spilled
+    source rows and its own parquet slice; workers need no database connection. The
+    per-partition RowDiffResults are merged into one result. Workers are started with "spawn",
+    so they do not inherit the connections and thread pools of the pytest process.
+    """
+
+    def __init__(self, key_columns, max_workers: int = None, sample_size: int = 10):
+        """
+        Args:
+            key_columns (list): Columns identifying a row within a partition.
+            max_workers (int): Number of worker processes, the CPU cores per pytest-xdist worker by default.
+            sample_size (int): Maximum number of sampled rows per kind of difference.
+        """
+        self.key_columns = list(key_columns)
+        self.max_workers = max_workers or default_max_workers()
+        self.sample_size = sample_size
+
+    @staticmethod
+    def split_source(db_connection, source_query: str, partition_expression: str, spill_dir: str) -> dict:
+        """Streams the source query once and writes its rows to Arrow files per partition. Returns {partition: [paths]}."""
+        source_files, partition_dirs = {}, {}
+        query = SqlCheckCompiler.with_partition_value(source_query, partition_expression)
+        for batch_number, batch in enumerate(db_connection.iter_batches_sql(query)):
+            for partition, rows in batch.groupby("partition_value", sort=False, dropna=False):
+                partition = str(partition)
+                if partition not in partition_dirs:
+                    partition_dirs[partition] = os.path.join(spill_dir, str(len(partition_dirs)))
+                    os.makedirs(partition_dirs[partition])
+                path = os.path.join(partition_dirs[partition], f"{batch_number}.arrow")
+                table = pa.Table.from_pandas(rows.drop(columns="partition_value"), preserve_index=False)
+                feather.write_feather(table, path)
+                source_files.setdefault(partition, []).append(path)
+        return source_files
+
+    def compare(self, db_connection, source_query: str, parquet_reader, root_path: str) -> RowDiffResult:
+        dataset = parquet_reader.dataset(root_path)
+        partition_expression = PARTITION_EXPRESSIONS[partition_column_of(dataset)]
+        columns = data_schema_of(dataset).names
+
+        target_files = {partition.split("=", 1)[-1]: files
+                        for partition, files in parquet_reader.partition_files(root_path).items()}
+        result = RowDiffResult()
+        with tempfile.TemporaryDirectory(prefix="dq_partitions_") as spill_dir:
+            source_files = self.split_source(db_connection, source_query, partition_expression, spill_dir)
+            partitions = sorted(set(target_files) | set(source_files))
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, max(len(partitions), 1)),
+                                     mp_context=multiprocessing.get_context("spawn")) as executor:
+                futures = [
+                    executor.submit(_compare_partition, source_files.get(partition, []), root_path,
+                                    target_files.get(partition, []), columns, self.key_columns, self.sample_size)
+                    for partition in partitions
+                ]
+                for future in futures:
+                    result = result.merge(future.result(), self.sample_size)
+        return result
@@ -0,0 +1,227 @@
+import hashlib
+import math
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.connectors.file_system.dataset_schemas import PARTITION_COLUMNS
+from src.data_quality.row_diff import RowDiffEngine, RowDiffResult
+from src.data_quality.sql_checks import SqlCheckCompiler
+
+# SQL expressions deriving the hive partition value from a source row, as the data pipeline does
+PARTITION_EXPRESSIONS = {
+    "partition_date": "TO_CHAR(src.\"visit_date\", 'YYYY-MM')",
+    "facility_type_partition": "REPLACE(src.\"facility_type\", ' ', '_')",
+}
+
+NULL_TEXT = "\\N"
+
+# Row hash arithmetic is done modulo 2^64: wrapping uint64 in numpy, numeric in PostgreSQL
+HASH_MODULUS = 1 << 64
+MIX_MULTIPLIERS = (0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53, 0x9E3779B97F4A7C15)
+
+
+def text_hash(text: str) -> int:
+    """First 64 bits of md5 of the text, as PostgreSQL computes ('x' || SUBSTR(MD5(text), 1, 16))::bit(64)."""
+    return int.from_bytes(hashlib.md5(text.encode("utf-8")).digest()[:8], "big")
+
+
+NULL_HASH = text_hash(NULL_TEXT)
+
+
+def partition_column_of(dataset) -> str:
+    """The hive partition column of a pyarrow dataset (partition_date or facility_type_partition)."""
+    names = [name for name in dataset.partitioning.schema.names if name in PARTITION_COLUMNS]
+    if len(names) != 1:
+        raise ValueError(f"Cannot determine the partition column of the dataset: {names}")
+    return names[0]
+
+
+def data_schema_of(dataset) -> pa.Schema:
+    """The schema of the columns stored in the parquet files, without partition columns."""
+    return pa.schema([field for field in dataset.schema if field.name not in dataset.partitioning.schema.names])
+
+
+@dataclass(frozen=True)
+class PartitionFingerprint:
+    """Row count, sum of the measure column and order-independent row hash of one partition."""
+    row_count: int
+    measure_sum: float
+    row_hash: int
+
+    def matches(self, other: "PartitionFingerprint") -> bool:
+        return (self.row_count == other.row_count and self.row_hash == other.row_hash
+                and math.isclose(self.measure_sum, other.measure_sum, rel_tol=1e-9, abs_tol=1e-6))
+
+
+@dataclass
+class PartitionReconciliationResult:
+    """Fingerprints of every partition, the partitions that disagree and the row diff of those partitions."""
+    source_fingerprints: dict
+    target_fingerprints: dict
+    mismatched_partitions: list
+    diff: RowDiffResult = field(default_factory=RowDiffResult)
+
+    @property
+    def is_equal(self) -> bool:
+        return not self.mismatched_partitions and self.diff.is_equal
+
+    def summary(self) -> str:
+        lines = [f"{len(self.mismatched_partitions)} of "
+                 f"{len(set(self.source_fingerprints) | set(self.target_fingerprints))} partitions differ"]
+        for partition in self.mismatched_partitions:
+            lines.append(f"  {partition}: source={self.source_fingerprints.get(partition)}, "
+                         f"target={self.target_fingerprints.get(partition)}")
+        lines.append(self.diff.summary())
+        return "\n".join(lines)
+
+
+class PartitionReconciler:
+    """
+    Two-phase reconciliation of a Postgres query with a hive-partitioned parquet dataset.
+
+    Phase one computes a PartitionFingerprint per partition on both sides: in SQL with a single
+    GROUP BY query, and from the parquet files partition by partition with vectorized numpy
+    arithmetic. Every value gets a 64-bit column hash: text by md5 (computed once per distinct
+    value on the parquet side), dates (days since 1970-01-01) and numbers (scaled by 10^scale and
+    rounded half away from zero) by a quadratic integer mix, NULL by a constant. The row hash is
+    the product (mod 2^64) of the column hashes salted by column position, so both sides compute
+    exactly the same value.
+    Phase two fetches and diffs (RowDiffEngine) only the rows of the partitions whose
+    fingerprints disagree, so a fully matching dataset transfers one row per partition.
+    """
+
+    def __init__(self, key_columns, measure_column: str, partition_column: str = None, scale: int = 6,
+                 sample_size: int = 10):
+        """
+        Args:
+            key_columns (list): Columns identifying a row, used for the row diff of mismatched partitions.
+            measure_column (str): Numeric column summed per partition.
+            partition_column (str): Hive partition column of the dataset. If None, it is taken from
+                the dataset's partitioning.
+            scale (int): Number of decimals numeric values are compared with.
+            sample_size (int): Maximum number of sampled rows per kind of difference.
+        """
+        self.key_columns = list(key_columns)
+        self.measure_column = measure_column
+        self.partition_column = partition_column
+        self.scale = scale
+        self.sample_size = sample_size
+
+    @staticmethod
+    def _hash_kind(name: str, data_type: pa.DataType) -> str:
+        if pa.types.is_dictionary(data_type):
+            data_type = data_type.value_type
+        if pa.types.is_date(data_type):
+            return "date"
+        if pa.types.is_integer(data_type) or pa.types.is_floating(data_type) or pa.types.is_decimal(data_type):
+            return "number"
+        if pa.types.is_string(data_type) or pa.types.is_large_string(data_type) or pa.types.is_boolean(data_type):
+            return "text"
+        raise TypeError(f"Column {name} of type {data_type} is not supported by partition fingerprints")
+
+    @staticmethod
+    def _salt(position: int) -> int:
+        return (position + 1) * MIX_MULTIPLIERS[2] % HASH_MODULUS
+
+    def _sql_column_hash(self, name: str, data_type: pa.DataType, position: int) -> str:
+        """Salted, odd column hash as a numeric SQL expression between 0 and 2^64 - 1."""
+        column = f"src.{SqlCheckCompiler.quote_identifier(name)}"
+        kind = self._hash_kind(name, data_type)
+        if kind == "text":
+            value_hash = (f"MOD(('x' || SUBSTR(MD5({column}::text), 1, 16))::bit(64)::bigint::numeric "
+                          f"+ {HASH_MODULUS}, {HASH_MODULUS})")
+        else:
+            value = (f"({column} - DATE '1970-01-01')::numeric" if kind == "date"
+                     else f"ROUND({column}::numeric * {10 ** self.scale})")
+            first, second, _ = MIX_MULTIPLIERS
+            value_hash = (f"MOD(MOD({value} * {first} + {value} * {value} * {second}, {HASH_MODULUS}) "
+                          f"+ {HASH_MODULUS}, {HASH_MODULUS})")
+        salted = f"MOD(COALESCE({value_hash}, {NULL_HASH}) + {self._salt(position)}, {HASH_MODULUS})"
+        return f"({salted} - MOD({salted}, 2) + 1)"
+
+    def _sql_row_hash(self, schema: pa.Schema) -> str:
+        row_hash = None
+        for position, field in enumerate(schema):
+            column_hash = self._sql_column_hash(field.name, field.type, position)
+            row_hash = column_hash if row_hash is None else f"MOD({row_hash} * {column_hash}, {HASH_MODULUS})"
+        return row_hash
+
+    def _arrow_column_hash(self, name: str, column: pa.ChunkedArray, position: int) -> np.ndarray:
+        """Numpy counterpart of _sql_column_hash() (uint64, wrapping arithmetic is mod 2^64)."""
+        kind = self._hash_kind(name, column.type)
+        column = column.combine_chunks()
+        if pa.types.is_dictionary(column.type):
+            column = column.cast(column.type.value_type)
+        nulls = np.asarray(column.is_null().to_numpy(zero_copy_only=False), dtype=bool)
+        if kind == "text":
+            encoded = pc.dictionary_encode(column.cast(pa.string()))
+            dictionary_hashes = np.array([text_hash(value) for value in encoded.dictionary.to_pylist()],
+                                         dtype=np.uint64)
+            indices = encoded.indices.fill_null(0).to_numpy(zero_copy_only=False)
+            hashes = dictionary_hashes[indices] if len(dictionary_hashes) else np.zeros(len(column), dtype=np.uint64)
+        else:
+            if kind == "date":
+                values = column.cast(pa.date32()).cast(pa.int32()).fill_null(0).to_numpy(zero_copy_only=False)
+            else:
+                floats = column.cast(pa.float64()).fill_null(0).to_numpy(zero_copy_only=False)
+                values = np.sign(floats) * np.floor(np.abs(floats) * 10 ** self.scale + 0.5)
+            values = values.astype(np.int64).astype(np.uint64)
+            first, second, _ = (np.uint64(multiplier) for multiplier in MIX_MULTIPLIERS)
+            hashes = values * first + values * values * second
+        hashes = np.where(nulls, np.uint64(NULL_HASH), hashes)
+        return (hashes + np.uint64(self._salt(position))) | np.uint64(1)
+
+    def _row_hash(self, table: pa.Table) -> int:
+        """Sum (mod 2^64) over all rows of the product of the salted column hashes."""
+        row_hashes = np.ones(table.num_rows, dtype=np.uint64)
+        for position, name in enumerate(table.column_names):
+            row_hashes *= self._arrow_column_hash(name, table.column(name), position)
+        return int(row_hashes.sum(dtype=np.uint64))
+
+    def source_fingerprints(self, db_connection, source_query: str, schema: pa.Schema, partition_column: str) -> dict:
+        """Fingerprints of the source query per partition value, computed in a single SQL statement."""
+        query = SqlCheckCompiler.partition_fingerprints(
+            source_query, PARTITION_EXPRESSIONS[partition_column], self._sql_row_hash(schema), self.measure_column)
+        fingerprints = db_connection.get_data_sql(query)
+        return {
+            str(row.partition_value): PartitionFingerprint(int(row.row_count),
+                                                           0.0 if pd.isna(row.measure_sum) else float(row.measure_sum),
+                                                           int(row.row_hash))
+            for row in fingerprints.itertuples(index=False)
+        }
+
+    def target_fingerprints(self, parquet_reader, root_path: str, columns) -> dict:
+        """Fingerprints of the parquet dataset per partition value, read one partition at a time."""
+        fingerprints = {}
+        for partition, files in parquet_reader.partition_files(root_path).items():
+            value = partition.split("=", 1)[-1]
+            table = parquet_reader.read_files_table(root_path, files, columns=columns)
+            measure_sum = pc.sum(table.column(self.measure_column).cast(pa.float64())).as_py() or 0.0
+            fingerprints[value] = PartitionFingerprint(table.num_rows, measure_sum, self._row_hash(table))
+        return fingerprints
+
+    def reconcile(self, db_connection, source_query: str, parquet_reader, root_path: str) -> PartitionReconciliationResult:
+        dataset = parquet_reader.dataset(root_path)
+        partition_column = self.partition_column or partition_column_of(dataset)
+        schema = data_schema_of(dataset)
+
+        source = self.source_fingerprints(db_connection, source_query, schema, partition_column)
+        target = self.target_fingerprints(parquet_reader, root_path, schema.names)
+        mismatched = sorted(partition for partition in set(source) | set(target)
+                            if partition not in source or partition not in target
+                            or not source[partition].matches(target[partition]))
+        result = PartitionReconciliationResult(source, target, mismatched)
+        if not mismatched:
+            return result
+
+        source_rows = db_connection.get_data_sql(
+            SqlCheckCompiler.partition_rows(source_query, PARTITION_EXPRESSIONS[partition_column], mismatched))
+        target_rows = parquet_reader.process(root_path, columns=schema.names,
+                                             filters=[(partition_column, "in", mismatched)])
+        engine = RowDiffEngine(key_columns=self.key_columns, sample_size=self.sample_size)
+        result.diff = engine.compare(source_rows[schema.names], target_rows)
+        return result
@@ -0,0 +1,67 @@
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from src.data_quality.sql_checks import SqlCheckCompiler
+
+
+@dataclass
+class OrphanKeys:
+    """Distinct child keys without a parent row: their number and a sample of them."""
+    count: int = 0
+    sample: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    def summary(self, child: str, parent: str) -> str:
+        lines = [f"{self.count} distinct keys of {child} do not exist in {parent}"]
+        if not self.sample.empty:
+            lines.append(f"Examples:\n{self.sample.to_string(index=False)}")
+        return "\n".join(lines)
+
+
+class ReferentialIntegrity:
+    """
+    Foreign-key style checks as set-based anti-joins on distinct key sets.
+
+    - Postgres to Postgres: a single NOT EXISTS query, evaluated in the database.
+    - Parquet to parquet: the distinct key sets of both datasets (ParquetReader.distinct_values)
+      are anti-joined locally.
+    - Parquet to Postgres: the distinct parquet keys are shipped to Postgres as arrays and
+      anti-joined there with UNNEST ... WHERE NOT EXISTS.
+
+    Child keys with a null column are ignored, as for SQL foreign keys. The cost follows the
+    number of distinct keys, not the number of rows.
+    """
+
+    @staticmethod
+    def sql(db_connection, child_table_or_query, child_columns, parent_table_or_query, parent_columns,
+            sample_size: int = 5) -> OrphanKeys:
+        count = int(db_connection.get_data_sql(SqlCheckCompiler.orphan_count(
+            child_table_or_query, child_columns, parent_table_or_query, parent_columns)).iloc[0, 0])
+        if not count:
+            return OrphanKeys()
+        sample = db_connection.get_data_sql(
+            SqlCheckCompiler.orphan_keys(child_table_or_query, child_columns, parent_table_or_query, parent_columns)
+            + f" LIMIT {int(sample_size)}")
+        return OrphanKeys(count, sample)
+
+    @staticmethod
+    def parquet(parquet_reader, child_path, child_columns, parent_path, parent_columns,
+                sample_size: int = 5) -> OrphanKeys:
+        child_keys = parquet_reader.distinct_values(child_path, child_columns).to_pandas()
+        parent_keys = parquet_reader.distinct_values(parent_path, parent_columns).to_pandas()
+        parent_keys.columns = list(child_columns)
+        merged = child_keys.merge(parent_keys, how="left", on=list(child_columns), indicator=True)
+        orphans = merged.loc[merged["_merge"] == "left_only", list(child_columns)]
+        return OrphanKeys(len(orphans), orphans.head(sample_size).reset_index(drop=True))
+
+    @staticmethod
+    def parquet_to_sql(parquet_reader, db_connection, child_path, child_columns, parent_table_or_query,
+                       parent_columns, sample_size: int = 5) -> OrphanKeys:
+        child_keys = parquet_reader.distinct_values(child_path, child_columns)
+        if not child_keys.num_rows:
+            return OrphanKeys()
+        arrays = [[str(value) for value in child_keys.column(column).to_pylist()] for column in child_columns]
+        orphans = db_connection.get_data_sql(
+            SqlCheckCompiler.orphan_keys_of_values(child_columns, parent_table_or_query, parent_columns),
+            params=arrays)
+        return OrphanKeys(len(orphans), orphans.head(sample_size))
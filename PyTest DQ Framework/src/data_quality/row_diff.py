@@ -0,0 +1,170 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from pandas.util import hash_pandas_object
+
+
+@dataclass
+class RowDiffResult:
+    """
+    Result of a row-level reconciliation between a source and a target DataFrame.
+
+    missing rows exist in the source only, extra rows exist in the target only,
+    changed rows have the same key on both sides but different values.
+    Samples hold at most `sample_size` rows of each kind.
+    """
+    missing_count: int = 0
+    extra_count: int = 0
+    changed_count: int = 0
+    missing_sample: pd.DataFrame = field(default_factory=pd.DataFrame)
+    extra_sample: pd.DataFrame = field(default_factory=pd.DataFrame)
+    changed_sample: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    @property
+    def is_equal(self) -> bool:
+        return self.missing_count == 0 and self.extra_count == 0 and self.changed_count == 0
+
+    def merge(self, other: "RowDiffResult", sample_size: int = 10) -> "RowDiffResult":
+        """Combines the results of two independent comparisons (e.g. of two partitions)."""
+        return RowDiffResult(
+            missing_count=self.missing_count + other.missing_count,
+            extra_count=self.extra_count + other.extra_count,
+            changed_count=self.changed_count + other.changed_count,
+            missing_sample=pd.concat([self.missing_sample, other.missing_sample]).head(sample_size),
+            extra_sample=pd.concat([self.extra_sample, other.extra_sample]).head(sample_size),
+            changed_sample=pd.concat([self.changed_sample, other.changed_sample]).head(sample_size),
+        )
+
+    def summary(self) -> str:
+        """Human-readable description of the differences, with the sampled rows."""
+        lines = [f"Missing in target: {self.missing_count}, extra in target: {self.extra_count}, "
+                 f"changed: {self.changed_count}"]
+        for title, sample in (("Missing rows (sample)", self.missing_sample),
+                              ("Extra rows (sample)", self.extra_sample),
+                              ("Changed rows (sample)", self.changed_sample)):
+            if not sample.empty:
+                lines.append(f"{title}:\n{sample.to_string(index=False)}")
+        return "\n".join(lines)
+
+
+class RowDiffEngine:
+    """
+    Vectorized hash-based reconciliation of two DataFrames.
+
+    Every row is reduced to a 64-bit hash of its key columns and a 64-bit hash of its value columns.
+    Hashes are computed chunk by chunk, so neither side has to be sorted or copied as a whole;
+    only three integer columns per row are kept while the hashes of both sides are joined.
+    Rows with the same key are matched by order of occurrence, so duplicated keys are reported
+    as missing or extra rows. Values are normalized before hashing (categories, dates, Decimals,
+    numbers), so the same data read from Postgres and from parquet hashes the same.
+    """
+
+    def __init__(self, key_columns=None, chunk_size: int = 1_000_000, sample_size: int = 10,
+                 float_precision: int = 6):
+        """
+        Args:
+            key_columns (list): Columns identifying a row. If None, whole rows are compared,
+                so differences are reported as missing/extra rows only.
+            chunk_size (int): Number of rows hashed at once.
+            sample_size (int): Maximum number of sampled rows per kind of difference.
+            float_precision (int): Numeric values are rounded to this number of decimals before hashing.
+        """
+        self.key_columns = list(key_columns) if key_columns else None
+        self.chunk_size = chunk_size
+        self.sample_size = sample_size
+        self.float_precision = float_precision
+
+    def normalize(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Converts the columns of a chunk to a canonical representation for hashing."""
+        normalized = {}
+        for name, column in chunk.items():
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                column = column.astype(object)
+            if pd.api.types.is_datetime64_any_dtype(column.dtype):
+                normalized[name] = column.astype("datetime64[us]")
+            elif pd.api.types.is_bool_dtype(column.dtype):
+                normalized[name] = column
+            elif pd.api.types.is_numeric_dtype(column.dtype):
+                normalized[name] = column.astype("float64").round(self.float_precision)
+            else:
+                kind = pd.api.types.infer_dtype(column, skipna=True)
+                if kind in ("date", "datetime", "datetime64"):
+                    normalized[name] = pd.to_datetime(column).astype("datetime64[us]")
+                elif kind in ("decimal", "integer", "floating", "mixed-integer-float"):
+                    normalized[name] = pd.to_numeric(column).astype("float64").round(self.float_precision)
+                else:
+                    normalized[name] = column.astype(object)
+        return pd.DataFrame(normalized, index=chunk.index)
+
+    def hash_rows(self, df: pd.DataFrame, columns: list) -> pd.DataFrame:
+        """
+        Returns key hash, value hash, occurrence number and position of every row of df.
+        """
+        key_columns = self.key_columns or columns
+        value_columns = [column for column in columns if column not in key_columns]
+        key_hashes = np.empty(len(df), dtype="uint64")
+        value_hashes = np.zeros(len(df), dtype="uint64")
+
+        for start in range(0, len(df), self.chunk_size):
+            chunk = self.normalize(df.iloc[start:start + self.chunk_size][columns])
+            stop = start + len(chunk)
+            key_hashes[start:stop] = hash_pandas_object(chunk[key_columns], index=False).to_numpy()
+            if value_columns:
+                value_hashes[start:stop] = hash_pandas_object(chunk[value_columns], index=False).to_numpy()
+
+        hashes = pd.DataFrame({"key_hash": key_hashes, "value_hash": value_hashes,
+                               "position": np.arange(len(df), dtype="int64")})
+        hashes["occurrence"] = hashes.groupby("key_hash").cumcount()
+        return hashes
+
+    def compare(self, source: pd.DataFrame, target: pd.DataFrame) -> RowDiffResult:
+        """
+        Compares the columns of the source DataFrame with the same columns of the target DataFrame.
+        """
+        columns = list(source.columns)
+        absent = [column for column in columns if column not in target.columns]
+        if absent:
+            raise ValueError(f"Columns missing in target DataFrame: {absent}")
+        if self.key_columns:
+            unknown = [column for column in self.key_columns if column not in columns]
+            if unknown:
+                raise ValueError(f"Key columns missing in source DataFrame: {unknown}")
+
+        merged = self.hash_rows(source, columns).merge(
+            self.hash_rows(target, columns),
+            how="outer",
+            on=["key_hash", "occurrence"],
+            suffixes=("_source", "_target"),
+            indicator=True,
+        )
+        missing = merged["_merge"] == "left_only"
+        extra = merged["_merge"] == "right_only"
+        changed = (merged["_merge"] == "both") & (merged["value_hash_source"] != merged["value_hash_target"])
+
+        return RowDiffResult(
+            missing_count=int(missing.sum()),
+            extra_count=int(extra.sum()),
+            changed_count=int(changed.sum()),
+            missing_sample=self._sample(source, columns, merged.loc[missing, "position_source"]),
+            extra_sample=self._sample(target, columns, merged.loc[extra, "position_target"]),
+            changed_sample=self._changed_sample(source, target, columns, merged.loc[changed]),
+        )
+
+    def _sample(self, df: pd.DataFrame, columns: list, positions: pd.Series) -> pd.DataFrame:
+        positions = positions.head(self.sample_size).astype("int64").to_numpy()
+        return df.iloc[positions][columns].reset_index(drop=True)
+
+    def _changed_sample(self, source: pd.DataFrame, target: pd.DataFrame, columns: list,
+                        changed: pd.DataFrame) -> pd.DataFrame:
+        changed = changed.head(self.sample_size)
+        source_rows = self._sample(source, columns, changed["position_source"])
+        target_rows = self._sample(target, columns, changed["position_target"])
+        key_columns = self.key_columns or []
+        value_columns = [column for column in columns if column not in key_columns]
+        return pd.concat(
+            [source_rows[key_columns],
+             source_rows[value_columns].add_suffix("_source"),
+             target_rows[value_columns].add_suffix("_target")],
+            axis=1,
+        )
@@ -0,0 +1,143 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.data_quality.uniqueness import hash_keys
+
+
+@dataclass
+class RuleResult:
+    """Verdict of a single rule: passed flag, number of offending rows (or count difference) and a message."""
+    rule_id: str
+    passed: bool
+    failed_count: int = 0
+    message: str = ""
+
+
+class RuleSet:
+    """
+    Declarative data quality rules of a dataset, compiled into a single evaluation.
+
+    A spec is a plain dict, e.g.:
+
+        {
+            "keys": ["facility_name", "visit_date"],
+            "not_null": ["facility_name", "visit_date", "min_time_spent"],
+            "ranges": {"min_time_spent": (15, 60)},
+            "unique": [["facility_name", "visit_date"]],
+            "row_count_parity": True,
+        }
+
+    Every entry expands into one or more rules with a stable id ("unique_keys", "not_null[visit_date]",
+    "range[min_time_spent]", "unique[...]", "row_count_parity", "not_empty"), so tests can be
+    parametrized with one pytest result per rule. All verdicts come from one aggregate() pass:
+    every checked column is read once for its null and out-of-range counts, and every distinct
+    uniqueness column set is hashed once. evaluate() aggregates a whole DataFrame,
+    StreamingRuleEvaluator aggregates record batches with bounded memory.
+    """
+
+    SPEC_KEYS = ("keys", "not_null", "ranges", "unique", "row_count_parity", "not_empty")
+
+    def __init__(self, spec: dict):
+        unknown = [key for key in spec if key not in self.SPEC_KEYS]
+        if unknown:
+            raise ValueError(f"Unknown rule spec entries: {unknown}")
+        self.spec = spec
+        self.rules = self._compile(spec)
+
+    @staticmethod
+    def _compile(spec: dict) -> dict:
+        """Expands the spec into {rule_id: (kind, arguments)}."""
+        rules = {}
+        if spec.get("not_empty", True):
+            rules["not_empty"] = ("not_empty", None)
+        if spec.get("keys"):
+            rules["unique_keys"] = ("unique", tuple(spec["keys"]))
+        for column in spec.get("not_null", []):
+            rules[f"not_null[{column}]"] = ("not_null", column)
+        for column, (min_value, max_value) in spec.get("ranges", {}).items():
+            rules[f"range[{column}]"] = ("range", (column, min_value, max_value))
+        for columns in spec.get("unique", []):
+            rules[f"unique[{','.join(columns)}]"] = ("unique", tuple(columns))
+        if spec.get("row_count_parity"):
+            rules["row_count_parity"] = ("row_count_parity", None)
+        return rules
+
+    @property
+    def rule_ids(self) -> list:
+        return list(self.rules)
+
+    @staticmethod
+    def out_of_range_count(column: pd.Series, min_value=None, max_value=None) -> int:
+        """Number of values outside [min_value, max_value] (Decimals and numeric objects are compared as floats)."""
+        if column.dtype == object:
+            column = pd.to_numeric(column, errors="coerce")
+        values = column.to_numpy()
+        outside = np.zeros(len(values), dtype=bool)
+        if min_value is not None:
+            outside |= values < min_value
+        if max_value is not None:
+            outside |= values > max_value
+        return int(np.count_nonzero(outside))
+
+    def arguments_of(self, kind: str) -> list:
+        """Distinct arguments of all rules of a kind (columns, column sets or ranges)."""
+        return list(dict.fromkeys(arguments for rule_kind, arguments in self.rules.values() if rule_kind == kind))
+
+    def aggregate(self, df: pd.DataFrame) -> tuple:
+        """
+        Single pass over the checked columns of df (a DataFrame or a record batch).
+        Returns (row_count, {column: null count}, {range: out-of-range count}, {columns: key hashes}).
+        """
+        not_null_columns = self.arguments_of("not_null")
+        ranges_by_column = {}
+        for arguments in self.arguments_of("range"):
+            ranges_by_column.setdefault(arguments[0], []).append(arguments)
+        null_counts, range_counts = {}, {}
+        for column in dict.fromkeys([*not_null_columns, *ranges_by_column]):
+            values = df[column]
+            if column in not_null_columns:
+                null_counts[column] = int(values.isna().sum())
+            for arguments in ranges_by_column.get(column, []):
+                range_counts[arguments] = self.out_of_range_count(values, *arguments[1:])
+        key_hashes = {columns: hash_keys(df, columns) for columns in self.arguments_of("unique")}
+        return len(df), null_counts, range_counts, key_hashes
+
+    def evaluate(self, df: pd.DataFrame, source: pd.DataFrame = None) -> dict:
+        """
+        Computes the verdicts of all rules on df. source is only needed for row_count_parity.
+        Returns {rule_id: RuleResult}.
+        """
+        row_count, null_counts, range_counts, key_hashes = self.aggregate(df)
+        duplicate_counts = {columns: len(hashes) - len(np.unique(hashes)) for columns, hashes in key_hashes.items()}
+        return self.verdicts(row_count, null_counts, duplicate_counts, range_counts,
+                             None if source is None else len(source))
+
+    def verdicts(self, row_count: int, null_counts: dict, duplicate_counts: dict, range_counts: dict,
+                 source_row_count: int = None) -> dict:
+        """Builds {rule_id: RuleResult} from the aggregated counts of an evaluation."""
+        results = {}
+        for rule_id, (kind, arguments) in self.rules.items():
+            if kind == "not_empty":
+                results[rule_id] = RuleResult(rule_id, row_count > 0, message="DataFrame is empty.")
+            elif kind == "not_null":
+                count = int(null_counts[arguments])
+                results[rule_id] = RuleResult(rule_id, count == 0, count,
+                                              f"{count} null values found in column {arguments}")
+            elif kind == "unique":
+                count = duplicate_counts[arguments]
+                results[rule_id] = RuleResult(rule_id, count == 0, count,
+                                              f"{count} duplicates found on columns {list(arguments)}")
+            elif kind == "range":
+                column, min_value, max_value = arguments
+                count = range_counts[arguments]
+                results[rule_id] = RuleResult(rule_id, count == 0, count,
+                                              f"{count} values of column {column} outside [{min_value}, {max_value}]")
+            elif kind == "row_count_parity":
+                if source_row_count is None:
+                    raise ValueError("row_count_parity requires the source data")
+                difference = abs(source_row_count - row_count)
+                results[rule_id] = RuleResult(rule_id, difference == 0, difference,
+                                              f"Row count mismatch: source={source_row_count}, target={row_count}")
+        return results
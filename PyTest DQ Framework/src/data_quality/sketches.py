@@ -0,0 +1,323 @@
+import hashlib
+import math
+import os
+import uuid
+import zipfile
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from src.data_quality.uniqueness import hash_keys
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct count estimator with 2^precision one-byte registers
+    (16 KiB and a standard error of about 0.8% for the default precision 14).
+    Sketches of the same precision are merged with an element-wise maximum.
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if not len(hashes):
+            return
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        remainder = hashes << np.uint64(self.precision)
+        # Leading zeros of the remaining bits, from the bit length of their top 53 bits (exact as float64)
+        _, bit_length = np.frexp((remainder >> np.uint64(11)).astype(np.float64))
+        rank = np.where(bit_length > 0, 54 - bit_length, 54)
+        rank = np.minimum(rank, 64 - self.precision + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def add(self, df: pd.DataFrame, column_names) -> None:
+        self.add_hashes(hash_keys(df, column_names))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        merged = HyperLogLog(self.precision)
+        merged.registers = np.maximum(self.registers, other.registers)
+        return merged
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # linear counting for small cardinalities
+        return float(estimate)
+
+
+class QuantileSketch:
+    """
+    Quantile sketch with relative accuracy guarantees (DDSketch): values are counted in
+    logarithmic buckets, so every quantile is returned within relative_accuracy of the exact value.
+    Sketches with the same accuracy are merged by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _bucket_counts(self, values: np.ndarray, buckets: dict) -> None:
+        indexes, counts = np.unique(np.ceil(np.log(values) / math.log(self.gamma)).astype(np.int64),
+                                    return_counts=True)
+        for index, count in zip(indexes.tolist(), counts.tolist()):
+            buckets[index] = buckets.get(index, 0) + count
+
+    def add(self, values) -> None:
+        """Adds the non-null values of a Series or array (Decimals and numeric objects are converted to float)."""
+        values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self._bucket_counts(values[values > 0], self.positive)
+        self._bucket_counts(-values[values < 0], self.negative)
+        self.zero_count += int(np.count_nonzero(values == 0))
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge quantile sketches of different accuracy")
+        merged = QuantileSketch(self.relative_accuracy)
+        for buckets, merged_buckets in ((self.positive, merged.positive), (self.negative, merged.negative)):
+            merged_buckets.update(buckets)
+        for buckets, merged_buckets in ((other.positive, merged.positive), (other.negative, merged.negative)):
+            for index, count in buckets.items():
+                merged_buckets[index] = merged_buckets.get(index, 0) + count
+        merged.zero_count = self.zero_count + other.zero_count
+        merged.count = self.count + other.count
+        merged.min = min(self.min, other.min)
+        merged.max = max(self.max, other.max)
+        return merged
+
+    def _bucket_value(self, index: int) -> float:
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def quantile(self, q: float):
+        """Approximate q-quantile (0 <= q <= 1), None for an empty sketch."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.negative, reverse=True):
+            seen += self.negative[index]
+            if seen > rank:
+                return max(-self._bucket_value(index), self.min)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            if seen > rank:
+                return min(self._bucket_value(index), self.max)
+        return self.max
+
+
+class BloomFilter:
+    """
+    Bloom filter over 64-bit hashes, sized for the expected number of items and false positive rate.
+    add_hashes() reports which items may have been added before, so it yields duplicate
+    candidates in one pass; candidates must be verified exactly. Filters of the same size are
+    merged with a bitwise OR.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(int(capacity), 1)
+        self.error_rate = error_rate
+        self.num_bits = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.num_hashes = max(int(round(self.num_bits / capacity * math.log(2))), 1)
+        self.bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, hashes: np.ndarray) -> np.ndarray:
+        """Bit positions of every hash (double hashing), shape (len(hashes), num_hashes)."""
+        first = hashes & np.uint64(0xFFFFFFFF)
+        second = (hashes >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        return ((first[:, None] + steps[None, :] * second[:, None]) % np.uint64(self.num_bits)).astype(np.int64)
+
+    def add_hashes(self, hashes: np.ndarray) -> np.ndarray:
+        """Adds the hashes and returns a mask of those that were possibly added before (or repeat in this batch)."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        positions = self._positions(hashes)
+        byte_index, bit_mask = positions >> 3, (1 << (positions & 7)).astype(np.uint8)
+        seen = (self.bits[byte_index] & bit_mask).astype(bool).all(axis=1) | pd.Series(hashes).duplicated().to_numpy()
+        np.bitwise_or.at(self.bits, byte_index.ravel(), bit_mask.ravel())
+        return seen
+
+    def merge(self, other: "BloomFilter") -> "BloomFilter":
+        if other.num_bits != self.num_bits or other.num_hashes != self.num_hashes:
+            raise ValueError("Cannot merge Bloom filters of different size")
+        merged = BloomFilter.__new__(BloomFilter)
+        merged.error_rate = self.error_rate
+        merged.num_bits = self.num_bits
+        merged.num_hashes = self.num_hashes
+        merged.bits = self.bits | other.bits
+        return merged
+
+
+def find_duplicates(batches, column_names, capacity: int, error_rate: float = 0.001) -> pd.DataFrame:
+    """
+    Finds duplicated keys with a Bloom filter followed by exact verification.
+
+    batches is a callable returning a fresh iterable of DataFrames (e.g. ParquetReader.iter_batches
+    projected on the key columns); it is consumed twice. The first pass keeps only the hashes of
+    keys the filter has possibly seen before, the second pass collects the rows with those hashes
+    and checks them exactly. Memory is bounded by the filter and the candidate rows.
+    Returns the duplicated keys with their number of occurrences.
+    """
+    column_names = list(column_names)
+    bloom = BloomFilter(capacity, error_rate)
+    candidates = []
+    for batch in batches():
+        hashes = hash_keys(batch, column_names)
+        candidates.append(hashes[bloom.add_hashes(hashes)])
+    candidates = np.unique(np.concatenate(candidates)) if candidates else np.empty(0, dtype=np.uint64)
+    if not len(candidates):
+        return pd.DataFrame(columns=column_names + ["occurrences"])
+
+    candidate_rows = [batch.loc[np.isin(hash_keys(batch, column_names), candidates), column_names]
+                      for batch in batches()]
+    candidate_rows = pd.concat(candidate_rows, ignore_index=True)
+    duplicates = candidate_rows.groupby(column_names, observed=True, dropna=False).size()
+    return duplicates[duplicates > 1].rename("occurrences").reset_index()
+
+
+@dataclass
+class PartitionSketch:
+    """
+    Mergeable summary of one partition (or, after merging, of a whole dataset): row count,
+    a HyperLogLog of the key columns and quantile sketches of the numeric columns.
+    """
+    row_count: int = 0
+    key_distinct: HyperLogLog = field(default_factory=HyperLogLog)
+    quantiles: dict = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, key_columns, quantile_columns=(), relative_accuracy: float = 0.01,
+              precision: int = 14) -> "PartitionSketch":
+        sketch = cls(row_count=len(df), key_distinct=HyperLogLog(precision))
+        sketch.key_distinct.add(df, key_columns)
+        for column in quantile_columns:
+            sketch.quantiles[column] = QuantileSketch(relative_accuracy)
+            sketch.quantiles[column].add(df[column])
+        return sketch
+
+    def merge(self, other: "PartitionSketch") -> "PartitionSketch":
+        quantiles = dict(self.quantiles)
+        for column, quantile_sketch in other.quantiles.items():
+            quantiles[column] = quantiles[column].merge(quantile_sketch) if column in quantiles else quantile_sketch
+        return PartitionSketch(row_count=self.row_count + other.row_count,
+                               key_distinct=self.key_distinct.merge(other.key_distinct),
+                               quantiles=quantiles)
+
+
+class SketchStore:
+    """
+    Persistent store of per-partition sketches of parquet datasets.
+
+    A sketch is keyed by the partition, the sketch settings and the modification times and sizes
+    of the partition files, so only new or rewritten partitions are read again on later runs.
+    """
+
+    EXTENSION = ".npz"
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+
+    def _path(self, *parts) -> str:
+        digest = hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+        return os.path.join(self.store_dir, digest + self.EXTENSION)
+
+    @staticmethod
+    def _bucket_array(buckets: dict) -> np.ndarray:
+        return np.array(sorted(buckets.items()), dtype=np.int64).reshape(-1, 2)
+
+    def _load(self, path: str):
+        """Reads a sketch saved by _save(); plain numpy arrays only, nothing is unpickled."""
+        try:
+            with np.load(path, allow_pickle=False) as arrays:
+                sketch = PartitionSketch(row_count=int(arrays["row_count"]))
+                sketch.key_distinct = HyperLogLog(int(arrays["precision"]))
+                sketch.key_distinct.registers = arrays["registers"].astype(np.uint8)
+                for i, column in enumerate(arrays["quantile_columns"].tolist()):
+                    relative_accuracy, zero_count, count, minimum, maximum = arrays[f"stats_{i}"].tolist()
+                    quantile_sketch = QuantileSketch(relative_accuracy)
+                    quantile_sketch.positive = dict(arrays[f"positive_{i}"].tolist())
+                    quantile_sketch.negative = dict(arrays[f"negative_{i}"].tolist())
+                    quantile_sketch.zero_count, quantile_sketch.count = int(zero_count), int(count)
+                    quantile_sketch.min, quantile_sketch.max = minimum, maximum
+                    sketch.quantiles[column] = quantile_sketch
+                return sketch
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+
+    def _save(self, path: str, sketch: PartitionSketch) -> None:
+        arrays = {
+            "row_count": np.array(sketch.row_count, dtype=np.int64),
+            "precision": np.array(sketch.key_distinct.precision, dtype=np.int64),
+            "registers": sketch.key_distinct.registers,
+            "quantile_columns": np.array(list(sketch.quantiles), dtype=str),
+        }
+        for i, quantile_sketch in enumerate(sketch.quantiles.values()):
+            arrays[f"stats_{i}"] = np.array([quantile_sketch.relative_accuracy, quantile_sketch.zero_count,
+                                             quantile_sketch.count, quantile_sketch.min, quantile_sketch.max],
+                                            dtype=np.float64)
+            arrays[f"positive_{i}"] = self._bucket_array(quantile_sketch.positive)
+            arrays[f"negative_{i}"] = self._bucket_array(quantile_sketch.negative)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as file:
+            np.savez(file, **arrays)
+        os.replace(tmp_path, path)
+
+    def sketch_partitions(self, parquet_reader, root_path: str, key_columns, quantile_columns=(),
+                          relative_accuracy: float = 0.01) -> dict:
+        """
+        Returns {partition: PartitionSketch} for every hive partition of the dataset,
+        computing only the sketches that are not stored yet.
+        """
+        sketches = {}
+        for partition, files in parquet_reader.partition_files(root_path).items():
+            path = self._path(os.path.abspath(root_path), partition, tuple(key_columns), tuple(quantile_columns),
+                              relative_accuracy, parquet_reader.freshness_token(files))
+            sketch = self._load(path)
+            if sketch is None:
+                columns = list(dict.fromkeys([*key_columns, *quantile_columns]))
+                df = parquet_reader.read_files(root_path, files, columns=columns)
+                sketch = PartitionSketch.build(df, key_columns, quantile_columns, relative_accuracy)
+                self._save(path, sketch)
+            sketches[partition] = sketch
+        return sketches
+
+    def sketch_dataset(self, parquet_reader, root_path: str, key_columns, quantile_columns=(),
+                       relative_accuracy: float = 0.01) -> PartitionSketch:
+        """Merges the partition sketches of the dataset into one sketch."""
+        sketches = list(self.sketch_partitions(parquet_reader, root_path, key_columns, quantile_columns,
+                                               relative_accuracy).values())
+        if not sketches:
+            raise ValueError(f"No parquet files found in {root_path}")
+        result = sketches[0]
+        for sketch in sketches[1:]:
+            result = result.merge(sketch)
+        return result
@@ -0,0 +1,135 @@
+import re
+
+_QUERY_PATTERN = re.compile(r"^\s*(select|with|values|table)\b", re.IGNORECASE)
+
+
+class SqlCheckCompiler:
+    """
+    Compiles data quality checks into aggregate SQL statements, so they run inside PostgreSQL
+    and only the verdict (plus a few example rows) is transferred to the client.
+
+    Every check accepts either a table name (optionally schema-qualified, e.g. "public.visits")
+    or a SELECT query. The relation is always available under the alias "src".
+    """
+
+    @staticmethod
+    def quote_identifier(name: str) -> str:
+        return '"' + name.replace('"', '""') + '"'
+
+    @classmethod
+    def relation(cls, table_or_query: str, alias: str = "src") -> str:
+        """Returns a FROM clause item for a table name or a query."""
+        if _QUERY_PATTERN.match(table_or_query):
+            query = table_or_query.strip().rstrip(";")
+            return f"({query}) AS {alias}"
+        table = ".".join(cls.quote_identifier(part) for part in table_or_query.strip().split("."))
+        return f"{table} AS {alias}"
+
+    @classmethod
+    def column_list(cls, column_names, alias: str = "src") -> str:
+        return ", ".join(f"{alias}.{cls.quote_identifier(column)}" for column in column_names)
+
+    @classmethod
+    def count(cls, table_or_query: str) -> str:
+        return f"SELECT COUNT(*) AS row_count FROM {cls.relation(table_or_query)}"
+
+    @classmethod
+    def exists(cls, table_or_query: str) -> str:
+        return f"SELECT EXISTS (SELECT 1 FROM {cls.relation(table_or_query)}) AS not_empty"
+
+    @classmethod
+    def null_counts(cls, table_or_query: str, column_names=None) -> str:
+        """
+        One aggregate with a null count per column. Without column names, rows
+        containing at least one null value are counted (NOT (src IS NOT NULL)).
+        """
+        if not column_names:
+            return (f"SELECT COUNT(*) FILTER (WHERE NOT (src IS NOT NULL)) AS rows_with_nulls "
+                    f"FROM {cls.relation(table_or_query)}")
+        counts = ", ".join(
+            f"COUNT(*) FILTER (WHERE src.{cls.quote_identifier(column)} IS NULL) AS {cls.quote_identifier(column)}"
+            for column in column_names
+        )
+        return f"SELECT {counts} FROM {cls.relation(table_or_query)}"
+
+    @classmethod
+    def duplicate_groups(cls, table_or_query: str, column_names=None) -> str:
+        """GROUP BY the columns (or the whole row) and keep the groups that occur more than once."""
+        group_by = cls.column_list(column_names) if column_names else "src"
+        select = group_by if column_names else "src::text AS row_value"
+        return (f"SELECT {select}, COUNT(*) AS occurrences FROM {cls.relation(table_or_query)} "
+                f"GROUP BY {group_by} HAVING COUNT(*) > 1")
+
+    @classmethod
+    def duplicate_count(cls, table_or_query: str, column_names=None) -> str:
+        """Number of duplicated rows, i.e. rows beyond the first occurrence of every group."""
+        return (f"SELECT COALESCE(SUM(occurrences - 1), 0) AS duplicate_count "
+                f"FROM ({cls.duplicate_groups(table_or_query, column_names)}) AS duplicates")
+
+    @classmethod
+    def duplicate_examples(cls, table_or_query: str, column_names=None, limit: int = 5) -> str:
+        return (f"{cls.duplicate_groups(table_or_query, column_names)} "
+                f"ORDER BY COUNT(*) DESC LIMIT {int(limit)}")
+
+    @staticmethod
+    def literal(value) -> str:
+        return "'" + str(value).replace("'", "''") + "'"
+
+    @classmethod
+    def partition_fingerprints(cls, table_or_query: str, partition_expression: str, row_hash_expression: str,
+                               measure_column: str) -> str:
+        """
+        Row count, sum of the measure and an order-independent row hash per partition:
+        the sum (mod 2^64) of row_hash_expression, a numeric expression between 0 and 2^64 - 1.
+        """
+        return (f"SELECT {partition_expression} AS partition_value, COUNT(*) AS row_count, "
+                f"SUM(src.{cls.quote_identifier(measure_column)})::float8 AS measure_sum, "
+                f"MOD(SUM({row_hash_expression}), 18446744073709551616)::text AS row_hash "
+                f"FROM {cls.relation(table_or_query)} GROUP BY 1")
+
+    @classmethod
+    def partition_rows(cls, table_or_query: str, partition_expression: str, partitions) -> str:
+        """All rows of the given partitions."""
+        values = ", ".join(cls.literal(partition) for partition in partitions)
+        return f"SELECT src.* FROM {cls.relation(table_or_query)} WHERE {partition_expression} IN ({values})"
+
+    @classmethod
+    def with_partition_value(cls, table_or_query: str, partition_expression: str) -> str:
+        """All rows of a table or query with their partition value as an extra partition_value column."""
+        return f"SELECT src.*, {partition_expression} AS partition_value FROM {cls.relation(table_or_query)}"
+
+    @classmethod
+    def _orphan_condition(cls, child_columns, parent_table_or_query: str, parent_columns) -> str:
+        """Non-null child keys without a matching parent row (anti-join with NOT EXISTS)."""
+        not_null = " AND ".join(f"src.{cls.quote_identifier(column)} IS NOT NULL" for column in child_columns)
+        join = " AND ".join(
+            f"parent.{cls.quote_identifier(parent_column)} = src.{cls.quote_identifier(child_column)}"
+            for child_column, parent_column in zip(child_columns, parent_columns))
+        return (f"{not_null} AND NOT EXISTS "
+                f"(SELECT 1 FROM {cls.relation(parent_table_or_query, 'parent')} WHERE {join})")
+
+    @classmethod
+    def orphan_keys(cls, child_table_or_query: str, child_columns, parent_table_or_query: str, parent_columns) -> str:
+        """Distinct child keys that do not exist in the parent."""
+        return (f"SELECT DISTINCT {cls.column_list(child_columns)} FROM {cls.relation(child_table_or_query)} "
+                f"WHERE {cls._orphan_condition(child_columns, parent_table_or_query, parent_columns)}")
+
+    @classmethod
+    def orphan_count(cls, child_table_or_query: str, child_columns, parent_table_or_query: str, parent_columns) -> str:
+        return (f"SELECT COUNT(*) AS orphan_count FROM "
+                f"({cls.orphan_keys(child_table_or_query, child_columns, parent_table_or_query, parent_columns)}) AS orphans")
+
+    @classmethod
+    def orphan_keys_of_values(cls, child_columns, parent_table_or_query: str, parent_columns) -> str:
+        """
+        Anti-join of a shipped key set with the parent: the query takes one text array per key
+        column as %s parameters and returns the keys without a parent row. Parent columns are
+        compared as text.
+        """
+        arrays = ", ".join("%s::text[]" for _ in child_columns)
+        names = ", ".join(cls.quote_identifier(column) for column in child_columns)
+        join = " AND ".join(
+            f"parent.{cls.quote_identifier(parent_column)}::text = keys.{cls.quote_identifier(child_column)}"
+            for child_column, parent_column in zip(child_columns, parent_columns))
+        return (f"SELECT {cls.column_list(child_columns, 'keys')} FROM UNNEST({arrays}) AS keys ({names}) "
+                f"WHERE NOT EXISTS (SELECT 1 FROM {cls.relation(parent_table_or_query, 'parent')} WHERE {join})")
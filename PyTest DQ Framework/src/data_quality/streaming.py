@@ -0,0 +1,126 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+
+class SpillingHashSet:
+    """
+    Multiset of 64-bit key hashes with bounded memory.
+
+    Hashes are buffered in memory; once more than max_memory_items are buffered they are
+    appended to num_buckets files on disk, partitioned by their top bits. Duplicates are then
+    counted bucket by bucket, so at most about 1/num_buckets of all hashes is in memory at once.
+    """
+
+    def __init__(self, max_memory_items: int = 5_000_000, num_buckets: int = 64, spill_dir: str = None):
+        if num_buckets & (num_buckets - 1):
+            raise ValueError("num_buckets must be a power of two")
+        self.max_memory_items = max_memory_items
+        self.num_buckets = num_buckets
+        self.spill_dir = spill_dir
+        self.bucket_dir = None
+        self.buffer = []
+        self.buffered = 0
+        self.count = 0
+
+    def add(self, hashes: np.ndarray) -> None:
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        self.buffer.append(hashes)
+        self.buffered += len(hashes)
+        self.count += len(hashes)
+        if self.buffered > self.max_memory_items:
+            self._spill()
+
+    def _bucket_of(self, hashes: np.ndarray) -> np.ndarray:
+        shift = np.uint64(64 - self.num_buckets.bit_length() + 1)
+        return (hashes >> shift).astype(np.int64) if self.num_buckets > 1 else np.zeros(len(hashes), dtype=np.int64)
+
+    def _bucket_path(self, bucket: int) -> str:
+        return os.path.join(self.bucket_dir, f"{bucket}.bin")
+
+    def _spill(self) -> None:
+        if not self.buffer:
+            return
+        if self.bucket_dir is None:
+            self.bucket_dir = tempfile.mkdtemp(prefix="dq_hashes_", dir=self.spill_dir)
+        hashes = np.concatenate(self.buffer)
+        buckets = self._bucket_of(hashes)
+        order = np.argsort(buckets, kind="stable")
+        hashes, buckets = hashes[order], buckets[order]
+        bounds = np.searchsorted(buckets, np.arange(self.num_buckets + 1))
+        for bucket in range(self.num_buckets):
+            if bounds[bucket] < bounds[bucket + 1]:
+                with open(self._bucket_path(bucket), "ab") as file:
+                    hashes[bounds[bucket]:bounds[bucket + 1]].tofile(file)
+        self.buffer = []
+        self.buffered = 0
+
+    def _buckets(self):
+        """Yields all hashes bucket by bucket (everything at once if nothing was spilled)."""
+        if self.bucket_dir is None:
+            yield np.concatenate(self.buffer) if self.buffer else np.empty(0, dtype=np.uint64)
+            return
+        self._spill()
+        for bucket in range(self.num_buckets):
+            path = self._bucket_path(bucket)
+            if os.path.exists(path):
+                yield np.fromfile(path, dtype=np.uint64)
+
+    def duplicate_count(self) -> int:
+        """Number of hashes beyond the first occurrence of every distinct hash."""
+        distinct = sum(len(np.unique(hashes)) for hashes in self._buckets())
+        return self.count - distinct
+
+    def close(self) -> None:
+        if self.bucket_dir is not None:
+            shutil.rmtree(self.bucket_dir, ignore_errors=True)
+            self.bucket_dir = None
+        self.buffer = []
+        self.buffered = 0
+
+
+class StreamingRuleEvaluator:
+    """
+    Evaluates a RuleSet over a stream of record batches (ParquetReader.iter_batches,
+    PostgresConnectorContextManager.iter_batches_sql) instead of a complete DataFrame.
+
+    Every batch goes through RuleSet.aggregate(); only incremental state is kept: row counts,
+    null tallies and out-of-range counts per column, and one SpillingHashSet of key hashes
+    per uniqueness rule. Uniqueness is decided on
+    64-bit key hashes; a false duplicate requires a hash collision.
+    """
+
+    def __init__(self, rule_set, max_memory_hashes: int = 5_000_000, spill_dir: str = None):
+        self.rule_set = rule_set
+        self.max_memory_hashes = max_memory_hashes
+        self.spill_dir = spill_dir
+
+    def evaluate(self, batches, source_row_count: int = None) -> dict:
+        """
+        Consumes the target batches and returns {rule_id: RuleResult} like RuleSet.evaluate().
+        source_row_count is only needed for row_count_parity; count the source in the database
+        (SqlCheckCompiler.count) instead of streaming its rows.
+        """
+        rule_set = self.rule_set
+        null_counts = dict.fromkeys(rule_set.arguments_of("not_null"), 0)
+        range_counts = dict.fromkeys(rule_set.arguments_of("range"), 0)
+        key_sets = {columns: SpillingHashSet(self.max_memory_hashes, spill_dir=self.spill_dir)
+                    for columns in rule_set.arguments_of("unique")}
+        row_count = 0
+        try:
+            for batch in batches:
+                batch_rows, batch_nulls, batch_ranges, batch_hashes = rule_set.aggregate(batch)
+                row_count += batch_rows
+                for column, count in batch_nulls.items():
+                    null_counts[column] += count
+                for arguments, count in batch_ranges.items():
+                    range_counts[arguments] += count
+                for columns, hashes in batch_hashes.items():
+                    key_sets[columns].add(hashes)
+            duplicate_counts = {columns: key_set.duplicate_count() for columns, key_set in key_sets.items()}
+        finally:
+            for key_set in key_sets.values():
+                key_set.close()
+        return rule_set.verdicts(row_count, null_counts, duplicate_counts, range_counts, source_row_count)
@@ -0,0 +1,102 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from pandas.util import hash_pandas_object
+
+from src.data_quality.row_diff import RowDiffEngine
+
+_NORMALIZER = RowDiffEngine()
+
+
+def hash_keys(df: pd.DataFrame, column_names=None, chunk_size: int = 1_000_000) -> np.ndarray:
+    """
+    64-bit hash of the given columns (all columns if None) of every row, computed chunk by chunk.
+    Values are normalized like in RowDiffEngine, so the same key read from Postgres and from
+    parquet hashes the same. Every hash-based uniqueness check (UniquenessEngine, RuleSet,
+    Bloom filter and HyperLogLog sketches) uses this function.
+    """
+    columns = list(column_names) if column_names else list(df.columns)
+    hashes = np.empty(len(df), dtype=np.uint64)
+    for start in range(0, len(df), chunk_size):
+        chunk = _NORMALIZER.normalize(df.iloc[start:start + chunk_size][columns])
+        hashes[start:start + len(chunk)] = hash_pandas_object(chunk, index=False).to_numpy()
+    return hashes
+
+
+@dataclass
+class UniquenessResult:
+    """
+    Result of a uniqueness check: duplicate_count rows repeat an earlier row (or key),
+    duplicated_key_count distinct keys occur more than once, top_keys holds the most
+    frequent of them with their number of occurrences.
+    """
+    row_count: int = 0
+    duplicate_count: int = 0
+    duplicated_key_count: int = 0
+    top_keys: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    @property
+    def is_unique(self) -> bool:
+        return self.duplicate_count == 0
+
+    def summary(self) -> str:
+        lines = [f"{self.duplicate_count} duplicated rows, {self.duplicated_key_count} duplicated keys "
+                 f"in {self.row_count} rows"]
+        if not self.top_keys.empty:
+            lines.append(f"Top duplicated keys:\n{self.top_keys.to_string(index=False)}")
+        return "\n".join(lines)
+
+
+class UniquenessEngine:
+    """
+    Hash-based duplicate detection that never copies the DataFrame.
+
+    Every row is reduced to a 64-bit hash of its key columns (or of all columns) with hash_keys(),
+    chunk by chunk. The hashes are sorted to find the values that occur more than once; only the rows
+    carrying such a hash are then compared exactly, so hash collisions are never reported as
+    duplicates. Peak memory is about 16 bytes per row plus the candidate rows.
+    """
+
+    def __init__(self, key_columns=None, chunk_size: int = 1_000_000, top_n: int = 10):
+        """
+        Args:
+            key_columns (list): Columns identifying a row. If None, whole rows are compared.
+            chunk_size (int): Number of rows hashed at once.
+            top_n (int): Number of most frequent duplicated keys returned.
+        """
+        self.key_columns = list(key_columns) if key_columns else None
+        self.chunk_size = chunk_size
+        self.top_n = top_n
+
+    def hash_keys(self, df: pd.DataFrame) -> np.ndarray:
+        return hash_keys(df, self.key_columns, self.chunk_size)
+
+    @staticmethod
+    def repeated_hashes(hashes: np.ndarray) -> np.ndarray:
+        """Hash values occurring more than once, found with a sort over the integers."""
+        ordered = np.sort(hashes)
+        repeated = ordered[1:][ordered[1:] == ordered[:-1]]
+        return np.unique(repeated)
+
+    def check(self, df: pd.DataFrame) -> UniquenessResult:
+        columns = self.key_columns or list(df.columns)
+        missing = [column for column in columns if column not in df.columns]
+        if missing:
+            raise ValueError(f"Key columns missing in DataFrame: {missing}")
+
+        hashes = self.hash_keys(df)
+        candidates = self.repeated_hashes(hashes)
+        if not len(candidates):
+            return UniquenessResult(row_count=len(df))
+
+        candidate_rows = df.loc[np.isin(hashes, candidates), columns]
+        occurrences = candidate_rows.groupby(columns, observed=True, dropna=False, sort=False).size()
+        occurrences = occurrences[occurrences > 1]
+        top_keys = occurrences.sort_values(ascending=False, kind="stable").head(self.top_n)
+        return UniquenessResult(
+            row_count=len(df),
+            duplicate_count=int((occurrences - 1).sum()),
+            duplicated_key_count=len(occurrences),
+            top_keys=top_keys.rename("occurrences").reset_index(),
+        )
@@ -0,0 +1,92 @@
+"""
+PyTest plugin recording every DQ test into the DqRunHistory SQLite database:
+verdict, duration, and the rows and bytes read per data source while the test
+(including the fixtures it set up) ran.
+"""
+
+import os
+import time
+import uuid
+
+import pytest
+
+from src.connectors.scan_metrics import scan_meter
+from src.history.run_history import DqRunHistory
+
+
+def pytest_addoption(parser):
+    parser.addoption("--dq_history_path", action="store", default="dq_history.sqlite",
+                     help="SQLite database with the history of DQ check results")
+    parser.addoption("--no_dq_history", action="store_true", default=False,
+                     help="Do not record DQ check results")
+
+
+def pytest_configure(config):
+    if config.getoption("--no_dq_history"):
+        config.dq_history = None
+        return
+    workerinput = getattr(config, "workerinput", None)
+    config.dq_run_id = workerinput["dq_run_id"] if workerinput else f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    config.dq_history = DqRunHistory(config.getoption("--dq_history_path"))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Shares the run id of the controller with every pytest-xdist worker."""
+    if node.config.dq_history is not None:
+        node.workerinput["dq_run_id"] = node.config.dq_run_id
+
+
+def _dataset(item) -> str:
+    marker = item.get_closest_marker("xdist_group")
+    return marker.kwargs.get("name", item.module.__name__) if marker else item.module.__name__
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    item.dq_reports = getattr(item, "dq_reports", []) + [report]
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    history = item.config.dq_history
+    if history is None:
+        yield
+        return
+    item.dq_reports = []
+    before = scan_meter.snapshot()
+    yield
+    scans = scan_meter.delta(before)
+
+    reports = item.dq_reports
+    if any(report.failed and report.when != "call" for report in reports):
+        verdict = "error"
+    elif any(report.failed for report in reports):
+        verdict = "failed"
+    elif any(report.skipped for report in reports):
+        verdict = "skipped"
+    else:
+        verdict = "passed"
+    history.record(
+        run_id=item.config.dq_run_id,
+        test_id=item.nodeid,
+        check_name=item.name,
+        dataset=_dataset(item),
+        verdict=verdict,
+        duration_s=sum(report.duration for report in reports),
+        scans=scans,
+        worker=os.environ.get("PYTEST_XDIST_WORKER", "master"),
+    )
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    history = getattr(config, "dq_history", None)
+    if history is None or hasattr(config, "workerinput"):
+        return
+    regressions = history.regressions(config.dq_run_id)
+    if regressions.empty:
+        return
+    terminalreporter.section("DQ check regressions")
+    terminalreporter.write_line(regressions.to_string(index=False))
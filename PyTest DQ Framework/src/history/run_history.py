@@ -0,0 +1,116 @@
+import argparse
+import sqlite3
+import time
+
+import pandas as pd
+
+
+class DqRunHistory:
+    """
+    Local SQLite history of DQ check results.
+
+    Every executed test is stored with its verdict, duration, and the rows and bytes the connectors
+    read while it ran, split by data source (postgres, parquet, parquet_footer, arrow_snapshot,
+    cache). Writes open a short-lived connection, so several pytest-xdist workers can record into
+    the same file.
+    """
+
+    CREATE_TABLE_QUERY = """
+    CREATE TABLE IF NOT EXISTS check_runs (
+        run_id TEXT NOT NULL,
+        started_at REAL NOT NULL,
+        test_id TEXT NOT NULL,
+        check_name TEXT NOT NULL,
+        dataset TEXT NOT NULL,
+        verdict TEXT NOT NULL,
+        duration_s REAL NOT NULL,
+        data_source TEXT NOT NULL,
+        rows_scanned INTEGER NOT NULL,
+        bytes_read INTEGER NOT NULL,
+        worker TEXT
+    )
+    """
+
+    CREATE_INDEX_QUERY = "CREATE INDEX IF NOT EXISTS check_runs_check ON check_runs (check_name, dataset, started_at)"
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(self.CREATE_TABLE_QUERY)
+            conn.execute(self.CREATE_INDEX_QUERY)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def record(self, run_id: str, test_id: str, check_name: str, dataset: str, verdict: str,
+               duration_s: float, scans: dict, worker: str = None) -> None:
+        """
+        Stores the result of one test. scans is {data source: (rows, bytes)} as returned by
+        ScanMeter.delta(); a test that read nothing is stored with the data source "none".
+        """
+        started_at = time.time() - duration_s
+        rows = [(run_id, started_at, test_id, check_name, dataset, verdict, duration_s, source, rows_scanned,
+                 bytes_read, worker)
+                for source, (rows_scanned, bytes_read) in (scans or {"none": (0, 0)}).items()]
+        with self._connect() as conn:
+            conn.executemany("INSERT INTO check_runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def runs(self) -> pd.DataFrame:
+        """One row per test and run: verdict, duration and the totals over all data sources."""
+        query = """
+        SELECT run_id, MIN(started_at) AS started_at, test_id, check_name, dataset, verdict,
+               MAX(duration_s) AS duration_s, SUM(rows_scanned) AS rows_scanned, SUM(bytes_read) AS bytes_read,
+               GROUP_CONCAT(data_source) AS data_sources
+        FROM check_runs
+        GROUP BY run_id, test_id, check_name, dataset, verdict
+        ORDER BY started_at
+        """
+        with self._connect() as conn:
+            return pd.read_sql_query(query, conn)
+
+    def regressions(self, run_id: str = None, baseline_runs: int = 10, factor: float = 1.5,
+                    min_duration_s: float = 0.5) -> pd.DataFrame:
+        """
+        Compares the tests of a run (the latest one by default) with the median of the previous
+        baseline_runs runs of the same test. A test regressed if its duration or the rows or bytes
+        it read exceed the baseline by more than factor; durations below min_duration_s are ignored.
+        """
+        runs = self.runs()
+        if runs.empty:
+            return runs
+        run_starts = runs.groupby("run_id")["started_at"].min().sort_values()
+        run_id = run_id or run_starts.index[-1]
+        if run_id not in run_starts.index:
+            return runs.iloc[0:0]
+        previous_runs = run_starts[run_starts < run_starts[run_id]].index[-baseline_runs:]
+
+        current = runs[runs["run_id"] == run_id].set_index("test_id")
+        baseline = (runs[runs["run_id"].isin(previous_runs)]
+                    .groupby("test_id")[["duration_s", "rows_scanned", "bytes_read"]].median())
+        report = current.join(baseline, rsuffix="_baseline", how="inner")
+
+        duration_regressed = ((report["duration_s"] > factor * report["duration_s_baseline"])
+                              & (report["duration_s"] >= min_duration_s))
+        rows_regressed = report["rows_scanned"] > factor * report["rows_scanned_baseline"]
+        bytes_regressed = report["bytes_read"] > factor * report["bytes_read_baseline"]
+        report["regressed"] = [
+            ",".join(metric for metric, flag in zip(("duration", "rows", "bytes"), flags) if flag)
+            for flags in zip(duration_regressed, rows_regressed, bytes_regressed)
+        ]
+        columns = ["check_name", "dataset", "verdict", "regressed",
+                   "duration_s", "duration_s_baseline", "rows_scanned", "rows_scanned_baseline",
+                   "bytes_read", "bytes_read_baseline"]
+        return report.loc[report["regressed"] != "", columns].reset_index()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show DQ checks whose runtime or data volume regressed")
+    parser.add_argument("--path", default="dq_history.sqlite", help="Path to the DQ history database")
+    parser.add_argument("--run_id", default=None, help="Run to check (the latest one by default)")
+    parser.add_argument("--baseline_runs", type=int, default=10, help="Number of previous runs in the baseline")
+    parser.add_argument("--factor", type=float, default=1.5, help="Allowed growth versus the baseline median")
+    args = parser.parse_args()
+
+    regressions = DqRunHistory(args.path).regressions(args.run_id, args.baseline_runs, args.factor)
+    print(regressions.to_string(index=False) if not regressions.empty else "No regressions found.")
@@ -1,7 +1,23 @@
+import os
 import pytest
 from src.connectors.postgres.postgres_connector import PostgresConnectorContextManager
 from src.data_quality.data_quality_validation_library import DataQualityLibrary
 from src.connectors.file_system.parquet_reader import ParquetReader
+from src.connectors.cache.arrow_cache import ArrowResultCache
+from src.data_quality.sketches import SketchStore
+from src.data_quality.drift import DriftStore
+
+# Records every check into the DQ history database (--dq_history_path, --no_dq_history)
+pytest_plugins = ["src.history.plugin"]
+
+# Markers naming the dataset a test checks. With pytest-xdist (-n auto, --dist loadgroup)
+# all tests of a dataset run on the same worker, so each source/target pair is loaded once.
+DATASET_MARKERS = (
+    "facility_name_min_time_spent_per_visit_date",
+    "facility_type_avg_time_spent_per_visit_date",
+    "patient_sum_treatment_cost_per_facility_type",
+    "visits",
+)
 
 def pytest_addoption(parser):
     parser.addoption("--db_host", action="store", default="localhost", help="Database host")
@@ -9,6 +25,12 @@ def pytest_addoption(parser):
     parser.addoption("--db_port", action="store", default="5432", help="Database port")
     parser.addoption("--db_user", action="store", default="user", help="Database user")
     parser.addoption("--db_password", action="store", default="", help="Database password")
+    parser.addoption("--no_dq_cache", action="store_true", default=False,
+                     help="Disable the persistent cache of source and target data")
+    parser.addoption("--dq_cache_max_mb", action="store", default="2048",
+                     help="Maximum size of the persistent cache of source and target data in MB")
+    parser.addoption("--dq_accept_drift", action="store_true", default=False,
+                     help="Accept drifted partitions as the new baseline of the distribution drift checks")
 
 def pytest_configure(config):
     """
@@ -21,14 +43,55 @@ def pytest_configure(config):
         if not config.getoption(option):
             pytest.fail(f"Missing required option: {option}")
 
+def pytest_collection_modifyitems(config, items):
+    """
+    Assigns every test to an xdist group named after its dataset marker
+    (or its module, if it has none), so a worker owns whole datasets.
+    """
+    for item in items:
+        dataset = next((marker.name for marker in item.iter_markers() if marker.name in DATASET_MARKERS),
+                       item.module.__name__)
+        item.add_marker(pytest.mark.xdist_group(name=dataset))
+
 @pytest.fixture(scope='session')
-def parquet_reader():
+def dq_cache(request):
+    """
+    Persistent cache of source (Postgres) and target (parquet) data, stored as Arrow IPC files
+    in the pytest cache directory and shared across test sessions.
+    Returns None if disabled with --no_dq_cache.
+    """
+    if request.config.getoption("--no_dq_cache"):
+        return None
+    cache_dir = request.config.cache.mkdir("dq_cache")
+    max_bytes = int(request.config.getoption("--dq_cache_max_mb")) * 1024 * 1024
+    return ArrowResultCache(str(cache_dir), max_bytes=max_bytes)
+
+@pytest.fixture(scope='session')
+def sketch_store(request):
+    """
+    Per-partition sketches of parquet datasets, stored in the pytest cache directory
+    and reused across test sessions until the partition files change.
+    """
+    return SketchStore(str(request.config.cache.mkdir("dq_sketches")))
+
+@pytest.fixture(scope='session')
+def drift_store(request):
+    """
+    Per-partition histograms of parquet columns, stored in the pytest cache directory;
+    only new or changed partitions are scanned by drift checks. Drifted partitions keep
+    failing until they are accepted with --dq_accept_drift.
+    """
+    return DriftStore(os.path.join(str(request.config.cache.mkdir("dq_drift")), "histograms.sqlite"),
+                      accept_drift=request.config.getoption("--dq_accept_drift"))
+
+@pytest.fixture(scope='session')
+def parquet_reader(dq_cache):
     """
     PyTest fixture for creating a single instance of
     ParquetReader per test session.
     """
     try:
-        reader = ParquetReader()
+        reader = ParquetReader(cache=dq_cache)
         yield reader
     except Exception as e:
         pytest.fail(f"Failed to initialize ParquetReader: {e}")
@@ -36,7 +99,11 @@ def parquet_reader():
         del reader
 
 @pytest.fixture(scope='session')
-def db_connection(request):
+def db_connection(request, dq_cache, worker_id):
+    """
+    One connection per pytest-xdist worker (session scope is per worker),
+    named dq_<worker> in pg_stat_activity.
+    """
     db_host = request.config.getoption("--db_host")
     db_name = request.config.getoption("--db_name")
     db_port = request.config.getoption("--db_port")
@@ -46,7 +113,8 @@ def db_connection(request):
     try:
         with PostgresConnectorContextManager(db_user=db_user, db_password=db_password,
                                              db_host=db_host, db_name=db_name,
-                                             db_port=db_port) as db_connector:
+                                             db_port=db_port, cache=dq_cache,
+                                             application_name=f"dq_{worker_id}") as db_connector:
             yield db_connector
     except Exception as e:
         pytest.fail(f"Failed to initialize PostgresConnectorContextManager: {e}")
@@ -0,0 +1,42 @@
+"""
+Fixtures shared by the parquet dataset modules.
+
+Every module describes its dataset with module constants, which parametrize these fixtures:
+    SOURCE_QUERY: Postgres query returning the expected rows.
+    TARGET_PATH: Folder of the parquet dataset.
+    KEY_COLUMNS: Columns identifying a row.
+    MEASURE_COLUMN: Numeric column of the dataset.
+    RULES: RuleSet evaluated by test_rule.
+Fixtures are module-scoped, so each dataset is loaded once per worker.
+"""
+
+import pytest
+from src.data_quality.sketches import PartitionSketch
+from src.data_quality.streaming import StreamingRuleEvaluator
+
+
+@pytest.fixture(scope='module')
+def source_data(request, db_connection):
+    return db_connection.get_data_sql(request.module.SOURCE_QUERY)
+
+@pytest.fixture(scope='module')
+def target_data(request, parquet_reader):
+    return parquet_reader.process(request.module.TARGET_PATH, include_subfolders=True)
+
+@pytest.fixture(scope='module')
+def target_statistics(request, parquet_reader):
+    return parquet_reader.read_footer_statistics(request.module.TARGET_PATH, include_subfolders=True)
+
+@pytest.fixture(scope='module')
+def target_sketch(request, sketch_store, parquet_reader):
+    module = request.module
+    return sketch_store.sketch_dataset(parquet_reader, module.TARGET_PATH, module.KEY_COLUMNS, [module.MEASURE_COLUMN])
+
+@pytest.fixture(scope='module')
+def source_sketch(request, source_data):
+    return PartitionSketch.build(source_data, request.module.KEY_COLUMNS, [request.module.MEASURE_COLUMN])
+
+@pytest.fixture(scope='module')
+def rule_results(request, parquet_reader):
+    module = request.module
+    return StreamingRuleEvaluator(module.RULES).evaluate(parquet_reader.iter_batches(module.TARGET_PATH))
@@ -5,38 +5,35 @@ Author(s): Bohdan
 """
 
 import pytest
+from src.data_quality.rules import RuleSet
 
-@pytest.fixture(scope='module')
-def source_data(db_connection):
-    source_query = """
-    SELECT
-        f.facility_type,
-        v.visit_timestamp::date AS visit_date,
-        ROUND(AVG(v.duration_minutes), 2) AS avg_time_spent
-    FROM visits v
-    JOIN facilities f
-        ON f.id = v.facility_id
-    GROUP BY f.facility_type, visit_date
-    """
-    data = db_connection.get_data_sql(source_query)
-    df = data.sort_values(["facility_type", "visit_date"]).reset_index(drop=True)
-    return df
-
+SOURCE_QUERY = """
+SELECT
+    f.facility_type,
+    v.visit_timestamp::date AS visit_date,
+    ROUND(AVG(v.duration_minutes), 2) AS avg_time_spent
+FROM visits v
+JOIN facilities f
+    ON f.id = v.facility_id
+GROUP BY f.facility_type, visit_date
+"""
 
+TARGET_PATH = "/parquet_data/facility_type_avg_time_spent_per_visit_date"
+KEY_COLUMNS = ['facility_type', 'visit_date']
+MEASURE_COLUMN = 'avg_time_spent'
 
-@pytest.fixture(scope='module')
-def target_data(parquet_reader):
-    target_path = "/parquet_data/facility_type_avg_time_spent_per_visit_date"
-    data = parquet_reader.process(target_path, include_subfolders=True)
-    df = data.sort_values(["facility_type", "visit_date"]).reset_index(drop=True)    
-    return df
+RULES = RuleSet({
+    "not_empty": False,  # checked from footer metadata by test_check_dataset_is_not_empty
+    "keys": KEY_COLUMNS,
+    "ranges": {'avg_time_spent': (15, 60)},
+})
 
 
 @pytest.mark.parquet_data
 @pytest.mark.smoke
 @pytest.mark.facility_type_avg_time_spent_per_visit_date
-def test_check_dataset_is_not_empty(target_data, data_quality_library):
-    data_quality_library.check_dataset_is_not_empty(target_data)
+def test_check_dataset_is_not_empty(target_statistics, data_quality_library):
+    data_quality_library.check_dataset_is_not_empty_metadata(target_statistics)
 
 @pytest.mark.parquet_data
 @pytest.mark.facility_type_avg_time_spent_per_visit_date
@@ -46,7 +43,7 @@ def test_check_count(source_data, target_data, data_quality_library):
 @pytest.mark.parquet_data
 @pytest.mark.facility_type_avg_time_spent_per_visit_date
 def test_check_data_full_data_set(source_data, target_data, data_quality_library):
-    data_quality_library.check_data_full_data_set(source_data, target_data)
+    data_quality_library.check_data_full_data_set(source_data, target_data, key_columns=KEY_COLUMNS)
 
 @pytest.mark.parquet_data
 @pytest.mark.facility_type_avg_time_spent_per_visit_date
@@ -57,3 +54,25 @@ def test_check_duplicates(target_data, data_quality_library):
 @pytest.mark.facility_type_avg_time_spent_per_visit_date
 def test_check_not_null_values(target_data, data_quality_library):
     data_quality_library.check_not_null_values(target_data, ['facility_type', 'visit_date', 'avg_time_spent'])
+
+@pytest.mark.parquet_data
+@pytest.mark.facility_type_avg_time_spent_per_visit_date
+def test_check_referential_integrity(parquet_reader, db_connection, data_quality_library):
+    data_quality_library.check_referential_integrity_parquet_to_sql(parquet_reader, db_connection, TARGET_PATH,
+                                                                    ['facility_type'], 'facilities', ['facility_type'])
+
+@pytest.mark.parquet_data
+@pytest.mark.facility_type_avg_time_spent_per_visit_date
+@pytest.mark.parametrize("rule_id", RULES.rule_ids)
+def test_rule(rule_id, rule_results, data_quality_library):
+    data_quality_library.check_rule(rule_results, rule_id)
+
+@pytest.mark.parquet_data
+@pytest.mark.facility_type_avg_time_spent_per_visit_date
+def test_check_distribution_approximate(source_sketch, target_sketch, data_quality_library):
+    data_quality_library.check_distribution_approximate(source_sketch, target_sketch, MEASURE_COLUMN)
+
+@pytest.mark.parquet_data
+@pytest.mark.facility_type_avg_time_spent_per_visit_date
+def test_check_distribution_drift(drift_store, parquet_reader, data_quality_library):
+    data_quality_library.check_distribution_drift(drift_store, parquet_reader, TARGET_PATH, MEASURE_COLUMN)
@@ -5,39 +5,39 @@ Author(s): Your Name
 """
 
 import pytest
+from src.data_quality.rules import RuleSet
+
+SOURCE_QUERY = """
+SELECT
+f.facility_type,
+CONCAT(p.first_name, ' ', p.last_name) AS full_name,
+SUM(v.treatment_cost) AS sum_treatment_cost
+FROM
+visits v
+JOIN facilities f 
+ON f.id = v.facility_id
+JOIN patients p
+ON p.id = v.patient_id
+GROUP BY
+f.facility_type,
+full_name;"""
+
+TARGET_PATH = "/parquet_data/patient_sum_treatment_cost_per_facility_type"
+KEY_COLUMNS = ['facility_type', 'full_name']
+MEASURE_COLUMN = 'sum_treatment_cost'
+
+RULES = RuleSet({
+    "not_empty": False,  # checked from footer metadata by test_check_dataset_is_not_empty
+    "keys": KEY_COLUMNS,
+    "ranges": {'sum_treatment_cost': (0, None)},
+})
 
-@pytest.fixture(scope='module')
-def source_data(db_connection):
-    source_query = """
-    SELECT
-    f.facility_type,
-    CONCAT(p.first_name, ' ', p.last_name) AS full_name,
-    SUM(v.treatment_cost) AS sum_treatment_cost
-    FROM
-    visits v
-    JOIN facilities f 
-    ON f.id = v.facility_id
-    JOIN patients p
-    ON p.id = v.patient_id
-    GROUP BY
-    f.facility_type,
-    full_name;"""
-    data = db_connection.get_data_sql(source_query)
-    df = data.sort_values(["facility_type", "full_name"]).reset_index(drop=True)
-    return df
-
-@pytest.fixture(scope='module')
-def target_data(parquet_reader):
-    target_path = "/parquet_data/patient_sum_treatment_cost_per_facility_type"
-    data = parquet_reader.process(target_path, include_subfolders=True)
-    df = data.sort_values(["facility_type", "full_name"]).reset_index(drop=True)    
-    return df
 
 @pytest.mark.parquet_data
 @pytest.mark.smoke
 @pytest.mark.patient_sum_treatment_cost_per_facility_type
-def test_check_dataset_is_not_empty(target_data, data_quality_library):
-    data_quality_library.check_dataset_is_not_empty(target_data)
+def test_check_dataset_is_not_empty(target_statistics, data_quality_library):
+    data_quality_library.check_dataset_is_not_empty_metadata(target_statistics)
 
 @pytest.mark.parquet_data
 @pytest.mark.patient_sum_treatment_cost_per_facility_type
@@ -47,7 +47,7 @@ def test_check_count(source_data, target_data, data_quality_library):
 @pytest.mark.parquet_data
 @pytest.mark.patient_sum_treatment_cost_per_facility_type
 def test_check_data_full_data_set(source_data, target_data, data_quality_library):
-    data_quality_library.check_data_full_data_set(source_data, target_data)
+    data_quality_library.check_data_full_data_set(source_data, target_data, key_columns=KEY_COLUMNS)
 
 @pytest.mark.parquet_data
 @pytest.mark.patient_sum_treatment_cost_per_facility_type
@@ -58,3 +58,20 @@ def test_check_duplicates(target_data, data_quality_library):
 @pytest.mark.patient_sum_treatment_cost_per_facility_type
 def test_check_not_null_values(target_data, data_quality_library):
     data_quality_library.check_not_null_values(target_data, ['facility_type', 'full_name', 'sum_treatment_cost'])
+
+@pytest.mark.parquet_data
+@pytest.mark.patient_sum_treatment_cost_per_facility_type
+def test_check_referential_integrity(parquet_reader, db_connection, data_quality_library):
+    data_quality_library.check_referential_integrity_parquet_to_sql(parquet_reader, db_connection, TARGET_PATH,
+                                                                    ['facility_type'], 'facilities', ['facility_type'])
+
+@pytest.mark.parquet_data
+@pytest.mark.patient_sum_treatment_cost_per_facility_type
+@pytest.mark.parametrize("rule_id", RULES.rule_ids)
+def test_rule(rule_id, rule_results, data_quality_library):
+    data_quality_library.check_rule(rule_results, rule_id)
+
+@pytest.mark.parquet_data
+@pytest.mark.patient_sum_treatment_cost_per_facility_type
+def test_check_distribution_approximate(source_sketch, target_sketch, data_quality_library):
+    data_quality_library.check_distribution_approximate(source_sketch, target_sketch, MEASURE_COLUMN)
@@ -0,0 +1,17 @@
+"""
+Description: DQ tests for the visits table of the source database
+Author(s): Bohdan
+"""
+
+import pytest
+
+
+@pytest.mark.postgres_data
+@pytest.mark.visits
+def test_check_patient_references(db_connection, data_quality_library):
+    data_quality_library.check_referential_integrity_sql(db_connection, 'visits', ['patient_id'], 'patients', ['id'])
+
+@pytest.mark.postgres_data
+@pytest.mark.visits
+def test_check_facility_references(db_connection, data_quality_library):
+    data_quality_library.check_referential_integrity_sql(db_connection, 'visits', ['facility_id'], 'facilities', ['id'])
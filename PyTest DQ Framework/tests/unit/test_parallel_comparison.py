@@ -0,0 +1,91 @@
+"""
+Description: Unit tests for ParallelPartitionComparator
+Author(s): Bohdan
+"""
+
+import datetime
+from decimal import Decimal
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import pytest
+from src.connectors.file_system.parquet_reader import ParquetReader
+from src.data_quality.data_quality_validation_library import DataQualityLibrary
+from src.data_quality.parallel_comparison import ParallelPartitionComparator, _compare_partition, \
+    default_max_workers
+
+pytestmark = pytest.mark.unit
+
+COLUMNS = ['facility_type', 'full_name', 'sum_treatment_cost']
+
+SOURCE_QUERY = """
+SELECT * FROM (VALUES
+    ('Clinic', 'Ann Lee', 120.50),
+    ('Clinic', 'Bob Roe', 80.00),
+    ('Specialty Center', 'Ann Lee', 999.99)
+) AS t (facility_type, full_name, sum_treatment_cost)
+"""
+
+
+@pytest.fixture
+def dataset_path(tmp_path):
+    data = pa.table({
+        'facility_type': ['Clinic', 'Clinic', 'Specialty Center'],
+        'full_name': ['Ann Lee', 'Bob Roe', 'Ann Lee'],
+        'sum_treatment_cost': pa.array([Decimal('120.50'), Decimal('80.00'), Decimal('999.99')], pa.decimal128(18, 2)),
+        'facility_type_partition': ['Clinic', 'Clinic', 'Specialty_Center'],
+    })
+    pq.write_to_dataset(data, str(tmp_path / 'dataset'), partition_cols=['facility_type_partition'])
+    return str(tmp_path / 'dataset')
+
+
+def spill(tmp_path, rows):
+    """Writes source rows as the parent process does in split_source()."""
+    path = str(tmp_path / 'source.arrow')
+    feather.write_feather(pa.Table.from_pandas(pd.DataFrame(rows, columns=COLUMNS), preserve_index=False), path)
+    return [path]
+
+
+def test_compare_partition(tmp_path, dataset_path):
+    files = ParquetReader().partition_files(dataset_path)['facility_type_partition=Clinic']
+    source_files = spill(tmp_path, [('Clinic', 'Bob Roe', Decimal('80.00')), ('Clinic', 'Ann Lee', Decimal('120.50'))])
+
+    result = _compare_partition(source_files, dataset_path, files, COLUMNS, ['facility_type', 'full_name'], 10)
+    assert result.is_equal, result.summary()
+
+    source_files = spill(tmp_path, [('Clinic', 'Ann Lee', Decimal('120.51'))])
+    result = _compare_partition(source_files, dataset_path, files, COLUMNS, ['facility_type', 'full_name'], 10)
+    assert (result.missing_count, result.extra_count, result.changed_count) == (0, 1, 1)
+
+
+def test_compare_partition_missing_on_one_side(tmp_path, dataset_path):
+    files = ParquetReader().partition_files(dataset_path)['facility_type_partition=Specialty_Center']
+    result = _compare_partition([], dataset_path, files, COLUMNS, ['facility_type', 'full_name'], 10)
+    assert (result.missing_count, result.extra_count) == (0, 1)
+
+    source_files = spill(tmp_path, [('Hospital', 'Ann Lee', Decimal('1.00'))])
+    result = _compare_partition(source_files, dataset_path, [], COLUMNS, ['facility_type', 'full_name'], 10)
+    assert (result.missing_count, result.extra_count) == (1, 0)
+
+
+def test_default_max_workers(monkeypatch):
+    monkeypatch.setattr('os.cpu_count', lambda: 8)
+    monkeypatch.setenv('PYTEST_XDIST_WORKER_COUNT', '3')
+    assert default_max_workers() == 2
+    monkeypatch.setenv('PYTEST_XDIST_WORKER_COUNT', '16')
+    assert default_max_workers() == 1
+    monkeypatch.delenv('PYTEST_XDIST_WORKER_COUNT')
+    assert default_max_workers() == 8
+
+
+def test_compare_in_process_pool(db_connection, dataset_path):
+    DataQualityLibrary.check_data_full_data_set_parallel(db_connection, SOURCE_QUERY, ParquetReader(), dataset_path,
+                                                         ['facility_type', 'full_name'], max_workers=2)
+
+    changed_query = SOURCE_QUERY.replace("('Clinic', 'Bob Roe', 80.00),", "")
+    result = ParallelPartitionComparator(['facility_type', 'full_name'], max_workers=2).compare(
+        db_connection, changed_query, ParquetReader(), dataset_path)
+    assert (result.missing_count, result.extra_count, result.changed_count) == (0, 1, 0)
+    assert result.extra_sample['full_name'].tolist() == ['Bob Roe']
@@ -0,0 +1,64 @@
+"""
+Description: Unit tests for ParquetFooterStatistics and the footer-metadata (_metadata) checks
+Author(s): Bohdan
+"""
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from src.connectors.file_system.parquet_metadata import ParquetFooterStatistics
+from src.data_quality.data_quality_validation_library import DataQualityLibrary
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def dataset_path(tmp_path):
+    """Two partitions; the second file is written without statistics, so it is scanned."""
+    january = tmp_path / 'partition_date=2025-01'
+    february = tmp_path / 'partition_date=2025-02'
+    january.mkdir()
+    february.mkdir()
+    pq.write_table(pa.table({'facility_name': ['A', 'B', 'C'], 'min_time_spent': [15, 20, None]}),
+                   january / 'part-0.parquet', row_group_size=2)
+    pq.write_table(pa.table({'facility_name': ['A', None], 'min_time_spent': [40, 60]}),
+                   february / 'part-0.parquet', write_statistics=False)
+    return str(tmp_path)
+
+
+@pytest.fixture
+def statistics(dataset_path):
+    return ParquetFooterStatistics(dataset_path)
+
+
+def test_footer_statistics(statistics):
+    assert statistics.num_rows == 5
+    assert statistics.null_count('min_time_spent') == 1
+    assert statistics.null_count('facility_name') == 1
+    assert statistics.min_max('min_time_spent') == (15, 60)
+    assert statistics.min_max('facility_name') == ('A', 'C')
+
+
+def test_files_of_the_root_folder_only(dataset_path):
+    with pytest.raises(ValueError, match='No parquet files'):
+        ParquetFooterStatistics(dataset_path, include_subfolders=False)
+
+
+def test_count_and_not_empty_metadata(statistics):
+    DataQualityLibrary.check_dataset_is_not_empty_metadata(statistics)
+    DataQualityLibrary.check_count_metadata(statistics, 5)
+    with pytest.raises(AssertionError, match='source=4, target=5'):
+        DataQualityLibrary.check_count_metadata(statistics, 4)
+
+
+def test_not_null_values_metadata(statistics):
+    with pytest.raises(AssertionError, match=r"\['facility_name', 'min_time_spent'\]"):
+        DataQualityLibrary.check_not_null_values_metadata(statistics, ['facility_name', 'min_time_spent'])
+
+
+def test_value_range_metadata(statistics):
+    DataQualityLibrary.check_value_range_metadata(statistics, 'min_time_spent', 15, 60)
+    with pytest.raises(AssertionError, match='above 59: max=60'):
+        DataQualityLibrary.check_value_range_metadata(statistics, 'min_time_spent', 15, 59)
+    with pytest.raises(AssertionError, match='below 16: min=15'):
+        DataQualityLibrary.check_value_range_metadata(statistics, 'min_time_spent', min_value=16)
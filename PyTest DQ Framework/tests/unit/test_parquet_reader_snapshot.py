@@ -0,0 +1,89 @@
+"""
+Description: Unit tests for reading the Arrow IPC snapshots written by the data pipeline with ParquetReader
+Author(s): Bohdan
+"""
+
+import datetime
+import json
+import os
+
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import pytest
+from src.connectors.file_system.dataset_schemas import FACILITY_NAME_MIN_TIME_SPENT_PER_VISIT_DATE_SCHEMA
+from src.connectors.file_system.parquet_reader import ParquetReader
+from src.connectors.scan_metrics import scan_meter
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def dataset_path(tmp_path):
+    """A registered dataset: the folder name selects its expected schema."""
+    root = tmp_path / 'facility_name_min_time_spent_per_visit_date'
+    data = pa.table({
+        'facility_name': ['Clinic A', 'Clinic B', 'Clinic A'],
+        'visit_date': [datetime.date(2025, 1, 1), datetime.date(2025, 1, 1), datetime.date(2025, 2, 1)],
+        'min_time_spent': [15, 20, 30],
+        'partition_date': ['2025-01', '2025-01', '2025-02'],
+    }).cast(FACILITY_NAME_MIN_TIME_SPENT_PER_VISIT_DATE_SCHEMA)
+    pq.write_to_dataset(data, str(root), partition_cols=['partition_date'])
+    return str(root)
+
+
+def write_snapshot(root_path, schema=None, manifest=True):
+    """Writes a snapshot like the data pipeline does: the data columns plus the manifest of the parquet files."""
+    table = ParquetReader().dataset(root_path).to_table(
+        columns=['facility_name', 'visit_date', 'min_time_spent'])
+    if schema is not None:
+        table = table.cast(schema)
+    if manifest:
+        files = []
+        for dirpath, _, filenames in os.walk(root_path):
+            for file in filenames:
+                stat = os.stat(os.path.join(dirpath, file))
+                files.append([os.path.relpath(os.path.join(dirpath, file), root_path), stat.st_mtime_ns, stat.st_size])
+        table = table.replace_schema_metadata({b'source_manifest': json.dumps(sorted(files)).encode()})
+    feather.write_feather(table, ParquetReader.snapshot_path(root_path), compression='uncompressed')
+
+
+def sources_read(reader, root_path, **kwargs):
+    before = scan_meter.snapshot()
+    data = reader.process(root_path, **kwargs)
+    return data, set(scan_meter.delta(before))
+
+
+def test_fresh_snapshot_is_memory_mapped(dataset_path):
+    reader = ParquetReader()
+    assert not reader.is_snapshot_fresh(dataset_path)
+    write_snapshot(dataset_path)
+    assert reader.is_snapshot_fresh(dataset_path)
+
+    data, sources = sources_read(reader, dataset_path, columns=['min_time_spent'])
+    assert sources == {'arrow_snapshot'}
+    assert sorted(data['min_time_spent'].tolist()) == [15, 20, 30]
+
+    _, sources = sources_read(reader, dataset_path, filters=[('partition_date', '=', '2025-01')])
+    assert sources == {'parquet'}
+
+
+def test_snapshot_is_stale_after_files_change(dataset_path):
+    write_snapshot(dataset_path)
+    pq.write_table(pq.read_table(os.path.join(dataset_path, 'partition_date=2025-02')),
+                   os.path.join(dataset_path, 'partition_date=2025-02', 'extra.parquet'))
+    reader = ParquetReader()
+    assert not reader.is_snapshot_fresh(dataset_path)
+    data, sources = sources_read(reader, dataset_path)
+    assert sources == {'parquet'} and len(data) == 4
+
+
+def test_snapshot_with_unexpected_schema_or_without_manifest_is_not_used(dataset_path):
+    write_snapshot(dataset_path, schema=pa.schema([
+        pa.field('facility_name', pa.string()),
+        pa.field('visit_date', pa.date32()),
+        pa.field('min_time_spent', pa.int64()),
+    ]))
+    assert not ParquetReader().is_snapshot_fresh(dataset_path)
+    write_snapshot(dataset_path, manifest=False)
+    assert not ParquetReader().is_snapshot_fresh(dataset_path)
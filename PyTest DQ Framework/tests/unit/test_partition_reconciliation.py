@@ -0,0 +1,112 @@
+"""
+Description: Unit tests for PartitionReconciler: the numpy row hash against its modular arithmetic
+definition (which the SQL row hash computes in numeric), and SQL/parquet fingerprint parity
+Author(s): Bohdan
+"""
+
+import datetime
+from decimal import Decimal, ROUND_HALF_UP
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from src.connectors.file_system.parquet_reader import ParquetReader
+from src.data_quality.data_quality_validation_library import DataQualityLibrary
+from src.data_quality.partition_reconciliation import HASH_MODULUS, MIX_MULTIPLIERS, NULL_HASH, \
+    PartitionReconciler, text_hash
+
+pytestmark = pytest.mark.unit
+
+ROWS = [
+    ('Clinic', datetime.date(2025, 1, 1), 15.5, '2025-01'),
+    ('Hospital', datetime.date(2025, 1, 31), -2.25, '2025-01'),
+    (None, datetime.date(1969, 12, 31), 0.1, '1969-12'),
+    ('Specialty Center', datetime.date(2025, 2, 14), None, '2025-02'),
+    ('Clinic', datetime.date(2025, 2, 2), 1234567.891, '2025-02'),
+]
+
+SCHEMA = pa.schema([
+    pa.field('facility_type', pa.dictionary(pa.int32(), pa.string())),
+    pa.field('visit_date', pa.date32()),
+    pa.field('avg_time_spent', pa.float64()),
+])
+
+SOURCE_QUERY = """
+SELECT * FROM (VALUES
+    ('Clinic', DATE '2025-01-01', 15.5),
+    ('Hospital', DATE '2025-01-31', -2.25),
+    (NULL, DATE '1969-12-31', 0.1),
+    ('Specialty Center', DATE '2025-02-14', NULL),
+    ('Clinic', DATE '2025-02-02', 1234567.891)
+) AS t (facility_type, visit_date, avg_time_spent)
+"""
+
+
+def reference_row_hash(rows, scale=6):
+    """The row hash from its definition, with Python integers reduced modulo 2^64."""
+    first, second, salt = MIX_MULTIPLIERS
+    total = 0
+    for row in rows:
+        row_hash = 1
+        for position, value in enumerate(row):
+            if value is None:
+                value_hash = NULL_HASH
+            elif isinstance(value, str):
+                value_hash = text_hash(value)
+            else:
+                if isinstance(value, datetime.date):
+                    number = (value - datetime.date(1970, 1, 1)).days
+                else:
+                    number = int((Decimal(str(value)) * 10 ** scale).quantize(Decimal(1), ROUND_HALF_UP))
+                value_hash = (number * first + number * number * second) % HASH_MODULUS
+            column_hash = (value_hash + (position + 1) * salt) % HASH_MODULUS | 1
+            row_hash = row_hash * column_hash % HASH_MODULUS
+        total = (total + row_hash) % HASH_MODULUS
+    return total
+
+
+def table_of(rows):
+    columns = list(zip(*[row[:3] for row in rows]))
+    return pa.table([pa.array(values, type=field.type) for values, field in zip(columns, SCHEMA)], schema=SCHEMA)
+
+
+@pytest.fixture
+def dataset_path(tmp_path):
+    data = table_of(ROWS).append_column('partition_date', pa.array([row[3] for row in ROWS]))
+    pq.write_to_dataset(data, str(tmp_path / 'dataset'), partition_cols=['partition_date'])
+    return str(tmp_path / 'dataset')
+
+
+def test_row_hash_matches_modular_definition():
+    reconciler = PartitionReconciler(['facility_type', 'visit_date'], 'avg_time_spent')
+    assert reconciler._row_hash(table_of(ROWS)) == reference_row_hash([row[:3] for row in ROWS])
+
+
+def test_row_hash_is_order_independent_and_value_sensitive():
+    reconciler = PartitionReconciler(['facility_type', 'visit_date'], 'avg_time_spent')
+    row_hash = reconciler._row_hash(table_of(ROWS))
+    assert reconciler._row_hash(table_of(ROWS[::-1])) == row_hash
+    changed = [ROWS[0][:2] + (15.500001,) + ROWS[0][3:]] + ROWS[1:]
+    assert reconciler._row_hash(table_of(changed)) != row_hash
+    swapped = [(ROWS[0][0], ROWS[1][1], ROWS[0][2]), (ROWS[1][0], ROWS[0][1], ROWS[1][2])] + ROWS[2:]
+    assert reconciler._row_hash(table_of(swapped)) != row_hash
+
+
+def test_target_fingerprints(dataset_path):
+    reconciler = PartitionReconciler(['facility_type', 'visit_date'], 'avg_time_spent')
+    fingerprints = reconciler.target_fingerprints(ParquetReader(), dataset_path, SCHEMA.names)
+    assert sorted(fingerprints) == ['1969-12', '2025-01', '2025-02']
+    january = fingerprints['2025-01']
+    assert (january.row_count, january.measure_sum) == (2, 13.25)
+    assert january.row_hash == reference_row_hash([row[:3] for row in ROWS if row[3] == '2025-01'])
+
+
+def test_source_and_target_fingerprints_match(db_connection, dataset_path):
+    DataQualityLibrary.check_partition_reconciliation(db_connection, SOURCE_QUERY, ParquetReader(), dataset_path,
+                                                      ['facility_type', 'visit_date'], 'avg_time_spent')
+
+    changed_query = SOURCE_QUERY.replace('-2.25', '-2.26')
+    result = PartitionReconciler(['facility_type', 'visit_date'], 'avg_time_spent').reconcile(
+        db_connection, changed_query, ParquetReader(), dataset_path)
+    assert result.mismatched_partitions == ['2025-01']
+    assert (result.diff.missing_count, result.diff.extra_count, result.diff.changed_count) == (0, 0, 1)
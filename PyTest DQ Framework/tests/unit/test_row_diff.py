@@ -0,0 +1,82 @@
+"""
+Description: Unit tests for RowDiffEngine and check_data_full_data_set
+Author(s): Bohdan
+"""
+
+import datetime
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+from src.data_quality.data_quality_validation_library import DataQualityLibrary
+from src.data_quality.row_diff import RowDiffEngine
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def source():
+    return pd.DataFrame({
+        'facility_name': ['A', 'A', 'B', 'C'],
+        'visit_date': [datetime.date(2025, 1, 1), datetime.date(2025, 1, 2),
+                       datetime.date(2025, 1, 1), datetime.date(2025, 1, 1)],
+        'min_time_spent': [Decimal('15.00'), Decimal('20.00'), Decimal('30.00'), Decimal('45.00')],
+    })
+
+
+@pytest.fixture
+def target(source):
+    """The source rows as read from typed parquet, in a different order."""
+    return pd.DataFrame({
+        'facility_name': pd.Categorical(source['facility_name']),
+        'visit_date': pd.to_datetime(source['visit_date']),
+        'min_time_spent': source['min_time_spent'].astype('float64'),
+    }).iloc[::-1].reset_index(drop=True)
+
+
+def test_equal_data_with_different_types_and_order(source, target):
+    result = RowDiffEngine(key_columns=['facility_name', 'visit_date'], chunk_size=2).compare(source, target)
+    assert result.is_equal, result.summary()
+
+
+def test_missing_extra_and_changed_rows(source, target):
+    target = target.copy()
+    target.loc[target['facility_name'] == 'B', 'min_time_spent'] = 31.0
+    target = pd.concat([target[target['facility_name'] != 'C'],
+                        pd.DataFrame({'facility_name': ['D'], 'visit_date': [pd.Timestamp('2025-01-03')],
+                                      'min_time_spent': [50.0]})], ignore_index=True)
+
+    result = RowDiffEngine(key_columns=['facility_name', 'visit_date']).compare(source, target)
+
+    assert (result.missing_count, result.extra_count, result.changed_count) == (1, 1, 1)
+    assert result.missing_sample['facility_name'].tolist() == ['C']
+    assert result.extra_sample['facility_name'].tolist() == ['D']
+    assert result.changed_sample['min_time_spent_target'].tolist() == [31.0]
+
+
+def test_duplicated_key_is_reported_as_extra_row(source):
+    target = pd.concat([source, source.tail(1)], ignore_index=True)
+    result = RowDiffEngine(key_columns=['facility_name', 'visit_date']).compare(source, target)
+    assert (result.missing_count, result.extra_count, result.changed_count) == (0, 1, 0)
+
+
+def test_samples_are_bounded(source):
+    target = source.head(0)
+    result = RowDiffEngine(key_columns=['facility_name', 'visit_date'], sample_size=2).compare(source, target)
+    assert result.missing_count == 4
+    assert len(result.missing_sample) == 2
+
+
+def test_merge_adds_counts(source):
+    engine = RowDiffEngine(key_columns=['facility_name', 'visit_date'])
+    first = engine.compare(source, source.head(3))
+    second = engine.compare(source.head(3), source)
+    merged = first.merge(second)
+    assert (merged.missing_count, merged.extra_count) == (1, 1)
+
+
+def test_check_data_full_data_set(source, target):
+    DataQualityLibrary.check_data_full_data_set(source, target, key_columns=['facility_name', 'visit_date'])
+    DataQualityLibrary.check_data_full_data_set(source, target.iloc[::-1].reset_index(drop=True))
+    with pytest.raises(AssertionError, match='Missing in target: 1'):
+        DataQualityLibrary.check_data_full_data_set(source, target.head(3), key_columns=['facility_name', 'visit_date'])
@@ -0,0 +1,59 @@
+"""
+Description: Unit tests for RuleSet and check_rule
+Author(s): Bohdan
+"""
+
+import pandas as pd
+import pytest
+from src.data_quality.data_quality_validation_library import DataQualityLibrary
+from src.data_quality.rules import RuleSet
+
+pytestmark = pytest.mark.unit
+
+SPEC = {
+    "keys": ['facility_name', 'visit_date'],
+    "not_null": ['facility_name', 'min_time_spent'],
+    "ranges": {'min_time_spent': (15, 60)},
+    "unique": [['facility_name']],
+    "row_count_parity": True,
+}
+
+
+@pytest.fixture
+def target():
+    return pd.DataFrame({
+        'facility_name': pd.Categorical(['A', 'A', 'B', None]),
+        'visit_date': pd.to_datetime(['2025-01-01', '2025-01-02', '2025-01-01', '2025-01-01']),
+        'min_time_spent': [15, 61, None, 30],
+    })
+
+
+def test_rule_ids():
+    assert RuleSet(SPEC).rule_ids == ['not_empty', 'unique_keys', 'not_null[facility_name]',
+                                      'not_null[min_time_spent]', 'range[min_time_spent]',
+                                      'unique[facility_name]', 'row_count_parity']
+    assert 'not_empty' not in RuleSet({"not_empty": False, "keys": ['id']}).rule_ids
+
+
+def test_unknown_spec_entry():
+    with pytest.raises(ValueError, match='not_nul'):
+        RuleSet({"not_nul": ['id']})
+
+
+def test_evaluate(target):
+    results = RuleSet(SPEC).evaluate(target, source=target.head(3))
+    failed = {rule_id: result.failed_count for rule_id, result in results.items() if not result.passed}
+    assert failed == {'not_null[facility_name]': 1, 'not_null[min_time_spent]': 1, 'range[min_time_spent]': 1,
+                      'unique[facility_name]': 1, 'row_count_parity': 1}
+
+
+def test_row_count_parity_requires_source(target):
+    with pytest.raises(ValueError, match='row_count_parity'):
+        RuleSet(SPEC).evaluate(target)
+
+
+def test_check_rule(target):
+    results = RuleSet(SPEC).evaluate(target, source=target)
+    DataQualityLibrary.check_rule(results, 'unique_keys')
+    with pytest.raises(AssertionError, match=r'Rule range\[min_time_spent\] failed: 1 values'):
+        DataQualityLibrary.check_rule(results, 'range[min_time_spent]')
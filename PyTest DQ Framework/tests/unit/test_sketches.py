@@ -0,0 +1,113 @@
+"""
+Description: Unit tests for the sketches (HyperLogLog, quantile sketch, Bloom filter, SketchStore) and the _approximate checks
+Author(s): Bohdan
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from src.connectors.file_system.parquet_reader import ParquetReader
+from src.data_quality.data_quality_validation_library import DataQualityLibrary
+from src.data_quality.sketches import BloomFilter, HyperLogLog, PartitionSketch, QuantileSketch, SketchStore, \
+    find_duplicates
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def keys():
+    return pd.DataFrame({'facility_type': np.repeat(['Clinic', 'Hospital'], 10_000),
+                         'patient_id': np.tile(np.arange(10_000), 2)})
+
+
+def test_hyperloglog_estimate_and_merge(keys):
+    first, second, both = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    first.add(keys.head(12_000), ['facility_type', 'patient_id'])
+    second.add(keys.tail(8_000), ['facility_type', 'patient_id'])
+    both.add(keys, ['facility_type', 'patient_id'])
+
+    assert np.array_equal(first.merge(second).registers, both.registers)
+    assert abs(both.estimate() - 20_000) <= 3 * both.relative_error * 20_000
+    assert HyperLogLog(10).estimate() == 0
+    with pytest.raises(ValueError, match='precision'):
+        first.merge(HyperLogLog(12))
+
+
+def test_quantile_sketch_relative_accuracy():
+    values = np.concatenate([np.random.default_rng(3).lognormal(3, 1, 5_000), [0.0, 0.0, -5.0, -50.0]])
+    first, second = QuantileSketch(0.01), QuantileSketch(0.01)
+    first.add(values[:3_000])
+    second.add(pd.Series(values[3_000:]).astype(object))
+    sketch = first.merge(second)
+
+    ordered = np.sort(values)
+    for q in (0.0, 0.001, 0.01, 0.25, 0.5, 0.9, 0.99, 1.0):
+        exact = ordered[int(q * (len(values) - 1))]
+        assert abs(sketch.quantile(q) - exact) <= 0.01 * abs(exact)
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_bloom_filter_reports_repeated_hashes():
+    hashes = np.random.default_rng(5).integers(0, 2 ** 63, 10_000, dtype=np.uint64)
+    bloom = BloomFilter(capacity=20_000, error_rate=0.001)
+    assert bloom.add_hashes(hashes).sum() <= 10
+    assert bloom.add_hashes(hashes[:100]).all()
+    assert bloom.add_hashes(np.array([7, 7], dtype=np.uint64))[1]
+
+    other = BloomFilter(capacity=20_000, error_rate=0.001)
+    other.add_hashes(hashes[:10])
+    assert np.array_equal(bloom.merge(other).bits, bloom.bits)
+
+
+def test_find_duplicates(keys):
+    data = pd.concat([keys, keys.iloc[[5, 5, 17]]], ignore_index=True)
+
+    def batches():
+        return (data.iloc[start:start + 4_096] for start in range(0, len(data), 4_096))
+
+    duplicates = find_duplicates(batches, ['facility_type', 'patient_id'], capacity=len(data))
+    assert sorted(duplicates['occurrences'].tolist()) == [2, 3]
+    DataQualityLibrary.check_duplicates_approximate(lambda: [keys], ['facility_type', 'patient_id'], len(keys))
+    with pytest.raises(AssertionError, match='3 duplicates'):
+        DataQualityLibrary.check_duplicates_approximate(batches, ['facility_type', 'patient_id'], len(data))
+
+
+def test_key_uniqueness_approximate(keys):
+    DataQualityLibrary.check_key_uniqueness_approximate(PartitionSketch.build(keys, ['facility_type', 'patient_id']))
+    with pytest.raises(AssertionError, match='duplicated keys'):
+        DataQualityLibrary.check_key_uniqueness_approximate(PartitionSketch.build(keys, ['patient_id']))
+
+
+def test_distribution_approximate():
+    values = pd.DataFrame({'id': np.arange(2_000), 'avg_time_spent': np.linspace(15, 60, 2_000)})
+    shifted = values.assign(avg_time_spent=values['avg_time_spent'] * 1.1)
+    source = PartitionSketch.build(values, ['id'], ['avg_time_spent'])
+    DataQualityLibrary.check_distribution_approximate(
+        source, PartitionSketch.build(values.sample(frac=1, random_state=1), ['id'], ['avg_time_spent']),
+        'avg_time_spent')
+    with pytest.raises(AssertionError, match='Distribution of column avg_time_spent differs'):
+        DataQualityLibrary.check_distribution_approximate(
+            source, PartitionSketch.build(shifted, ['id'], ['avg_time_spent']), 'avg_time_spent')
+
+
+def test_sketch_store_reuses_stored_partitions(tmp_path, keys):
+    root = tmp_path / 'dataset'
+    data = keys.assign(cost=np.arange(len(keys)) / 100.0)
+    pq.write_to_dataset(pa.Table.from_pandas(data, preserve_index=False), str(root), partition_cols=['facility_type'])
+    store = SketchStore(str(tmp_path / 'sketches'))
+    reader = ParquetReader()
+
+    computed = store.sketch_dataset(reader, str(root), ['patient_id'], ['cost'])
+    stored = store.sketch_partitions(reader, str(root), ['patient_id'], ['cost'])
+    loaded = store.sketch_dataset(reader, str(root), ['patient_id'], ['cost'])
+
+    assert len(stored) == 2 and len(list((tmp_path / 'sketches').iterdir())) == 2
+    assert loaded.row_count == computed.row_count == len(keys)
+    assert np.array_equal(loaded.key_distinct.registers, computed.key_distinct.registers)
+    assert loaded.quantiles['cost'].quantile(0.5) == computed.quantiles['cost'].quantile(0.5)
+
+    for path in (tmp_path / 'sketches').iterdir():
+        path.write_bytes(b'not a sketch')
+        assert store._load(str(path)) is None
@@ -0,0 +1,53 @@
+"""
+Description: Unit tests for the push-down (_sql) checks, run on inline queries in the source database
+Author(s): Bohdan
+"""
+
+import pytest
+from src.data_quality.data_quality_validation_library import DataQualityLibrary
+from src.data_quality.sql_checks import SqlCheckCompiler
+
+pytestmark = pytest.mark.unit
+
+ROWS = """
+SELECT * FROM (VALUES (1, 'a', 10), (2, 'b', NULL), (2, 'b', NULL), (3, NULL, 30)) AS t (id, name, amount)
+"""
+
+UNIQUE_ROWS = "SELECT * FROM (VALUES (1, 'a'), (2, 'b')) AS t (id, name)"
+
+NO_ROWS = "SELECT 1 AS id WHERE FALSE"
+
+
+def test_relation_of_table_and_query():
+    assert SqlCheckCompiler.relation('public.visits') == '"public"."visits" AS src'
+    assert SqlCheckCompiler.relation(' select 1;\n') == '(select 1) AS src'
+    assert SqlCheckCompiler.relation('WITH q AS (SELECT 1) SELECT * FROM q', 'parent').endswith(') AS parent')
+
+
+def test_check_count_sql(db_connection):
+    DataQualityLibrary.check_count_sql(db_connection, ROWS, 4)
+    with pytest.raises(AssertionError, match='source=4, target=3'):
+        DataQualityLibrary.check_count_sql(db_connection, ROWS, 3)
+
+
+def test_check_dataset_is_not_empty_sql(db_connection):
+    DataQualityLibrary.check_dataset_is_not_empty_sql(db_connection, ROWS)
+    with pytest.raises(AssertionError):
+        DataQualityLibrary.check_dataset_is_not_empty_sql(db_connection, NO_ROWS)
+
+
+def test_check_duplicates_sql(db_connection):
+    DataQualityLibrary.check_duplicates_sql(db_connection, UNIQUE_ROWS)
+    with pytest.raises(AssertionError, match='1 duplicates'):
+        DataQualityLibrary.check_duplicates_sql(db_connection, ROWS)
+    with pytest.raises(AssertionError, match='1 duplicates'):
+        DataQualityLibrary.check_duplicates_sql(db_connection, ROWS, ['id'])
+
+
+def test_check_not_null_values_sql(db_connection):
+    DataQualityLibrary.check_not_null_values_sql(db_connection, UNIQUE_ROWS)
+    DataQualityLibrary.check_not_null_values_sql(db_connection, ROWS, ['id'])
+    with pytest.raises(AssertionError, match="name.*amount"):
+        DataQualityLibrary.check_not_null_values_sql(db_connection, ROWS, ['id', 'name', 'amount'])
+    with pytest.raises(AssertionError, match='3 rows'):
+        DataQualityLibrary.check_not_null_values_sql(db_connection, ROWS)
@@ -0,0 +1,53 @@
+"""
+Description: Unit tests for SpillingHashSet and StreamingRuleEvaluator
+Author(s): Bohdan
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_quality.rules import RuleSet
+from src.data_quality.streaming import SpillingHashSet, StreamingRuleEvaluator
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize("max_memory_items", [1_000, 10])
+def test_spilling_hash_set_counts_duplicates(tmp_path, max_memory_items):
+    hashes = np.random.default_rng(7).integers(0, 2 ** 63, 300, dtype=np.uint64) * np.uint64(2)
+    hash_set = SpillingHashSet(max_memory_items, num_buckets=4, spill_dir=str(tmp_path))
+    for batch in np.array_split(np.concatenate([hashes, hashes[:25], hashes[:5]]), 7):
+        hash_set.add(batch)
+    assert hash_set.duplicate_count() == 30
+    assert (hash_set.bucket_dir is not None) == (max_memory_items < 330)
+    hash_set.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_spilling_hash_set_requires_power_of_two_buckets():
+    with pytest.raises(ValueError, match='power of two'):
+        SpillingHashSet(num_buckets=3)
+
+
+def test_streaming_evaluation_matches_single_pass(tmp_path):
+    rng = np.random.default_rng(11)
+    target = pd.DataFrame({
+        'facility_type': pd.Categorical(rng.choice(['Clinic', 'Hospital', None], 500)),
+        'visit_date': pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 60, 500), unit='D'),
+        'avg_time_spent': rng.uniform(10, 65, 500).round(2),
+    })
+    rules = RuleSet({
+        "keys": ['facility_type', 'visit_date'],
+        "not_null": ['facility_type'],
+        "ranges": {'avg_time_spent': (15, 60)},
+        "row_count_parity": True,
+    })
+    batches = (target.iloc[start:start + 64] for start in range(0, len(target), 64))
+
+    streamed = StreamingRuleEvaluator(rules, max_memory_hashes=100, spill_dir=str(tmp_path)).evaluate(
+        batches, source_row_count=len(target))
+
+    assert streamed == rules.evaluate(target, source=target)
+    assert not streamed['unique_keys'].passed
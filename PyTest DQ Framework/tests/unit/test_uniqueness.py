@@ -0,0 +1,68 @@
+"""
+Description: Unit tests for UniquenessEngine, hash_keys and the duplicate checks
+Author(s): Bohdan
+"""
+
+import datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_quality.data_quality_validation_library import DataQualityLibrary
+from src.data_quality.uniqueness import UniquenessEngine, hash_keys
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def visits():
+    return pd.DataFrame({
+        'facility_type': ['Clinic', 'Clinic', 'Hospital', 'Clinic', 'Hospital', None, None],
+        'full_name': ['Ann Lee', 'Ann Lee', 'Ann Lee', 'Bob Roe', 'Ann Lee', 'Bob Roe', 'Bob Roe'],
+        'sum_treatment_cost': [10.5, 10.5, 20.0, 30.0, 21.0, 5.0, 5.0],
+    })
+
+
+def test_hash_keys_normalizes_types():
+    postgres = pd.DataFrame({'facility_type': ['Clinic', 'Hospital'],
+                             'visit_date': [datetime.date(2025, 1, 1), datetime.date(2025, 1, 2)],
+                             'avg_time_spent': [Decimal('15.50'), Decimal('20.00')]})
+    parquet = pd.DataFrame({'facility_type': pd.Categorical(['Clinic', 'Hospital']),
+                            'visit_date': pd.to_datetime(['2025-01-01', '2025-01-02']),
+                            'avg_time_spent': [15.5, 20.0]})
+    assert np.array_equal(hash_keys(postgres), hash_keys(parquet, chunk_size=1))
+    assert hash_keys(parquet, ['facility_type'])[0] != hash_keys(parquet, ['facility_type'])[1]
+
+
+def test_whole_row_duplicates(visits):
+    result = UniquenessEngine(chunk_size=3).check(visits)
+    assert (result.row_count, result.duplicate_count, result.duplicated_key_count) == (7, 2, 2)
+
+
+def test_key_duplicates_with_top_keys(visits):
+    result = UniquenessEngine(key_columns=['facility_type', 'full_name'], top_n=1).check(visits)
+    assert (result.duplicate_count, result.duplicated_key_count) == (3, 3)
+    assert result.top_keys.to_dict('records') == [
+        {'facility_type': 'Clinic', 'full_name': 'Ann Lee', 'occurrences': 2}]
+    with pytest.raises(ValueError, match='visit_date'):
+        UniquenessEngine(key_columns=['visit_date']).check(visits)
+
+
+def test_repeated_hashes():
+    hashes = np.array([5, 1, 5, 3, 1, 5], dtype=np.uint64)
+    assert UniquenessEngine.repeated_hashes(hashes).tolist() == [1, 5]
+
+
+def test_check_duplicates(visits):
+    DataQualityLibrary.check_duplicates(visits.drop_duplicates())
+    with pytest.raises(AssertionError, match='DataFrame contains 2 duplicates'):
+        DataQualityLibrary.check_duplicates(visits)
+    with pytest.raises(AssertionError, match='3 duplicates'):
+        DataQualityLibrary.check_duplicates(visits, ['facility_type', 'full_name'])
+
+
+def test_check_key_uniqueness(visits):
+    DataQualityLibrary.check_key_uniqueness(visits.drop_duplicates(), ['facility_type', 'sum_treatment_cost'])
+    with pytest.raises(AssertionError, match=r"Key \['full_name'\] is not unique"):
+        DataQualityLibrary.check_key_uniqueness(visits, ['full_name'])
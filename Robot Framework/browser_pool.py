@@ -0,0 +1,164 @@
+import os
+from pathlib import Path
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from robot.api.deco import keyword
+from robot.libraries.BuiltIn import BuiltIn
+
+# Keeps one warm headless Chrome per Robot process between tests. Robot runs the tests of a
+# process one after another, so a single browser is enough; with pabot every worker process
+# keeps its own warm browser, nothing is shared between processes.
+
+class WarmBrowser:
+    """
+    A headless Chrome that is reset instead of quit between tests.
+
+    acquire() returns the idle browser or starts one. On release the browser is reset (extra
+    windows closed, cookies, local and session storage cleared, navigated to about:blank) and
+    kept for the next test, unless it has been used max_uses times or cannot be reset, in which
+    case it is quit and replaced on the next acquire(). quit_driver closes a browser for good
+    (by default driver.quit()).
+    """
+
+    def __init__(self, max_uses: int = 20, headless: bool = True, quit_driver=None):
+        self.max_uses = max_uses
+        self.headless = headless
+        self.quit_driver = quit_driver
+        self._idle = None
+        self._uses = {}
+
+    def _create_driver(self):
+        options = webdriver.ChromeOptions()
+        if self.headless:
+            options.add_argument("--headless")
+        options.add_argument("--allow-file-access-from-files")
+        options.add_argument("--window-size=1920,1028")
+        return webdriver.Chrome(options=options)
+
+    def acquire(self):
+        driver, self._idle = self._idle, None
+        if driver is None:
+            driver = self._create_driver()
+            self._uses[driver] = 0
+        return driver
+
+    @staticmethod
+    def reset(driver):
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except WebDriverException:
+            driver.delete_all_cookies()
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException:
+            pass  # Storage is not accessible on every origin (e.g. about:blank)
+        driver.get("about:blank")
+
+    def release(self, driver):
+        if driver not in self._uses:
+            return
+        self._uses[driver] += 1
+        keep = self._uses[driver] < self.max_uses and self._idle is None
+        if keep:
+            try:
+                self.reset(driver)
+            except WebDriverException:
+                keep = False
+        if keep:
+            self._idle = driver
+        else:
+            self._quit(driver)
+
+    def discard(self, driver):
+        # Forgets a browser that was closed elsewhere (e.g. by Close All Browsers)
+        self._uses.pop(driver, None)
+        if self._idle is driver:
+            self._idle = None
+
+    def _quit(self, driver):
+        del self._uses[driver]
+        try:
+            if self.quit_driver is not None:
+                self.quit_driver(driver)
+            else:
+                driver.quit()
+        except WebDriverException:
+            pass
+
+    def close(self):
+        self._idle = None
+        for driver in list(self._uses):
+            self._quit(driver)
+
+_browser = None
+# SeleniumLibrary index of every warm browser: it is registered once and switched to on reuse
+_indexes = {}
+
+def _selenium_library():
+    return BuiltIn().get_library_instance("SeleniumLibrary")
+
+def _close_registered_driver(driver):
+    # Closing through SeleniumLibrary quits the browser and marks its index as closed
+    index = _indexes.pop(driver, None)
+    if index is None:
+        driver.quit()
+        return
+    library = _selenium_library()
+    try:
+        library.switch_browser(index)
+    except RuntimeError:
+        driver.quit()  # Already closed in SeleniumLibrary, e.g. by Close All Browsers
+        return
+    library.close_browser()
+
+def _get_browser() -> WarmBrowser:
+    global _browser
+    if _browser is None:
+        _browser = WarmBrowser(quit_driver=_close_registered_driver)
+    return _browser
+
+@keyword("Configure Browser Pool")
+def configure_browser_pool(max_uses: int = 20, headless: bool = True):
+    global _browser
+    if _browser is not None:
+        _browser.close()
+    _browser = WarmBrowser(max_uses=max_uses, headless=headless, quit_driver=_close_registered_driver)
+
+@keyword("Open Pooled Browser")
+def open_pooled_browser(url: str, alias: str = None):
+    # Makes the warm browser of this process the current SeleniumLibrary browser; the alias
+    # is given when the browser is registered and kept while it stays warm
+    if os.path.exists(url):
+        url = Path(url).resolve().as_uri()
+    browser = _get_browser()
+    library = _selenium_library()
+    driver = browser.acquire()
+    if driver in _indexes:
+        try:
+            library.switch_browser(_indexes[driver])
+        except RuntimeError:
+            # The warm browser was closed through SeleniumLibrary, start a new one
+            del _indexes[driver]
+            browser.discard(driver)
+            driver = browser.acquire()
+    if driver not in _indexes:
+        _indexes[driver] = library.register_driver(driver, alias)
+    driver.get(url)
+    return driver
+
+@keyword("Release Pooled Browser")
+def release_pooled_browser():
+    # Resets the current SeleniumLibrary browser and keeps it warm instead of closing it
+    driver = _selenium_library().driver
+    _get_browser().release(driver)
+
+@keyword("Close Browser Pool")
+def close_browser_pool():
+    if _browser is not None:
+        _browser.close()
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from selenium.webdriver.remote.webelement import WebElement
 from robot.api.deco import keyword
@@ -45,54 +46,122 @@ def read_html_table_to_dataframe(container_element: WebElement):
     df = pd.DataFrame(rows, columns=headers)
     return df
 
+# Reads the first Plotly table trace under the container element in the browser and returns
+# {"headers": [...], "columns": [[...], ...]}. Values come from the trace data of the graph div
+# (_fullData holds decoded arrays, data the original figure); if the div has no table trace,
+# the rendered SVG cells are read instead. Runs as a single WebDriver call.
+PLOTLY_TABLE_SCRIPT = """
+const container = arguments[0];
+const graph = container.classList.contains('js-plotly-plot')
+    ? container : container.querySelector('.js-plotly-plot');
+const stripTags = (value) => String(value).replace(/<[^>]*>/g, '').trim();
+const toArray = (values, length) => {
+    if (values === undefined || values === null) return [];
+    if (typeof values === 'object' && typeof values.length === 'number') return Array.from(values);
+    return Array(length).fill(values);
+};
+
+const traces = graph ? (graph._fullData || graph.data || []) : [];
+const table = traces.find((trace) => trace.type === 'table');
+if (table) {
+    const headerValues = toArray(table.header && table.header.values, 1);
+    const cellValues = toArray(table.cells && table.cells.values, 0);
+    const rowCount = Math.max(0, ...cellValues.map((column) =>
+        typeof column === 'object' && column !== null && typeof column.length === 'number' ? column.length : 1));
+    return {
+        source: 'data',
+        headers: headerValues.map((header) => stripTags(Array.isArray(header) ? header.join(' ') : header)),
+        columns: cellValues.map((column) => toArray(column, rowCount)),
+    };
+}
+
+const columns = Array.from(container.querySelectorAll('g.table-control-view g.y-column'));
+return {
+    source: 'svg',
+    headers: columns.map((column) => {
+        const header = column.querySelector('g#header g.cell-text-holder text.cell-text');
+        return header ? header.textContent.trim() : 'unknown';
+    }),
+    columns: columns.map((column) => Array.from(
+        column.querySelectorAll("g[id^='cells'] g.column-cells g.column-cell g.cell-text-holder text.cell-text"),
+        (cell) => cell.textContent.trim())),
+};
+"""
+
+@keyword("Read Plotly Table To Dataframe")
+def read_plotly_table_to_dataframe(container_element: WebElement):
+    # One execute_script call returns every column at once, so the extraction time
+    # does not grow with the number of cells as with find_elements/.text per cell.
+    table = container_element.parent.execute_script(PLOTLY_TABLE_SCRIPT, container_element)
+
+    if not table or not table["columns"]:
+        raise AssertionError("No Plotly table found in the container element")
+
+    lengths = {header: len(values) for header, values in zip(table["headers"], table["columns"])}
+    if len(set(lengths.values())) > 1:
+        raise AssertionError(f"Plotly table columns have different lengths: {lengths}")
+    df = pd.DataFrame(dict(zip(table["headers"], table["columns"])))
+    return df
+
 @keyword("Read Parquet Folder")
 def read_parquet_folder(folder_path: str, start_date: str = None):
-    df = pd.read_parquet(folder_path)
-    if start_date:
-        df = df[df['visit_date'] >= start_date]
+    # The filter is pushed down to pyarrow, so row groups whose visit_date
+    # max statistic is before start_date are skipped instead of decoded.
+    filters = [("visit_date", ">=", pd.Timestamp(start_date))] if start_date else None
+    df = pd.read_parquet(folder_path, filters=filters)
 
     return df
 
 @keyword("Compare DataFrames")
-def compare_dataframes(df_html: pd.DataFrame, df_parquet: pd.DataFrame):
-    df_html.columns = df_html.columns.str.strip().str.lower().str.replace(' ', '_')
-    df_parquet.columns = df_parquet.columns.str.strip().str.lower().str.replace(' ', '_')
+def compare_dataframes(df_html: pd.DataFrame, df_parquet: pd.DataFrame,
+                       tolerance: float = 1e-6, max_messages: int = 20):
+    # Whole-column comparison: the outer merge gives the extra/missing masks and the value
+    # mismatch mask is computed at once with a numeric tolerance. Only the first max_messages
+    # differences are formatted, after a summary line with the counts of every kind.
+    keys = ['facility_type', 'visit_date']
+    df_html = df_html.rename(columns=lambda name: name.strip().lower().replace(' ', '_'))
+    df_parquet = df_parquet.rename(columns=lambda name: name.strip().lower().replace(' ', '_'))
     df_html = df_html.rename(columns={'average_time_spent': 'avg_time_spent'})
     df_parquet = df_parquet.loc[:, df_html.columns]
 
-    df_html['visit_date'] = pd.to_datetime(df_html['visit_date'])
-    df_parquet['visit_date'] = pd.to_datetime(df_parquet['visit_date'])
-
-    df_html = df_html.sort_values(by=['facility_type','visit_date']).reset_index(drop=True)
-    df_parquet = df_parquet.sort_values(by=['facility_type','visit_date']).reset_index(drop=True)
+    df_html = df_html.assign(visit_date=pd.to_datetime(df_html['visit_date']))
+    df_parquet = df_parquet.assign(visit_date=pd.to_datetime(df_parquet['visit_date']))
 
     merged = df_html.merge(
         df_parquet,
         how='outer',
-        on=['facility_type','visit_date'],
+        on=keys,
         indicator=True,
         suffixes=('_html','_parquet')
     )
 
-    messages = []
-
-    for _, row in merged.iterrows():
-        merge_status = row['_merge']
-        facility = row['facility_type']
-        visit_date = row['visit_date'].date() if hasattr(row['visit_date'], 'date') else row['visit_date']
-
-        if merge_status == 'left_only':
-            messages.append(f"Average Time Spent in Facility Type {facility} on {visit_date} is extra in HTML table report.")
-        elif merge_status == 'right_only':
-            messages.append(f"Average Time Spent in Facility Type {facility} on {visit_date} is missing in HTML table report.")
+    extra = (merged['_merge'] == 'left_only').to_numpy()
+    missing = (merged['_merge'] == 'right_only').to_numpy()
+    val_html = pd.to_numeric(merged['avg_time_spent_html'], errors='coerce').to_numpy(dtype=float)
+    val_parquet = pd.to_numeric(merged['avg_time_spent_parquet'], errors='coerce').to_numpy(dtype=float)
+    comparable = (merged['_merge'] == 'both').to_numpy() & ~np.isnan(val_html) & ~np.isnan(val_parquet)
+    mismatched = comparable & ~np.isclose(val_html, val_parquet, rtol=0, atol=tolerance)
+
+    difference_count = int(extra.sum() + missing.sum() + mismatched.sum())
+    if not difference_count:
+        return None
+
+    messages = [
+        f"{difference_count} differences: {int(extra.sum())} extra in HTML table report, "
+        f"{int(missing.sum())} missing in HTML table report, {int(mismatched.sum())} with different "
+        f"Average Time Spent (showing at most {max_messages})."
+    ]
+    differences = merged.loc[extra | missing | mismatched].head(max_messages).rename(columns={'_merge': 'merge_status'})
+    for row in differences.itertuples(index=False):
+        visit_date = row.visit_date.date() if hasattr(row.visit_date, 'date') else row.visit_date
+        if row.merge_status == 'left_only':
+            messages.append(f"Average Time Spent in Facility Type {row.facility_type} on {visit_date} is extra in HTML table report.")
+        elif row.merge_status == 'right_only':
+            messages.append(f"Average Time Spent in Facility Type {row.facility_type} on {visit_date} is missing in HTML table report.")
         else:
-            val_html = row.get('avg_time_spent_html')
-            val_parquet = row.get('avg_time_spent_parquet')
-            
-            if pd.notna(val_html) and pd.notna(val_parquet):
-                if float(val_html) != float(val_parquet):
-                    messages.append(
-                        f"Facility Type {facility} on {visit_date} has different Average Time Spent: HTML={val_html} Parquet={val_parquet}"
-                    )
-
-    return messages if messages else None
+            messages.append(
+                f"Facility Type {row.facility_type} on {visit_date} has different Average Time Spent: "
+                f"HTML={row.avg_time_spent_html} Parquet={row.avg_time_spent_parquet}"
+            )
+
+    return messages
@@ -0,0 +1,114 @@
+import base64
+import json
+import re
+
+import numpy as np
+import pandas as pd
+from robot.api.deco import keyword
+
+# Reads the figure that plotly.io.write_html serializes into report.html, so report contents
+# can be checked without starting a browser. Selenium is only needed for rendering checks.
+
+# The figure's own call passes the graph div id as a string literal. The plotly.js bundle that
+# write_html inlines before it also contains "Plotly.newPlot(gd, ...)" in an error message.
+NEW_PLOT_CALL = re.compile(r"Plotly\.newPlot\(\s*(?=[\"'])")
+
+# plotly.py serializes numpy arrays as {"dtype": ..., "bdata": base64, "shape": ...}
+PLOTLY_DTYPES = {
+    "i1": "<i1", "u1": "<u1", "u1c": "<u1", "i2": "<i2", "u2": "<u2",
+    "i4": "<i4", "u4": "<u4", "i8": "<i8", "u8": "<u8", "f4": "<f4", "f8": "<f8",
+}
+
+def decode_plotly_array(value):
+    """Returns a list for a plain JSON array or a base64-encoded typed array."""
+    if isinstance(value, dict) and "bdata" in value:
+        array = np.frombuffer(base64.b64decode(value["bdata"]), dtype=PLOTLY_DTYPES[value["dtype"]])
+        shape = value.get("shape")
+        if shape:
+            if isinstance(shape, str):
+                shape = [int(size) for size in shape.split(",")]
+            array = array.reshape(shape)
+        return array.tolist()
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return value
+
+def strip_tags(text) -> str:
+    return re.sub(r"<[^>]*>", "", str(text)).strip()
+
+@keyword("Read Report Figure")
+def read_report_figure(report_path: str) -> dict:
+    """Returns {"data": [traces], "layout": {...}} of the first figure's Plotly.newPlot call in the HTML file."""
+    with open(report_path, encoding="utf-8") as f:
+        html = f.read()
+
+    decoder = json.JSONDecoder()
+    for match in NEW_PLOT_CALL.finditer(html):
+        position = match.end()
+        arguments = []
+        # Arguments of Plotly.newPlot: graph div id, data, layout (config is not needed)
+        try:
+            for _ in range(3):
+                while html[position] in " \t\r\n,":
+                    position += 1
+                argument, position = decoder.raw_decode(html, position)
+                arguments.append(argument)
+        except (json.JSONDecodeError, IndexError):
+            continue  # Not a call with literal arguments, e.g. inside the plotly.js bundle
+        return {"data": arguments[1], "layout": arguments[2]}
+
+    raise AssertionError(f"No Plotly figure found in {report_path}")
+
+def _find_trace(figure: dict, trace_type: str) -> dict:
+    for trace in figure["data"]:
+        if trace.get("type") == trace_type:
+            return trace
+    raise AssertionError(f"No {trace_type} trace found in the report")
+
+@keyword("Read Report Table")
+def read_report_table(report_path: str, figure: dict = None) -> pd.DataFrame:
+    """Returns the table trace of the report with the header labels as column names."""
+    trace = _find_trace(figure or read_report_figure(report_path), "table")
+    headers = [strip_tags(header) for header in decode_plotly_array(trace["header"]["values"])]
+    columns = [decode_plotly_array(values) for values in decode_plotly_array(trace["cells"]["values"])]
+
+    lengths = {header: len(values) for header, values in zip(headers, columns)}
+    if len(set(lengths.values())) > 1:
+        raise AssertionError(f"Report table columns have different lengths: {lengths}")
+    df = pd.DataFrame(dict(zip(headers, columns)))
+    return df
+
+@keyword("Read Report Pie")
+def read_report_pie(report_path: str, hidden_labels: list = None, figure: dict = None) -> pd.DataFrame:
+    """
+    Returns the visible slices of the pie trace (label, value, percent).
+    Slices whose labels are in hidden_labels (or in the hiddenlabels of the report layout)
+    are left out and the percentages are recomputed over the visible slices, as Plotly does.
+    """
+    figure = figure or read_report_figure(report_path)
+    trace = _find_trace(figure, "pie")
+    if hidden_labels is None:
+        hidden_labels = figure["layout"].get("hiddenlabels", [])
+
+    df = pd.DataFrame({
+        "label": [str(label) for label in decode_plotly_array(trace["labels"])],
+        "value": pd.to_numeric(decode_plotly_array(trace["values"])),
+    })
+    df = df[~df["label"].isin([str(label) for label in hidden_labels])].reset_index(drop=True)
+    total = df["value"].sum()
+    df["percent"] = df["value"] / total * 100 if total else 0.0
+    return df
+
+@keyword("Toggle Pie Legend")
+def toggle_pie_legend(hidden_labels: list = None, *labels) -> list:
+    """
+    Simulates single clicks on pie legend items: each clicked label is hidden if it is
+    visible and shown again if it is hidden. Returns the new list of hidden labels.
+    """
+    hidden = list(hidden_labels or [])
+    for label in labels:
+        if label in hidden:
+            hidden.remove(label)
+        else:
+            hidden.append(label)
+    return hidden
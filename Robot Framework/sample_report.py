@@ -0,0 +1,28 @@
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.subplots import make_subplots
+from robot.api.deco import keyword
+
+# Writes a report.html the way the data pipeline's ReportGenerator does (pio.write_html with the
+# plotly.js bundle inlined), from a small fixed dataset, so report parsing is tested on real output.
+
+SAMPLE_ROWS = pd.DataFrame({
+    "facility_type": ["Hospital", "Clinic", "Urgent Care", "Hospital"],
+    "visit_date": pd.to_datetime(["2025-11-20", "2025-11-20", "2025-11-19", "2025-11-18"]),
+    "avg_time_spent": [45.25, 20.5, 31.0, 44.75],
+})
+
+@keyword("Write Sample Report")
+def write_sample_report(report_path: str) -> pd.DataFrame:
+    """Writes a table and doughnut report of SAMPLE_ROWS to report_path and returns the rows."""
+    fig = make_subplots(rows=2, cols=1, specs=[[{"type": "table"}], [{"type": "domain"}]])
+    fig.add_trace(go.Table(
+        header=dict(values=["Facility Type", "Visit Date", "Average Time Spent"]),
+        cells=dict(values=[SAMPLE_ROWS["facility_type"], SAMPLE_ROWS["visit_date"].dt.strftime("%Y-%m-%d"),
+                           SAMPLE_ROWS["avg_time_spent"]]),
+    ), row=1, col=1)
+    doughnut_data = SAMPLE_ROWS.groupby("facility_type")["avg_time_spent"].min()
+    fig.add_trace(go.Pie(labels=doughnut_data.index, values=doughnut_data.values, hole=0.5), row=2, col=1)
+    pio.write_html(fig, file=report_path, auto_open=False)
+    return SAMPLE_ROWS.copy()
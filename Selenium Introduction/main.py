@@ -1,4 +1,3 @@
-import time
 import os
 import pandas as pd
 
@@ -56,6 +55,63 @@ SEQUENCE_OF_FILTER_ACTIONS = [
     ["Clinic", "Hospital", "Specialty Center"]
 ]
 
+# Resolves once every Plotly graph on the page has been drawn: the layout is computed,
+# the SVG exists and no drawing promises are pending.
+PLOTLY_READY_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const isDrawn = (gd) => gd._fullLayout && gd.querySelector('.main-svg') && !(gd._promises && gd._promises.length);
+const check = () => {
+    const graphs = Array.from(document.querySelectorAll('.js-plotly-plot'));
+    if (window.Plotly && graphs.length && graphs.every(isDrawn)) {
+        requestAnimationFrame(() => done(true));
+    } else {
+        requestAnimationFrame(check);
+    }
+};
+check();
+"""
+
+# Registers a promise that resolves on the next plotly_restyle or plotly_afterplot event
+# of the graph containing arguments[0]. Must run before the action that re-renders the chart.
+ARM_PLOTLY_RENDER_SCRIPT = """
+const gd = arguments[0].closest('.js-plotly-plot');
+window.__plotlyRendered = new Promise((resolve) => {
+    const onRender = () => {
+        gd.removeListener('plotly_restyle', onRender);
+        gd.removeListener('plotly_afterplot', onRender);
+        resolve(true);
+    };
+    gd.on('plotly_restyle', onRender);
+    gd.on('plotly_afterplot', onRender);
+});
+"""
+
+# Waits for the promise registered by ARM_PLOTLY_RENDER_SCRIPT and for the next frame to be painted.
+WAIT_PLOTLY_RENDER_SCRIPT = """
+const done = arguments[arguments.length - 1];
+window.__plotlyRendered.then(() => requestAnimationFrame(() => done(true)));
+"""
+
+def wait_for_plotly_ready(driver, timeout=30):
+    """
+    Waits until all Plotly charts of the page are rendered.
+    Raises TimeoutException if they are not rendered within timeout seconds.
+    """
+    driver.set_script_timeout(timeout)
+    driver.execute_async_script(PLOTLY_READY_SCRIPT)
+
+
+def click_and_wait_for_render(driver, element, timeout=10):
+    """
+    Clicks an element of a Plotly chart (e.g. a legend toggle) and returns as soon as
+    the chart has re-rendered. Raises TimeoutException if it does not re-render in time.
+    """
+    driver.execute_script(ARM_PLOTLY_RENDER_SCRIPT, element)
+    element.click()
+    driver.set_script_timeout(timeout)
+    driver.execute_async_script(WAIT_PLOTLY_RENDER_SCRIPT)
+
+
 def save_plotly_table_csv_dom_extraction(driver):
     """
     Extracts table data using Plotly SVG structure.
@@ -145,7 +201,7 @@ def extract_table_data(driver, url):
     """Extracts data from a table."""
     driver.get(url) 
     
-    time.sleep(10) 
+    wait_for_plotly_ready(driver)
     
     save_plotly_table_csv_dom_extraction(driver)
         
@@ -177,15 +233,15 @@ def interact_with_chart(driver):
                 )
                 
                 driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", legend_element)
-                time.sleep(1) 
                 
-                legend_element.click()
+                # Legend clicks are applied after Plotly's double-click delay; waiting for the
+                # re-render also keeps consecutive clicks from being taken as a double click.
+                click_and_wait_for_render(driver, legend_element)
                 
                 print(f"Successful click on '{facility_type}'")
-                time.sleep(3) 
                 
             except TimeoutException:
-                print(f"Error: Could not find legend item '{facility_type}' by selector.")
+                print(f"Error: Legend item '{facility_type}' was not found or the chart did not re-render in time.")
 
             except Exception as e:
                 print(f"Error when clicking: {e}")
@@ -0,0 +1,20 @@
+from src.data.parquet_compactor import ParquetCompactor
+
+import logging
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def main():
+    try:
+        logging.info(f"Starting compaction of parquet files...")
+        results = ParquetCompactor().compact()
+        files_before = sum(result['files_before'] for result in results.values())
+        files_after = sum(result['files_after'] for result in results.values())
+        logging.info(f"Compaction of parquet files completed! Files before: {files_before}, after: {files_after}")
+    except Exception as e:
+        logging.exception(f"Compaction of parquet files FAILED: {e}")
+
+
+if __name__ == '__main__':
+    main()
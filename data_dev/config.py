@@ -34,6 +34,8 @@ class DataGeneratorConfig:
         date_format (str): The format of the date strings (e.g., '%Y-%m-%d').
         facility_types (List[str]): A list of facility types (e.g., "Hospital", "Clinic").
         visits_per_day (Tuple[int, int]): A tuple specifying the range (min, max) of visits per day.
+        backend (str): Where visits are generated: 'python' generates them in Python and inserts them row by row,
+                       'postgres' generates them inside PostgreSQL with a single INSERT ... SELECT over generate_series.
     """
     num_patients: int
     start_date: str
@@ -41,6 +43,7 @@ class DataGeneratorConfig:
     date_format: str
     facility_types: List[str]
     visits_per_day: Tuple[int, int]
+    backend: str = 'python'
 
 
 @dataclass
@@ -55,10 +58,28 @@ class ParquetStorageConfig:
         The file system path where Parquet files for patient_sum_treatment_cost_per_facility_type will be stored.
         storage_path_facility_name_min_time_spent_per_visit_date (str):
         The file system path where Parquet files for facility_name_min_time_spent_per_visit_date will be stored.
+        sort_columns_facility_type_avg_time_spent_per_visit_date (List[str]):
+        Columns facility_type_avg_time_spent_per_visit_date is sorted by before writing.
+        sort_columns_patient_sum_treatment_cost_per_facility_type (List[str]):
+        Columns patient_sum_treatment_cost_per_facility_type is sorted by before writing.
+        sort_columns_facility_name_min_time_spent_per_visit_date (List[str]):
+        Columns facility_name_min_time_spent_per_visit_date is sorted by before writing.
+        row_group_size (int):
+        The maximum number of rows per row group. Together with sorting, it keeps row group min/max statistics narrow.
+        write_page_index (bool):
+        If True, the Parquet page index (column and offset indexes) is written to every file.
+        write_arrow_snapshot (bool):
+        If True, an uncompressed Arrow IPC (Feather v2) snapshot is written next to each Parquet dataset.
     """
     storage_path_facility_type_avg_time_spent_per_visit_date: str
     storage_path_patient_sum_treatment_cost_per_facility_type: str
     storage_path_facility_name_min_time_spent_per_visit_date: str
+    sort_columns_facility_type_avg_time_spent_per_visit_date: List[str]
+    sort_columns_patient_sum_treatment_cost_per_facility_type: List[str]
+    sort_columns_facility_name_min_time_spent_per_visit_date: List[str]
+    row_group_size: int = 10000
+    write_page_index: bool = True
+    write_arrow_snapshot: bool = True
 
 
 @dataclass
@@ -74,6 +95,19 @@ class LoadConfig:
     date_scope: str
 
 
+@dataclass
+class CompactionConfig:
+    """
+    CompactionConfig is a configuration class used to define settings for compaction of small Parquet files.
+
+    Attributes:
+        small_file_size_bytes (int): Parquet files smaller than this size are merged together.
+        target_file_size_bytes (int): The approximate size of the merged files.
+    """
+    small_file_size_bytes: int
+    target_file_size_bytes: int
+
+
 @dataclass
 class ReportGeneratorConfig:
     """
@@ -83,9 +117,12 @@ class ReportGeneratorConfig:
         storage_path (str): The file system path where the generated reports will be stored.
                             This path is typically a directory.
         parquet_files_path (str): Location of source files.
+        prefer_arrow_snapshot (bool): If True, a fresh Arrow IPC snapshot of the source files is
+                                      memory-mapped instead of decoding the Parquet files.
     """
     storage_path: str
     parquet_files_path: str
+    prefer_arrow_snapshot: bool = True
 
 
 # Instance of LoadConfig
@@ -109,7 +146,8 @@ data_generator_config = DataGeneratorConfig(
     end_date='2030-01-01',
     date_format='%Y-%m-%d',
     facility_types=['Hospital', 'Clinic', 'Urgent Care', 'Specialty Center'],
-    visits_per_day=(7, 10)
+    visits_per_day=(7, 10),
+    backend='python'  # 'python' or 'postgres'
 )
 
 # Instance of ParquetStorageConfig
@@ -119,7 +157,16 @@ parquet_storage_config = ParquetStorageConfig(
     storage_path_patient_sum_treatment_cost_per_facility_type='/parquet_data/'
                                                               'patient_sum_treatment_cost_per_facility_type',
     storage_path_facility_name_min_time_spent_per_visit_date='/parquet_data/'
-                                                             'facility_name_min_time_spent_per_visit_date'
+                                                             'facility_name_min_time_spent_per_visit_date',
+    sort_columns_facility_type_avg_time_spent_per_visit_date=['visit_date', 'facility_type'],
+    sort_columns_patient_sum_treatment_cost_per_facility_type=['facility_type', 'full_name'],
+    sort_columns_facility_name_min_time_spent_per_visit_date=['visit_date', 'facility_name']
+)
+
+# Instance of CompactionConfig
+compaction_config = CompactionConfig(
+    small_file_size_bytes=16 * 1024 * 1024,
+    target_file_size_bytes=128 * 1024 * 1024
 )
 
 # Instance of ReportGeneratorConfig
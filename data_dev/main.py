@@ -2,6 +2,7 @@ from src.connectors.postgre_connector import PostgresConnectorContextManager
 from src.data.inject_generated_data_to_src import GeneratedDataLoader
 from src.data.nf3_loader import NF3Loader
 from src.data.parquet_loader import LoadParquet
+from src.data.parquet_compactor import ParquetCompactor
 from src.reporting.report_generator import ReportGenerator
 
 import logging
@@ -37,6 +38,13 @@ def main():
             logging.info(f"Transformation of parquet files completed!")
         except Exception as e:
             logging.exception(f"Transformation of parquet files FAILED: {e}")
+        # compact small parquet files
+        try:
+            logging.info(f"Starting compaction of parquet files...")
+            ParquetCompactor().compact()
+            logging.info(f"Compaction of parquet files completed!")
+        except Exception as e:
+            logging.exception(f"Compaction of parquet files FAILED: {e}")
         try:
             logging.info(f"Starting report generation...")
             rp = ReportGenerator()
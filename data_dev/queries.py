@@ -47,6 +47,24 @@ INSERT INTO src_generated_visits (patient_id, facility_id, visit_timestamp, trea
 VALUES (%(patient_id)s, %(facility_id)s, %(visit_timestamp)s, %(treatment_cost)s, %(duration_minutes)s)
 """
 
+INSERT_SRC_GENERATED_VISITS_FROM_SERIES_QUERY = """
+INSERT INTO src_generated_visits (patient_id, facility_id, visit_timestamp, treatment_cost, duration_minutes)
+SELECT
+    1 + FLOOR(RANDOM() * %(num_patients)s)::INT AS patient_id,
+    1 + FLOOR(RANDOM() * %(num_facilities)s)::INT AS facility_id,
+    d.visit_date + FLOOR(RANDOM() * 86400)::INT * INTERVAL '1 second' AS visit_timestamp,
+    ROUND((50 + RANDOM() * 4950)::NUMERIC, 2) AS treatment_cost,
+    15 + FLOOR(RANDOM() * 46)::INT AS duration_minutes
+FROM (
+    SELECT
+        visit_date,
+        %(min_visits_per_day)s
+            + FLOOR(RANDOM() * (%(max_visits_per_day)s - %(min_visits_per_day)s + 1))::INT AS num_visits
+    FROM generate_series(%(start_date)s::DATE, %(end_date)s::DATE, INTERVAL '1 day') AS visit_date
+) d
+CROSS JOIN LATERAL generate_series(1, d.num_visits) -- correlated, so every day gets its own number of visits
+"""
+
 # 3NF LAYER
 
 
@@ -0,0 +1,57 @@
+import os
+
+import pyarrow as pa
+
+# PARQUET DATASET SCHEMAS
+#
+# Arrow schemas of the parquet datasets. LoadParquet casts every dataset to its schema before writing,
+# and readers use it to get typed columns (categories, dates, floats) without extra conversion passes.
+# The DQ framework declares the schemas it expects separately, in its own dataset_schemas module.
+
+
+FACILITY_TYPE_AVG_TIME_SPENT_PER_VISIT_DATE_SCHEMA = pa.schema([
+    pa.field('facility_type', pa.dictionary(pa.int32(), pa.string())),
+    pa.field('visit_date', pa.date32()),
+    pa.field('avg_time_spent', pa.float64()),
+    pa.field('partition_date', pa.string()),
+])
+
+PATIENT_SUM_TREATMENT_COST_PER_FACILITY_TYPE_SCHEMA = pa.schema([
+    pa.field('facility_type', pa.dictionary(pa.int32(), pa.string())),
+    pa.field('full_name', pa.string()),
+    pa.field('sum_treatment_cost', pa.decimal128(18, 2)),
+    pa.field('facility_type_partition', pa.string()),
+])
+
+FACILITY_NAME_MIN_TIME_SPENT_PER_VISIT_DATE_SCHEMA = pa.schema([
+    pa.field('facility_name', pa.dictionary(pa.int32(), pa.string())),
+    pa.field('visit_date', pa.date32()),
+    pa.field('min_time_spent', pa.int32()),
+    pa.field('partition_date', pa.string()),
+])
+
+DATASET_SCHEMAS = {
+    'facility_type_avg_time_spent_per_visit_date': FACILITY_TYPE_AVG_TIME_SPENT_PER_VISIT_DATE_SCHEMA,
+    'patient_sum_treatment_cost_per_facility_type': PATIENT_SUM_TREATMENT_COST_PER_FACILITY_TYPE_SCHEMA,
+    'facility_name_min_time_spent_per_visit_date': FACILITY_NAME_MIN_TIME_SPENT_PER_VISIT_DATE_SCHEMA,
+}
+
+# Hive partition columns. They are encoded in directory names, not stored inside the parquet files.
+PARTITION_COLUMNS = ('partition_date', 'facility_type_partition')
+
+
+def get_dataset_schema(storage_path, include_partition_columns=True):
+    """
+    Returns the registered Arrow schema of the dataset stored at the given path.
+
+    Args:
+        storage_path (str): Path of the Parquet dataset directory. Its last component is the dataset name.
+        include_partition_columns (bool): If False, the hive partition columns are left out of the schema.
+
+    Returns:
+        pa.Schema or None: The registered schema, or None if the dataset is not registered.
+    """
+    schema = DATASET_SCHEMAS.get(os.path.basename(os.path.normpath(storage_path)))
+    if schema is None or include_partition_columns:
+        return schema
+    return pa.schema([field for field in schema if field.name not in PARTITION_COLUMNS])
@@ -0,0 +1,145 @@
+import json
+import os
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+
+class ArrowSnapshot:
+    """
+    A class to handle uncompressed Arrow IPC (Feather v2) snapshots of Parquet datasets.
+
+    A snapshot is written next to the Parquet dataset directory (`<storage_path>.arrow`) and holds
+    the same rows without the partition columns. Readers memory-map it, so later pipeline stages
+    get zero-copy access instead of decoding the Parquet files again.
+
+    The snapshot stores a manifest of the Parquet files it was written from (relative path,
+    modification time and size of every file) in its schema metadata. It is fresh only while the
+    dataset consists of exactly these files, so added, deleted, replaced or compacted files all
+    invalidate it.
+
+    Methods:
+        snapshot_path(storage_path): Returns the snapshot file path for a dataset directory.
+        source_manifest(storage_path): Returns the relative paths, modification times and sizes of the Parquet files.
+        write(table, storage_path, partition_columns): Writes the snapshot for a dataset.
+        is_fresh(storage_path): Checks that the Parquet files of the dataset are the ones the snapshot was written from.
+        read_table(storage_path, columns): Memory-maps the snapshot and returns it as an Arrow table.
+        read(storage_path, columns): Memory-maps the snapshot and returns it as a DataFrame.
+    """
+
+    SNAPSHOT_EXTENSION = '.arrow'
+    MANIFEST_KEY = b'source_manifest'
+
+    @classmethod
+    def snapshot_path(cls, storage_path):
+        """
+        Returns the snapshot file path for a dataset directory.
+
+        Args:
+            storage_path (str): Path of the Parquet dataset directory.
+
+        Returns:
+            str: Path of the Arrow IPC snapshot file.
+        """
+        return os.path.normpath(storage_path) + cls.SNAPSHOT_EXTENSION
+
+    @staticmethod
+    def source_manifest(storage_path, files=None):
+        """
+        Returns the Parquet files of the dataset with their modification times and sizes.
+        Hidden files and directories (starting with '.' or '_') are skipped, as Parquet readers do.
+
+        Args:
+            storage_path (str): Path of the Parquet dataset directory.
+            files (list): Parquet file paths to describe. All Parquet files of the dataset if None.
+
+        Returns:
+            list: Sorted [relative path, modification time in ns, size in bytes] entries.
+        """
+        if files is None:
+            files = []
+            for dirpath, dirnames, filenames in os.walk(storage_path):
+                dirnames[:] = [d for d in dirnames if not d.startswith(('.', '_'))]
+                files.extend(os.path.join(dirpath, file) for file in filenames
+                             if file.endswith('.parquet') and not file.startswith(('.', '_')))
+        manifest = []
+        for path in files:
+            stat = os.stat(path)
+            manifest.append([os.path.relpath(path, storage_path), stat.st_mtime_ns, stat.st_size])
+        return sorted(manifest)
+
+    @classmethod
+    def write(cls, table, storage_path, partition_columns=None, files=None):
+        """
+        Writes an uncompressed Arrow IPC snapshot of the given Arrow table.
+
+        The file is written to a temporary path first and then renamed, so readers never see
+        a partially written snapshot. Must be called after the Parquet files are written, because
+        their manifest is stored with it.
+
+        Args:
+            table (pa.Table): Data written to the Parquet dataset.
+            storage_path (str): Path of the Parquet dataset directory.
+            partition_columns (list): Partition columns, which are not stored in the snapshot.
+            files (list): The Parquet files holding exactly the rows of the table. If files of other
+                partitions remain in the dataset directory, the snapshot is never fresh.
+                All Parquet files of the dataset if None.
+        """
+        path = cls.snapshot_path(storage_path)
+        tmp_path = f"{path}.tmp"
+        data = table.drop_columns(partition_columns or [])
+        manifest = json.dumps(cls.source_manifest(storage_path, files)).encode()
+        data = data.replace_schema_metadata({**(data.schema.metadata or {}), cls.MANIFEST_KEY: manifest})
+        feather.write_feather(data, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def is_fresh(cls, storage_path):
+        """
+        Checks that the snapshot exists and that the Parquet files of the dataset (paths,
+        modification times and sizes) are exactly the ones it was written from.
+        Only the schema of the snapshot is read.
+
+        Args:
+            storage_path (str): Path of the Parquet dataset directory.
+
+        Returns:
+            bool: True if the snapshot can be used instead of the Parquet files, False otherwise.
+        """
+        path = cls.snapshot_path(storage_path)
+        if not os.path.isfile(path):
+            return False
+        with pa.memory_map(path) as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+        if cls.MANIFEST_KEY not in metadata:
+            return False
+        return json.loads(metadata[cls.MANIFEST_KEY]) == cls.source_manifest(storage_path)
+
+    @classmethod
+    def read_table(cls, storage_path, columns=None):
+        """
+        Memory-maps the snapshot and returns it as an Arrow table without copying the data.
+
+        Args:
+            storage_path (str): Path of the Parquet dataset directory.
+            columns (list): Columns to read. All columns are read if None.
+
+        Returns:
+            pa.Table: The snapshot data.
+        """
+        return feather.read_table(cls.snapshot_path(storage_path), columns=columns, memory_map=True)
+
+    @classmethod
+    def read(cls, storage_path, columns=None):
+        """
+        Memory-maps the snapshot and returns it as a pandas DataFrame.
+        Date columns are returned as datetime64 instead of Python date objects.
+
+        Args:
+            storage_path (str): Path of the Parquet dataset directory.
+            columns (list): Columns to read. All columns are read if None.
+
+        Returns:
+            pd.DataFrame: The snapshot data.
+        """
+        return cls.read_table(storage_path, columns).to_pandas(date_as_object=False)
@@ -3,6 +3,7 @@ from faker import Faker
 from datetime import datetime, timedelta
 
 from data_dev.config import data_generator_config
+from data_dev.queries import INSERT_SRC_GENERATED_VISITS_FROM_SERIES_QUERY
 
 
 class DataGenerator:
@@ -160,3 +161,52 @@ class DataGenerator:
             List[dict]: A list of patient data dictionaries.
         """
         return self.patients
+
+
+class PostgresDataGenerator(DataGenerator):
+    """
+    A DataGenerator backend that generates visits inside PostgreSQL.
+
+    Patients and facilities are small and are still generated in Python with Faker. Visits are produced
+    by a single INSERT ... SELECT over generate_series of the configured dates, with random visit counts,
+    timestamps, costs and durations in the same ranges as DataGenerator.generate_visits. No visit rows
+    are transferred over the network, so even very large visit volumes take little client time.
+    """
+
+    def generate_data(self):
+        """
+        Generates synthetic data for patients and facilities. Visits are generated later in the database
+        by generate_visits_in_database().
+        """
+        self.patients = self.generate_patients()
+        self.facilities = self.generate_facilities()
+        self.visits = None
+
+    def get_visits_query_params(self):
+        """
+        Builds the parameters of the visits generation query from the configuration.
+
+        Returns:
+            dict: Parameters for INSERT_SRC_GENERATED_VISITS_FROM_SERIES_QUERY.
+        """
+        return {
+            "num_patients": self.num_patients,
+            "num_facilities": len(self.facility_types),
+            "min_visits_per_day": self.visits_per_day[0],
+            "max_visits_per_day": self.visits_per_day[1],
+            "start_date": datetime.strptime(self.start_date, self.date_format).date(),
+            "end_date": datetime.strptime(self.end_date, self.date_format).date(),
+        }
+
+    def generate_visits_in_database(self, cursor):
+        """
+        Generates visits and inserts them into the `src_generated_visits` table inside the database.
+
+        Args:
+            cursor (object): A database cursor object.
+
+        Returns:
+            int: The number of generated visits.
+        """
+        cursor.execute(INSERT_SRC_GENERATED_VISITS_FROM_SERIES_QUERY, self.get_visits_query_params())
+        return cursor.rowcount
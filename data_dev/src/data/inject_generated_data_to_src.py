@@ -1,4 +1,5 @@
-from data_dev.src.data.data_generator import DataGenerator
+from data_dev.src.data.data_generator import DataGenerator, PostgresDataGenerator
+from data_dev.config import data_generator_config
 from data_dev.queries import (
     CREATE_SRC_GENERATED_FACILITIES_TABLE_QUERY,
     CREATE_SRC_GENERATED_PATIENTS_TABLE_QUERY,
@@ -15,7 +16,8 @@ class GeneratedDataLoader:
 
     Attributes:
         conn (object): A database connection object.
-        dg (DataGenerator): An instance of the DataGenerator class for generating synthetic data.
+        dg (DataGenerator): An instance of the DataGenerator class for generating synthetic data
+                            (PostgresDataGenerator if the 'postgres' backend is configured).
 
     Methods:
         - is_table_empty(cursor, table_name): Checks if a given table is empty.
@@ -31,7 +33,10 @@ class GeneratedDataLoader:
             conn (object): A database connection object.
         """
         self.conn = conn
-        self.dg = DataGenerator()
+        if data_generator_config.backend == 'postgres':
+            self.dg = PostgresDataGenerator()
+        else:
+            self.dg = DataGenerator()
 
     @staticmethod
     def is_table_empty(cursor, table_name):
@@ -71,7 +76,8 @@ class GeneratedDataLoader:
            `src_generated_visits` tables if they do not already exist.
         2. Checks if the `src_generated_visits` table is empty.
         3. If the table is empty, generates synthetic data for facilities, patients, and visits.
-        4. Inserts the generated data into the respective tables.
+        4. Inserts the generated data into the respective tables. With the 'postgres' backend,
+           visits are generated inside the database instead.
         5. Commits the transaction if successful, or rolls back in case of an error.
         """
         cursor = self.conn.cursor()
@@ -94,11 +100,14 @@ class GeneratedDataLoader:
                     data=self.dg.get_patients(),
                     query=INSERT_SRC_GENERATED_PATIENTS_QUERY
                 )
-                self.inject_data_into_table(
-                    cursor=cursor,
-                    data=self.dg.get_visits(),
-                    query=INSERT_SRC_GENERATED_VISITS_QUERY
-                )
+                if isinstance(self.dg, PostgresDataGenerator):
+                    self.dg.generate_visits_in_database(cursor=cursor)
+                else:
+                    self.inject_data_into_table(
+                        cursor=cursor,
+                        data=self.dg.get_visits(),
+                        query=INSERT_SRC_GENERATED_VISITS_QUERY
+                    )
                 self.conn.commit()
         except Exception as e:
             # Rollback the transaction in case of an error
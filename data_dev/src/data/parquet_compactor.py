@@ -0,0 +1,223 @@
+import glob
+import json
+import logging
+import os
+import uuid
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data_dev.config import parquet_storage_config, compaction_config
+
+
+class ParquetCompactor:
+    """
+    A class to merge small Parquet files inside every partition of the Parquet datasets.
+
+    Each `LoadParquet` run adds new part files to the partition directories, so the number of files
+    (and the listing and read overhead of every reader) grows with the number of runs. The compactor
+    bin-packs small files of a partition into files of about `target_file_size_bytes`, sorted by the
+    dataset sort specification.
+
+    A bin is replaced in a recoverable order: the merged file is written under a hidden temporary
+    name, a journal listing the inputs and the output is written, the inputs are removed, the merged
+    file is renamed into place and the journal is removed. Readers never see a partially written file
+    or the rows of a bin twice; an interrupted compaction is rolled forward from its journal on the
+    next run. Compaction rewrites files, so an Arrow snapshot of the dataset becomes stale and readers
+    use the Parquet files until the next load writes a new snapshot.
+
+    Attributes:
+        datasets (dict): Mapping of dataset storage path to the columns its data is sorted by.
+        small_file_size_bytes (int): Files smaller than this size are merged.
+        target_file_size_bytes (int): The approximate size of the merged files.
+
+    Methods:
+        list_partition_files(storage_path): Returns the Parquet files of every partition directory.
+        plan_bins(files): Groups the small files of a partition into bins of about the target size.
+        merge_files(partition_path, files, sort_columns): Merges the given files into a single file.
+        recover(storage_path): Completes compactions interrupted after their journal was written.
+        compact_dataset(storage_path, sort_columns): Compacts all partitions of a dataset.
+        compact(): Compacts all datasets and returns before/after file counts.
+    """
+
+    def __init__(self):
+        """
+        Initializes the ParquetCompactor with the dataset paths and compaction settings from the configuration.
+        """
+        self.datasets = {
+            parquet_storage_config.storage_path_facility_type_avg_time_spent_per_visit_date:
+                parquet_storage_config.sort_columns_facility_type_avg_time_spent_per_visit_date,
+            parquet_storage_config.storage_path_patient_sum_treatment_cost_per_facility_type:
+                parquet_storage_config.sort_columns_patient_sum_treatment_cost_per_facility_type,
+            parquet_storage_config.storage_path_facility_name_min_time_spent_per_visit_date:
+                parquet_storage_config.sort_columns_facility_name_min_time_spent_per_visit_date,
+        }
+        self.small_file_size_bytes = compaction_config.small_file_size_bytes
+        self.target_file_size_bytes = compaction_config.target_file_size_bytes
+
+    @staticmethod
+    def list_partition_files(storage_path):
+        """
+        Returns the Parquet files of every partition directory of a dataset.
+
+        Args:
+            storage_path (str): Path of the Parquet dataset directory.
+
+        Returns:
+            dict: Mapping of partition directory to the sorted list of its Parquet file paths.
+        """
+        partitions = {}
+        for dirpath, dirnames, filenames in os.walk(storage_path):
+            dirnames[:] = [d for d in dirnames if not d.startswith(('.', '_'))]
+            files = sorted(
+                os.path.join(dirpath, file) for file in filenames
+                if file.endswith('.parquet') and not file.startswith(('.', '_'))
+            )
+            if files:
+                partitions[dirpath] = files
+        return partitions
+
+    def plan_bins(self, files):
+        """
+        Groups the small files of a partition into bins whose total size is close to the target file size.
+
+        Args:
+            files (list): Parquet file paths of a single partition.
+
+        Returns:
+            list: Bins (lists of file paths) with at least two files each.
+        """
+        bins, current, current_size = [], [], 0
+        for path in files:
+            size = os.path.getsize(path)
+            if size >= self.small_file_size_bytes:
+                continue
+            if current and current_size + size > self.target_file_size_bytes:
+                bins.append(current)
+                current, current_size = [], 0
+            current.append(path)
+            current_size += size
+        bins.append(current)
+        return [b for b in bins if len(b) > 1]
+
+    JOURNAL_PATTERN = '_compaction-*.json'
+
+    @staticmethod
+    def _finish(partition_path, journal_path, journal):
+        """
+        Removes the inputs listed in a journal, renames the merged file into place and removes the journal.
+        Every step is skipped if it is already done, so it can be repeated after a crash.
+        """
+        for name in journal['inputs']:
+            path = os.path.join(partition_path, name)
+            if os.path.exists(path):
+                os.remove(path)
+        tmp_path = os.path.join(partition_path, journal['tmp'])
+        if os.path.exists(tmp_path):
+            os.replace(tmp_path, os.path.join(partition_path, journal['output']))
+        os.remove(journal_path)
+
+    @classmethod
+    def merge_files(cls, partition_path, files, sort_columns=None):
+        """
+        Merges the given Parquet files into a single file and removes them.
+
+        The merged file is written under a hidden name first. A journal then records the inputs and
+        the merged file, the inputs are removed and the merged file is renamed into place, so the rows
+        are never visible twice and an interruption can be completed by recover().
+
+        Args:
+            partition_path (str): The partition directory the files belong to.
+            files (list): Parquet file paths to merge.
+            sort_columns (list): Columns to sort the merged data by.
+        """
+        table = pa.concat_tables([pq.read_table(path) for path in files], promote_options='default')
+        if sort_columns:
+            table = table.sort_by([(column, 'ascending') for column in sort_columns])
+        name = f'{uuid.uuid4().hex}-compacted.parquet'
+        tmp_path = os.path.join(partition_path, f'.{name}.tmp')
+        pq.write_table(
+            table,
+            tmp_path,
+            row_group_size=parquet_storage_config.row_group_size,
+            write_statistics=True,
+            write_page_index=parquet_storage_config.write_page_index
+        )
+        journal = {
+            'output': name,
+            'tmp': os.path.basename(tmp_path),
+            'inputs': [os.path.basename(path) for path in files],
+        }
+        journal_path = os.path.join(partition_path, f'_compaction-{uuid.uuid4().hex}.json')
+        with open(f'{journal_path}.tmp', 'w') as f:
+            json.dump(journal, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f'{journal_path}.tmp', journal_path)
+        cls._finish(partition_path, journal_path, journal)
+
+    @classmethod
+    def recover(cls, storage_path):
+        """
+        Completes compactions that were interrupted after their journal was written.
+        Merged files without a journal are incomplete and removed; their inputs were never touched.
+
+        Args:
+            storage_path (str): Path of the Parquet dataset directory.
+
+        Returns:
+            int: Number of completed compactions.
+        """
+        recovered = 0
+        for dirpath, _, filenames in os.walk(storage_path):
+            journaled = set()
+            for journal_path in sorted(glob.glob(os.path.join(glob.escape(dirpath), cls.JOURNAL_PATTERN))):
+                with open(journal_path) as f:
+                    journal = json.load(f)
+                journaled.add(journal['tmp'])
+                cls._finish(dirpath, journal_path, journal)
+                recovered += 1
+            for file in filenames:
+                if file.endswith('-compacted.parquet.tmp') and file not in journaled:
+                    os.remove(os.path.join(dirpath, file))
+                if file.startswith('_compaction-') and file.endswith('.json.tmp'):
+                    os.remove(os.path.join(dirpath, file))
+        return recovered
+
+    def compact_dataset(self, storage_path, sort_columns=None):
+        """
+        Compacts all partitions of a dataset, after completing interrupted compactions.
+
+        Args:
+            storage_path (str): Path of the Parquet dataset directory.
+            sort_columns (list): Columns to sort the merged data by.
+
+        Returns:
+            tuple: Number of Parquet files before and after compaction.
+        """
+        self.recover(storage_path)
+        partitions = self.list_partition_files(storage_path)
+        files_before = sum(len(files) for files in partitions.values())
+        files_after = files_before
+        for partition_path, files in partitions.items():
+            for bin_files in self.plan_bins(files):
+                self.merge_files(partition_path, bin_files, sort_columns)
+                files_after -= len(bin_files) - 1
+        return files_before, files_after
+
+    def compact(self):
+        """
+        Compacts all datasets.
+
+        Returns:
+            dict: Mapping of dataset storage path to a dict with `files_before` and `files_after` counts.
+        """
+        results = {}
+        for storage_path, sort_columns in self.datasets.items():
+            if not os.path.isdir(storage_path):
+                logging.info(f"Compaction of {storage_path} skipped: directory does not exist.")
+                continue
+            files_before, files_after = self.compact_dataset(storage_path, sort_columns)
+            logging.info(f"Compaction of {storage_path}: {files_before} files before, {files_after} files after.")
+            results[storage_path] = {'files_before': files_before, 'files_after': files_after}
+        return results
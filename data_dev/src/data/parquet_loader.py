@@ -1,5 +1,7 @@
 import os
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from data_dev.queries import (
     TRANSFORM_PATIENT_SUM_TREATMENT_COST_PER_FACILITY_TYPE_SQL,
@@ -7,6 +9,8 @@ from data_dev.queries import (
     TRANSFORM_FACILITY_TYPE_AVG_TIME_SPENT_PER_VISIT_DATE_SQL
 )
 from data_dev.config import parquet_storage_config
+from data_dev.schemas import get_dataset_schema
+from data_dev.src.data.arrow_snapshot import ArrowSnapshot
 
 
 class LoadParquet:
@@ -23,13 +27,20 @@ class LoadParquet:
         Path to store the Parquet file for patient sum treatment cost per facility type.
     storage_path_facility_name_min_time_spent_per_visit_date : str
         Path to store the Parquet file for facility name minimum time spent per visit date.
+    sort_columns_facility_type_avg_time_spent_per_visit_date : list
+        Columns to sort facility type average time spent per visit date by before writing.
+    sort_columns_patient_sum_treatment_cost_per_facility_type : list
+        Columns to sort patient sum treatment cost per facility type by before writing.
+    sort_columns_facility_name_min_time_spent_per_visit_date : list
+        Columns to sort facility name minimum time spent per visit date by before writing.
 
     Methods:
     --------
     read_data(query):
         Executes the given SQL query and returns the result as a DataFrame.
-    to_parquet(df, storage_path, partition_columns):
-        Writes the given DataFrame to a Parquet file at the specified storage path, partitioned by the given columns.
+    to_parquet(df, storage_path, partition_columns, sort_columns):
+        Writes the given DataFrame, sorted by the given columns, to a Parquet file at the specified storage path,
+        partitioned by the given columns, and optionally writes an Arrow IPC snapshot next to it.
     transform_facility_type_avg_time_spent_per_visit_date():
         Transforms data for facility type average time spent per visit date and writes it to a Parquet file.
     transform_patient_sum_treatment_cost_per_facility_type():
@@ -59,6 +70,15 @@ class LoadParquet:
         self.storage_path_facility_name_min_time_spent_per_visit_date = (
             parquet_storage_config.storage_path_facility_name_min_time_spent_per_visit_date
         )
+        self.sort_columns_facility_type_avg_time_spent_per_visit_date = (
+            parquet_storage_config.sort_columns_facility_type_avg_time_spent_per_visit_date
+        )
+        self.sort_columns_patient_sum_treatment_cost_per_facility_type = (
+            parquet_storage_config.sort_columns_patient_sum_treatment_cost_per_facility_type
+        )
+        self.sort_columns_facility_name_min_time_spent_per_visit_date = (
+            parquet_storage_config.sort_columns_facility_name_min_time_spent_per_visit_date
+        )
 
     def read_data(self, query):
         """
@@ -78,9 +98,16 @@ class LoadParquet:
         return df
 
     @staticmethod
-    def to_parquet(df, storage_path, partition_columns):
+    def to_parquet(df, storage_path, partition_columns, sort_columns=None):
         """
         Writes the given DataFrame to a Parquet file at the specified storage path, partitioned by the given columns.
+        The data is sorted by the given columns first and the row order is preserved while writing, so row group
+        min/max statistics and the page index stay narrow and readers can skip row groups and pages by predicate.
+        The data is cast to the Arrow schema registered for the dataset (see data_dev/schemas.py), so the
+        stored column types do not depend on what pandas inferred from the SQL result.
+        If enabled in the configuration, an uncompressed Arrow IPC snapshot of the same data is written
+        next to the Parquet dataset, so later stages can memory-map it instead of decoding Parquet again.
+        The snapshot records the files written here; it is only used while they are the whole dataset.
 
         Parameters:
         -----------
@@ -90,15 +117,31 @@ class LoadParquet:
             Path to store the Parquet file.
         partition_columns : list
             Columns to partition the Parquet file by.
+        sort_columns : list, optional
+            Columns to sort the data by before writing.
         """
         os.makedirs(storage_path, exist_ok=True)
-        df.to_parquet(
+        if sort_columns:
+            df = df.sort_values(by=sort_columns, ignore_index=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        schema = get_dataset_schema(storage_path)
+        if schema is not None:
+            table = table.select(schema.names).cast(schema)
+        written_files = []
+        pq.write_to_dataset(
+            table,
             storage_path,
-            engine='pyarrow',
             partition_cols=partition_columns,
-            index=False,
-            existing_data_behavior='delete_matching'
+            existing_data_behavior='delete_matching',
+            preserve_order=True,
+            row_group_size=parquet_storage_config.row_group_size,
+            write_statistics=True,
+            write_page_index=parquet_storage_config.write_page_index,
+            file_visitor=lambda written_file: written_files.append(written_file.path)
         )
+        if parquet_storage_config.write_arrow_snapshot:
+            ArrowSnapshot.write(table=table, storage_path=storage_path, partition_columns=partition_columns,
+                                files=written_files)
 
     def transform_facility_type_avg_time_spent_per_visit_date(self):
         """
@@ -110,7 +153,8 @@ class LoadParquet:
         self.to_parquet(
             df=df,
             storage_path=self.storage_path_facility_type_avg_time_spent_per_visit_date,
-            partition_columns=['partition_date']
+            partition_columns=['partition_date'],
+            sort_columns=self.sort_columns_facility_type_avg_time_spent_per_visit_date
         )
 
     # TODO: do better approach for: df['facility_type_partition'] = df['facility_type'] - workaround,
@@ -123,7 +167,8 @@ class LoadParquet:
         self.to_parquet(
             df=df,
             storage_path=self.storage_path_patient_sum_treatment_cost_per_facility_type,
-            partition_columns=['facility_type_partition']
+            partition_columns=['facility_type_partition'],
+            sort_columns=self.sort_columns_patient_sum_treatment_cost_per_facility_type
         )
 
     def transform_facility_name_min_time_spent_per_visit_date(self):
@@ -136,7 +181,8 @@ class LoadParquet:
         self.to_parquet(
             df=df,
             storage_path=self.storage_path_facility_name_min_time_spent_per_visit_date,
-            partition_columns=['partition_date']
+            partition_columns=['partition_date'],
+            sort_columns=self.sort_columns_facility_name_min_time_spent_per_visit_date
         )
 
     def load_parquet(self):
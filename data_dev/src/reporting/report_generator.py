@@ -1,10 +1,13 @@
 import pandas as pd
+import pyarrow.parquet as pq
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import plotly.io as pio
 import os
 
 from data_dev.config import report_generator_config
+from data_dev.schemas import get_dataset_schema
+from data_dev.src.data.arrow_snapshot import ArrowSnapshot
 
 
 class ReportGenerator:
@@ -18,7 +21,7 @@ class ReportGenerator:
 
     Methods:
         combine_figures(): Initializes the combined figure layout with a table and doughnut chart.
-        read_source_data(): Reads the source data from a Parquet file.
+        read_source_data(): Reads the source data from an Arrow IPC snapshot or a Parquet file.
         transform_data(): Filters and sorts the data for the last week.
         create_table_element(last_week_data): Adds a table visualization to the figure.
         create_doughnut_element(last_week_data): Adds a doughnut chart visualization to the figure.
@@ -52,11 +55,19 @@ class ReportGenerator:
     def read_source_data():
         """
         Reads the source data from a Parquet file specified in the configuration.
+        A fresh Arrow IPC snapshot of the same dataset is memory-mapped instead, if present.
+        Data is read with the registered dataset schema, so `visit_date` is already a datetime column.
 
         Returns:
             pd.DataFrame: The loaded data.
         """
-        return pd.read_parquet(report_generator_config.parquet_files_path)
+        parquet_files_path = report_generator_config.parquet_files_path
+        if report_generator_config.prefer_arrow_snapshot and ArrowSnapshot.is_fresh(parquet_files_path):
+            return ArrowSnapshot.read(parquet_files_path)
+        schema = get_dataset_schema(parquet_files_path)
+        if schema is None:
+            return pd.read_parquet(parquet_files_path)
+        return pq.read_table(parquet_files_path, schema=schema).to_pandas(date_as_object=False)
 
     def transform_data(self):
         """
@@ -65,7 +76,11 @@ class ReportGenerator:
         Returns:
             pd.DataFrame: The transformed data for the last week.
         """
-        self.data['visit_date'] = pd.to_datetime(self.data['visit_date'])
+        if isinstance(self.data['facility_type'].dtype, pd.CategoricalDtype):
+            # Dictionary-encoded columns keep categories in order of appearance; sort them alphabetically
+            self.data['facility_type'] = self.data['facility_type'].cat.reorder_categories(
+                sorted(self.data['facility_type'].cat.categories)
+            )
         last_loaded_date = self.data['visit_date'].max()
         last_week_data = self.data[self.data['visit_date'] >= (last_loaded_date - pd.Timedelta(days=6))]
         last_week_data = last_week_data.sort_values(by=['visit_date', 'facility_type'], ascending=False)
@@ -107,7 +122,7 @@ class ReportGenerator:
         Args:
             last_week_data (pd.DataFrame): The data for the last week to be visualized.
         """
-        doughnut_data = last_week_data.groupby('facility_type')['avg_time_spent'].min()
+        doughnut_data = last_week_data.groupby('facility_type', observed=True)['avg_time_spent'].min()
         self.fig.add_trace(
             go.Pie(
                 labels=doughnut_data.index,